@@ -0,0 +1,115 @@
+from datetime import date, datetime, time
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AnotherTestClass import AnotherTestClass
+from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
+from otlmow_converter.FileFormats.ArrowExporter import ArrowExporter
+from otlmow_converter.FileFormats.ArrowImporter import ArrowImporter
+from otlmow_converter.OtlmowConverter import OtlmowConverter, to_arrow_table_async
+
+model_directory_path = Path(__file__).parent.parent / 'TestModel'
+
+
+def return_test_objects() -> list:
+    instance = AllCasesTestClass()
+    instance.assetId.identificator = '0000'
+    instance.testBooleanField = False
+    instance.testDateField = date(2019, 9, 20)
+    instance.testDateTimeField = datetime(2001, 12, 15, 22, 22, 15, 123456)
+    instance.testDecimalFieldMetKard = [10.0, 20.0]
+    instance.testIntegerField = -55
+    instance.testKeuzelijstMetKard = ['waarde-4', 'waarde-3']
+    instance.testKwantWrd.waarde = 98.21
+    instance.testStringFieldMetKard = ['string1', 'string2']
+    instance.testTimeField = time(11, 5, 26)
+    instance.testComplexType.testStringField = 'complex'
+
+    cleared = AllCasesTestClass()
+    cleared.assetId.identificator = '0001'
+    cleared.clear_value('testIntegerField')
+    cleared.clear_value('testStringFieldMetKard')
+
+    another = AnotherTestClass()
+    another.assetId.identificator = '0002'
+    another.notitie = 'note'
+    return [instance, cleared, another]
+
+
+@pytest.mark.parametrize('extension, compression', [('arrow', None), ('feather', None), ('arrow', 'zstd')])
+def test_export_and_import(tmp_path, extension, compression):
+    objects = return_test_objects()
+    file_path = tmp_path / f'assets.{extension}'
+
+    OtlmowConverter.from_objects_to_file(file_path=file_path, sequence_of_objects=objects, compression=compression)
+    created = OtlmowConverter.from_file_to_objects(file_path=file_path, model_directory=model_directory_path)
+
+    assert created == objects
+
+
+def test_import_is_lazy_per_record_batch(tmp_path):
+    file_path = tmp_path / 'batches.arrow'
+    objects = return_test_objects() * 3
+    ArrowExporter.from_objects(sequence_of_objects=objects, filepath=file_path, batch_size=2)
+    with pa.memory_map(str(file_path)) as source:
+        assert pa.ipc.open_file(source).num_record_batches == 5
+
+    created = ArrowImporter.to_objects(filepath=file_path, model_directory=model_directory_path, stream=True,
+                                       columns=['assetId.identificator', 'testIntegerField'])
+
+    assert not isinstance(created, list)
+    assert next(created).testIntegerField == -55
+    created = list(created)
+    assert [o.assetId.identificator for o in created] == [o.assetId.identificator for o in objects[1:]]
+    assert created[2].testDateField is None
+
+
+def test_import_raises_bad_lines(tmp_path):
+    file_path = tmp_path / 'bad.arrow'
+    ArrowExporter.from_pyarrow_table_to_file(
+        table=pa.table({'typeURI': [AllCasesTestClass.typeURI, 'https://invalid/uri#Class'],
+                        'assetId.identificator': ['1', '2']}), filepath=file_path)
+
+    with pytest.raises(BadLinesInExcelError) as exc_info:
+        ArrowImporter.to_objects(filepath=file_path, model_directory=model_directory_path)
+    assert [o.assetId.identificator for o in exc_info.value.objects] == ['1']
+    assert exc_info.value.exceptions[0].line_number == 3
+
+
+@pytest.mark.parametrize('extension', ['arrow', 'parquet'])
+def test_to_arrow_table_from_file(tmp_path, extension):
+    file_path = tmp_path / f'assets.{extension}'
+    OtlmowConverter.from_objects_to_file(file_path=file_path, sequence_of_objects=return_test_objects())
+
+    table = OtlmowConverter.to_arrow_table(file_path, columns=['assetId.identificator', 'testDateField'])
+
+    assert table.column_names == ['assetId.identificator', 'testDateField', 'typeURI']
+    assert table.column('testDateField').type == pa.date32()
+    assert table.column('assetId.identificator').to_pylist() == ['0000', '0001', '0002']
+
+
+def test_to_arrow_table_from_other_subjects():
+    objects = return_test_objects()
+    from_objects = OtlmowConverter.to_arrow_table(objects)
+    dotnotation_dicts = [DotnotationDictConverter.to_dict(o) for o in objects[:1]]
+
+    assert from_objects.num_rows == 3
+    assert from_objects.schema.field('testIntegerField').type == pa.int64()
+    assert OtlmowConverter.to_arrow_table(from_objects) is from_objects
+    assert OtlmowConverter.to_arrow_table(dotnotation_dicts).column('testIntegerField').to_pylist() == [-55]
+    assert OtlmowConverter.to_arrow_table(from_objects.to_pandas()).num_rows == 3
+    assert OtlmowConverter.to_arrow_table([]).num_rows == 0
+
+
+@pytest.mark.asyncio
+async def test_export_and_import_async(tmp_path):
+    objects = return_test_objects()
+    file_path = tmp_path / 'async.arrow'
+    await ArrowExporter.from_objects_async(sequence_of_objects=objects, filepath=file_path)
+
+    assert await ArrowImporter.to_objects_async(filepath=file_path, model_directory=model_directory_path) == objects
+    assert (await to_arrow_table_async(file_path)).num_rows == 3
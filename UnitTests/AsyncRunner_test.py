@@ -0,0 +1,172 @@
+import asyncio
+import json
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AnotherTestClass import AnotherTestClass
+from otlmow_converter.AsyncRunner import AsyncRunner
+from otlmow_converter.OtlmowConverter import OtlmowConverter
+from otlmow_converter.SettingsManager import DEFAULT_SETTINGS_PATH
+
+model_directory_path = Path(__file__).parent / 'TestModel'
+
+
+def return_test_objects() -> list:
+    objects = []
+    for i in range(50):
+        instance = AllCasesTestClass()
+        instance.assetId.identificator = f'id{i}'
+        instance.testBooleanField = i % 2 == 0
+        instance.testDateField = date(2020, 1, 1 + i % 28)
+        instance.testStringFieldMetKard = ['test1', f'test{i}']
+        objects.append(instance)
+    instance = AnotherTestClass()
+    instance.assetId.identificator = 'another'
+    instance.notitie = 'note'
+    objects.append(instance)
+    return objects
+
+
+@pytest.mark.asyncio
+async def test_iterate_gives_control_to_the_loop_per_batch():
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    ticks.clear()
+    items = [item async for item in AsyncRunner.iterate(range(100), batch_size=10)]
+    ticker_task.cancel()
+
+    assert items == list(range(100))
+    assert len(ticks) == 10
+
+
+@pytest.mark.asyncio
+async def test_objects_to_file_and_back_offloaded(tmp_path):
+    objects = return_test_objects()
+    for suffix in ['json', 'xlsx']:
+        file_path = tmp_path / f'offloaded.{suffix}'
+        await OtlmowConverter.from_objects_to_file_async(sequence_of_objects=objects, file_path=file_path)
+        created = await OtlmowConverter.from_file_to_objects_async(file_path=file_path,
+                                                                   model_directory=model_directory_path)
+
+        assert created == objects
+        assert created == list(OtlmowConverter.from_file_to_objects(file_path=file_path,
+                                                                    model_directory=model_directory_path))
+
+
+@pytest.mark.asyncio
+async def test_objects_to_file_and_back_in_process_pool(tmp_path):
+    objects = return_test_objects()
+    file_path = tmp_path / 'process_pool.json'
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        await OtlmowConverter.from_objects_to_file_async(sequence_of_objects=objects, file_path=file_path,
+                                                         executor=executor)
+        created = await OtlmowConverter.from_file_to_objects_async(file_path=file_path,
+                                                                   model_directory=model_directory_path,
+                                                                   executor=executor)
+
+    assert created == objects
+
+
+@pytest.mark.asyncio
+async def test_loop_keeps_running_while_offloaded(tmp_path):
+    objects = return_test_objects()
+    file_path = tmp_path / 'ticks.json'
+    OtlmowConverter.from_objects_to_file(sequence_of_objects=objects, file_path=file_path)
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0.0001)
+
+    ticker_task = asyncio.create_task(ticker())
+    created = await OtlmowConverter.from_file_to_objects_async(file_path=file_path,
+                                                               model_directory=model_directory_path)
+    ticker_task.cancel()
+
+    assert created == objects
+    assert ticks
+
+
+@pytest.mark.asyncio
+async def test_consume_keeps_the_source_at_most_queue_size_batches_ahead():
+    read = []
+    written = []
+    ahead = []
+
+    async def source():
+        for i in range(1000):
+            read.append(i)
+            yield i
+
+    def write(items):
+        for item in items:
+            ahead.append(len(read) - len(written))
+            written.append(item)
+        return len(written)
+
+    result = await AsyncRunner.consume(write, source(), batch_size=10, queue_size=2)
+
+    assert result == 1000
+    assert written == list(range(1000))
+    # the batches in the queue, the batch being written and the batch being filled
+    assert max(ahead) <= 4 * 10
+
+
+@pytest.mark.asyncio
+async def test_consume_and_map_batches_raise_the_error_of_the_source():
+    async def source():
+        yield 1
+        raise ValueError('source failed')
+
+    with pytest.raises(ValueError, match='source failed'):
+        await AsyncRunner.consume(list, source(), batch_size=1)
+    with pytest.raises(ValueError, match='source failed'):
+        _ = [item async for item in AsyncRunner.map_batches(list, source(), batch_size=1)]
+
+
+@pytest.mark.asyncio
+async def test_map_batches():
+    async def source():
+        for i in range(25):
+            yield i
+
+    items = [item async for item in AsyncRunner.map_batches(lambda batch: [i * 2 for i in batch], source(),
+                                                            batch_size=10, queue_size=1)]
+    assert items == [i * 2 for i in range(25)]
+
+
+def test_import_with_settings_file_without_async_settings(tmp_path):
+    settings = json.loads(DEFAULT_SETTINGS_PATH.read_text())
+    del settings['async']
+    del settings['formats']['arrow']
+    settings['formats']['csv']['delimiter'] = ','
+    settings_path = tmp_path / 'settings.json'
+    settings_path.write_text(json.dumps(settings))
+
+    # the settings are read when the modules are imported, so this runs in a new interpreter
+    script = (f'from pathlib import Path\n'
+              f'from otlmow_converter.SettingsManager import load_settings\n'
+              f'load_settings(Path({str(settings_path)!r}))\n'
+              f'from otlmow_converter.AsyncRunner import OFFLOAD, BATCH_SIZE\n'
+              f'from otlmow_converter.FileFormats.ArrowTableBuilder import BATCH_SIZE as ARROW_BATCH_SIZE\n'
+              f'from otlmow_converter.FileFormats.CsvExporter import DELIMITER\n'
+              f'print(OFFLOAD, BATCH_SIZE, ARROW_BATCH_SIZE, DELIMITER)')
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                            cwd=Path(__file__).parent.parent)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ['True', '1000', '65536', ',']
@@ -1,8 +1,10 @@
+import os
 from datetime import date, datetime, time
 from pathlib import Path
 
 import pytest
 
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
 from otlmow_converter.Exceptions.NoTypeUriInTableError import NoTypeUriInTableError
 from otlmow_converter.Exceptions.TypeUriNotInFirstRowError import TypeUriNotInFirstRowError
 from otlmow_converter.FileFormats.CsvImporter import CsvImporter
@@ -163,3 +165,117 @@ def test_raise_errors():
         CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path)
         assert exc.value.message == 'Could not find typeURI within 5 rows in the csv file type_uri_not_in_file.csv'
         assert exc.value.file_path == file_location
+
+
+def test_load_test_file_with_workers(tmp_path, monkeypatch):
+    # more workers than CPUs are not started, so the processes are also used on a machine with one CPU
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    lines = (Path(__file__).parent / 'Testfiles' / 'import_then_export_input.csv').read_text().splitlines()
+    file_location = tmp_path / 'three_rows.csv'
+    file_location.write_text('\n'.join([lines[0]] + [lines[1].replace('UgVLnoH', f'id{i}') for i in range(3)]))
+
+    serial = list(CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path))
+    parallel = list(CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path,
+                                           workers=2, worker_batch_size=1))
+
+    assert parallel == serial
+    assert [a.assetId.identificator for a in parallel] == ['id0', 'id1', 'id2']
+    assert parallel[0].testComplexTypeMetKard[1].testComplexType2.testStringField == 'string2'
+
+
+def test_load_test_file_streaming(tmp_path):
+    lines = (Path(__file__).parent / 'Testfiles' / 'import_then_export_input.csv').read_text().splitlines()
+    file_location = tmp_path / 'many_rows.csv'
+    file_location.write_text('\n'.join([lines[0]] + [lines[1].replace('UgVLnoH', f'id{i}') for i in range(50)]))
+
+    expected = list(CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path))
+    assets = CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path, stream=True,
+                                    block_size=4096, batch_size=3)
+
+    assert next(assets) == expected[0]
+    assert [expected[0]] + list(assets) == expected
+
+
+def test_load_test_file_streaming_falls_back_to_python_reader(tmp_path):
+    lines = (Path(__file__).parent / 'Testfiles' / 'import_then_export_input.csv').read_text().splitlines()
+    rows = [lines[1].replace('UgVLnoH', f'id{i}') for i in range(50)]
+    rows[40] = rows[40].replace('2014-01-14', '14/01/2014')
+    file_location = tmp_path / 'other_date_format.csv'
+    file_location.write_text('\n'.join([lines[0]] + rows))
+
+    assets = list(CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path, stream=True,
+                                         block_size=4096))
+
+    assert [a.assetId.identificator for a in assets] == [f'id{i}' for i in range(50)]
+    assert assets[40].testDateField == date(2014, 1, 14)
+
+
+def test_load_test_file_streaming_falls_back_to_python_reader_in_first_row(tmp_path):
+    lines = (Path(__file__).parent / 'Testfiles' / 'import_then_export_input.csv').read_text().splitlines()
+    rows = [lines[1].replace('UgVLnoH', f'id{i}') for i in range(3)]
+    rows[0] = rows[0].replace('2014-01-14', '14/01/2014')
+    file_location = tmp_path / 'other_date_format_in_first_row.csv'
+    file_location.write_text('\n'.join([lines[0]] + rows))
+
+    assets = list(CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path, stream=True))
+
+    assert [a.assetId.identificator for a in assets] == ['id0', 'id1', 'id2']
+    assert assets[0].testDateField == date(2014, 1, 14)
+
+
+def test_load_multiple_types_streaming():
+    file_location = Path(__file__).parent / 'Testfiles' / 'multiple_types_empty_lines.csv'
+    assets = list(CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path, stream=True))
+
+    assert [a.assetId.identificator for a in assets] == ['allcases-1', 'another-1']
+
+
+def test_load_multiple_types_keeps_order_and_line_numbers(tmp_path):
+    all_cases = 'https://wegenenverkeer.data.vlaanderen.be/ns/onderdeel#AllCasesTestClass'
+    another = 'https://wegenenverkeer.data.vlaanderen.be/ns/onderdeel#AnotherTestClass'
+    file_location = tmp_path / 'mixed.csv'
+    file_location.write_text('\n'.join([
+        'typeURI;assetId.identificator;testIntegerField;testDateField;testIntegerFieldMetKard[];notitie',
+        f'{all_cases};a-1;1;2022-02-02;1|2;',
+        f'{another};b-1;;;;note',
+        ';;;;;',
+        f'{all_cases};a-2;2;;;',
+        f';no-type;;;;',
+        f'{another};b-2;;;;other note']))
+
+    with pytest.raises(BadLinesInExcelError) as exc_info:
+        CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path)
+    with pytest.raises(BadLinesInExcelError) as fallback_exc_info:
+        CsvImporter._python_fallback_to_objects(
+            filepath=file_location, delimiter=';', quote_char='"', model_directory=model_directory_path,
+            separator='.', cardinality_indicator='[]', waarde_shortcut=True, cardinality_separator='|',
+            cast_datetime=False, cast_list=False, allow_non_otl_conform_attributes=True,
+            warn_for_non_otl_conform_attributes=True)
+
+    # the row without values is not counted, on both paths
+    assert [e.line_number for e in exc_info.value.exceptions] == [5]
+    assert [e.line_number for e in fallback_exc_info.value.exceptions] == [5]
+    assets = exc_info.value.objects
+    assert [a.assetId.identificator for a in assets] == ['a-1', 'b-1', 'a-2', 'b-2']
+    assert assets[0].testIntegerField == 1
+    assert assets[0].testDateField == date(2022, 2, 2)
+    assert assets[0].testIntegerFieldMetKard == [1, 2]
+    assert assets[3].notitie == 'other note'
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_load_header_only_file_without_single_type(tmp_path, stream):
+    file_location = tmp_path / 'header_only.csv'
+    file_location.write_text('typeURI;assetId.identificator;assetId.toegekendDoor;testIntegerField\n')
+
+    assets = CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path, stream=stream)
+
+    assert list(assets) == []
+
+
+@pytest.mark.asyncio
+async def test_load_multiple_types_async():
+    file_location = Path(__file__).parent / 'Testfiles' / 'multiple_types_empty_lines.csv'
+    assets = await CsvImporter.to_objects_async(filepath=file_location, model_directory=model_directory_path)
+
+    assert assets == CsvImporter.to_objects(filepath=file_location, model_directory=model_directory_path)
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import pytest
@@ -10,7 +11,8 @@ from otlmow_converter.Exceptions.CannotCombineAssetsError import CannotCombineAs
 from otlmow_converter.Exceptions.CannotCombineDifferentAssetsError import CannotCombineDifferentAssetsError
 from otlmow_converter.Exceptions.ExceptionsGroup import ExceptionsGroup
 from otlmow_converter.Exceptions.NoIdentificatorError import NoIdentificatorError
-from otlmow_converter.HelperFunctions import combine_assets, combine_two_asset_instances, combine_files
+from otlmow_converter.HelperFunctions import combine_assets, combine_two_asset_instances, combine_files, \
+    combine_asset_instances
 
 
 @pytest.fixture
@@ -169,6 +171,37 @@ def test_combine_files_three_files_success(subtests):
     assert len(combined_objects) == 2
 
 
+def test_combine_files_returns_combined_and_single_assets(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    csv_path = combine_directory / 'asset_3.csv'
+    json_path = combine_directory / 'asset_3.json'
+    geojson_path = combine_directory / 'asset_3.geojson'
+    combined_objects = combine_files([csv_path, json_path, geojson_path], model_directory=test_model_directory)
+    combined_with_workers = combine_files([csv_path, json_path, geojson_path], model_directory=test_model_directory,
+                                          workers=2)
+
+    assert all(callable(getattr(asset, 'return_is_otl_object', None)) for asset in combined_objects)
+    assert combined_with_workers == combined_objects
+
+
+def test_combine_files_with_workers_raises_the_same_errors(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    csv_path = combine_directory / 'asset_2.csv'
+    json_path = combine_directory / 'asset_2.json'
+    bad_file = combine_directory / "not_a_real_file.json"
+
+    with pytest.raises(ExceptionsGroup) as exc_group:
+        combine_files([csv_path, json_path, bad_file], model_directory=test_model_directory)
+    with pytest.raises(ExceptionsGroup) as exc_group_with_workers:
+        combine_files([csv_path, json_path, bad_file], model_directory=test_model_directory, workers=2)
+
+    assert ([(type(ex), getattr(ex, 'message', None), getattr(ex, 'file_path', None))
+             for ex in exc_group.value.exceptions] ==
+            [(type(ex), getattr(ex, 'message', None), getattr(ex, 'file_path', None))
+             for ex in exc_group_with_workers.value.exceptions])
+    assert exc_group_with_workers.value.exceptions[0].file_path == bad_file
+
+
 def test_combine_files_file_read_error():
     # Create a dummy file path that does not exist or will cause an error
     bad_file = combine_directory / "not_a_real_file.json"
@@ -235,6 +268,17 @@ def test_combine_assets_two_instances_agent(agent_one_attribute, agent_one_attri
     assert results[0].contactinfo[0].contactnaam == 'naam_2'
 
 
+def test_combine_asset_instances_three_instances(minimum, one_attribute, one_complex_attribute,
+                                                 one_attribute_different):
+    result = combine_asset_instances([minimum, one_attribute, one_complex_attribute], test_model_directory)
+    assert result.toestand == 'in-gebruik'
+    assert result.testComplexTypeMetKard[0].testStringField == 'naam'
+
+    with pytest.raises(CannotCombineAssetsError) as exc:
+        combine_asset_instances([minimum, one_attribute, one_attribute_different], test_model_directory)
+    assert exc.value.attribute_errors == [('toestand', ('in-gebruik', 'in-opbouw'))]
+
+
 def test_combine_two_asset_instances_empty_arguments(empty):
     with pytest.raises(ValueError):
         combine_two_asset_instances(asset1=None, asset2=None)
@@ -305,3 +349,14 @@ def test_combine_two_asset_instances_one_complex_attribute_incompatible(one_comp
     assert exc.value.args[0] == (f'Cannot combine the assets with id 1 because some '
                            'attributes have conflicting values:\n'
                            "testComplexTypeMetKard[].testStringField: ['naam'], ['naam_2']")
+
+
+def test_combine_files_with_more_workers_than_cpus_loads_in_this_process(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 1)
+    monkeypatch.setattr('otlmow_converter.HelperFunctions.ProcessPoolExecutor', None)
+    csv_path = combine_directory / 'asset_3.csv'
+    json_path = combine_directory / 'asset_3.json'
+
+    combined_objects = combine_files([csv_path, json_path], model_directory=test_model_directory, workers=8)
+
+    assert all(callable(getattr(asset, 'return_is_otl_object', None)) for asset in combined_objects)
@@ -511,3 +511,39 @@ async def test_dataframe_to_objects():
     new_list_of_objects = await OtlmowConverter.collect_to_list(list_of_objects_gen)
 
     assert orig_list_of_objects == new_list_of_objects
+
+
+async def as_async_iterable(sequence):
+    for item in sequence:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_async_iterable_to_objects():
+    orig_list_of_objects = return_test_objects()
+    orig_list_of_dicts = [o.to_dict() for o in orig_list_of_objects]
+    orig_list_of_ddicts = [DotnotationDictConverter.to_dict(o) for o in orig_list_of_objects]
+
+    for subject in [orig_list_of_dicts, orig_list_of_ddicts, orig_list_of_objects]:
+        for offload in [True, False]:
+            objects_gen = to_objects_async(as_async_iterable(subject), model_directory=model_directory_path,
+                                           offload=offload, async_batch_size=1)
+            assert orig_list_of_objects == await OtlmowConverter.collect_to_list(objects_gen)
+
+
+@pytest.mark.asyncio
+async def test_async_iterable_to_file(tmp_path):
+    orig_list_of_objects = return_test_objects()
+    orig_list_of_dicts = [o.to_dict() for o in orig_list_of_objects]
+    orig_list_of_ddicts = [DotnotationDictConverter.to_dict(o) for o in orig_list_of_objects]
+
+    for subject in [orig_list_of_dicts, orig_list_of_ddicts, orig_list_of_objects]:
+        for file_name in ['async_iterable.json', 'async_iterable.xlsx']:
+            for offload in [True, False]:
+                file_path = tmp_path / file_name
+                await to_file_async(as_async_iterable(subject), file_path=file_path,
+                                    model_directory=model_directory_path, offload=offload, async_batch_size=1)
+                objects = await OtlmowConverter.collect_to_list(to_objects_async(
+                    file_path, model_directory=model_directory_path))
+                assert orig_list_of_objects == objects
+                file_path.unlink()
@@ -0,0 +1,107 @@
+from datetime import date
+from pathlib import Path
+
+import pytest
+from otlmow_model.OtlmowModel.Classes.Agent import Agent
+
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AnotherTestClass import AnotherTestClass
+from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.HelperFunctions import compute_delta, get_changed_columns_per_row
+from otlmow_converter.ObjectPayloadConverter import ObjectPayloadConverter
+from otlmow_converter.OtlmowConverter import OtlmowConverter
+
+model_directory_path = Path(__file__).parent / 'TestModel'
+
+
+def create_asset(identificator: str, **values) -> AllCasesTestClass:
+    asset = AllCasesTestClass()
+    asset.assetId.identificator = identificator
+    asset.testStringField = 'naam'
+    asset.testIntegerField = 1
+    asset.testDateField = date(2020, 1, 1)
+    asset.testStringFieldMetKard = ['a', 'b']
+    asset.testComplexType.testStringField = 'complex'
+    for key, value in values.items():
+        setattr(asset, key, value)
+    return asset
+
+
+def test_compute_delta():
+    retyped = AnotherTestClass()
+    retyped.assetId.identificator = 'retyped'
+
+    old = [create_asset('unchanged'), create_asset('deleted'), create_asset('changed'), create_asset('retyped')]
+    new = [create_asset('unchanged'), create_asset('added'), retyped,
+           create_asset('changed', testIntegerField=2, testStringFieldMetKard=['a', 'c'], testStringField=None)]
+
+    delta = compute_delta(old, new, model_directory=model_directory_path)
+
+    assert [a.assetId.identificator for a in delta.added] == ['added', 'retyped']
+    assert [a.assetId.identificator for a in delta.deleted] == ['deleted', 'retyped']
+    assert delta.changed_attributes == {
+        'changed': ['testIntegerField', 'testStringField', 'testStringFieldMetKard[]']}
+    assert DotnotationDictConverter.to_dict(delta.changed[0]) == {
+        'typeURI': AllCasesTestClass.typeURI,
+        'assetId.identificator': 'changed',
+        'testIntegerField': 2,
+        'testStringField': '88888888',
+        'testStringFieldMetKard[]': ['a', 'c']}
+
+
+def test_compute_delta_of_agents():
+    agent = Agent()
+    agent.agentId.identificator = 'agent'
+    agent.naam = 'naam'
+    changed_agent = Agent()
+    changed_agent.agentId.identificator = 'agent'
+    changed_agent.naam = 'naam_2'
+
+    delta = compute_delta([agent], [changed_agent])
+
+    assert delta.changed_attributes == {'agent': ['naam']}
+    assert delta.changed[0].agentId.identificator == 'agent'
+    assert delta.changed[0].naam == 'naam_2'
+
+
+def test_compute_delta_without_changes():
+    delta = compute_delta([create_asset('1'), create_asset('2')], (a for a in [create_asset('2'), create_asset('1')]))
+    assert delta == ([], [], [], {})
+
+
+def test_compute_delta_raises_for_duplicate_ids():
+    with pytest.raises(ValueError):
+        compute_delta([create_asset('1'), create_asset('1')], [])
+
+
+def test_compute_delta_can_be_written(tmp_path):
+    delta = compute_delta([create_asset('1')], [create_asset('1', testStringField=None, testIntegerField=5)],
+                          model_directory=model_directory_path)
+    file_path = tmp_path / 'delta.json'
+    OtlmowConverter.from_objects_to_file(file_path=file_path, sequence_of_objects=delta.changed)
+
+    read_back = list(OtlmowConverter.from_file_to_objects(file_path=file_path, model_directory=model_directory_path))
+    assert DotnotationDictConverter.to_dict(read_back[0]) == DotnotationDictConverter.to_dict(delta.changed[0])
+
+
+def test_get_changed_columns_per_row():
+    old_dicts = [{'a': 1, 'b': [1], 'c': None, 'd': date(2020, 1, 1)}, {'a': 2, 'b': [2]}, {'a': -1, 'e': True}]
+    new_dicts = [{'a': 1.0, 'b': [1], 'd': date(2020, 1, 2)}, {'a': 2, 'b': [3], 'c': 'x'}, {'a': -2, 'e': '88888888'}]
+
+    assert get_changed_columns_per_row(old_dicts, new_dicts) == [['d'], ['b', 'c'], ['a', 'e']]
+
+
+def test_get_changed_columns_per_row_detects_a_change_of_type():
+    old_dicts = [{'a': '1', 'b': True, 'c': [1], 'd': 0}, {'a': 1, 'b': 1, 'c': [True], 'd': None}]
+    new_dicts = [{'a': 1, 'b': 1, 'c': [True], 'd': False}, {'a': '1', 'b': True, 'c': [1], 'd': 0}]
+
+    assert get_changed_columns_per_row(old_dicts, new_dicts) == [['a', 'b', 'c', 'd'], ['a', 'b', 'c', 'd']]
+
+
+def test_get_content_hash():
+    assert (ObjectPayloadConverter.get_content_hash(create_asset('1')) ==
+            ObjectPayloadConverter.get_content_hash(create_asset('1')))
+    assert (ObjectPayloadConverter.get_content_hash(create_asset('1', testIntegerField=-1)) !=
+            ObjectPayloadConverter.get_content_hash(create_asset('1', testIntegerField=-2)))
+    assert (ObjectPayloadConverter.get_content_hash(create_asset('1', testStringFieldMetKard=['a', 'b'])) !=
+            ObjectPayloadConverter.get_content_hash(create_asset('1', testStringFieldMetKard=['a', 'b', 'c'])))
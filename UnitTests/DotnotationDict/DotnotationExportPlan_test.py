@@ -0,0 +1,79 @@
+from datetime import date, datetime
+
+import pytest
+
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AnotherTestClass import AnotherTestClass
+from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.DotnotationExportPlan import ExportPlanCache, EXPORT_PLAN_CACHE
+from otlmow_converter.Exceptions.DotnotationListOfListError import DotnotationListOfListError
+
+
+def create_objects() -> list:
+    instance = AllCasesTestClass()
+    instance.assetId.identificator = '0'
+    instance.testBooleanField = False
+    instance.testDateField = date(2022, 2, 2)
+    instance.testDateTimeField = datetime(2022, 2, 2, 12, 30)
+    instance.testIntegerFieldMetKard = [1, 2]
+    instance.testKwantWrd.waarde = 2.0
+    instance.testKwantWrdMetKard[0].waarde = 3.0
+    instance.testComplexType.testComplexType2.testStringField = 'a'
+    instance.testComplexType.testKwantWrdMetKard[0].waarde = 4.0
+    instance.testComplexTypeMetKard[0].testBooleanField = True
+    instance._testComplexTypeMetKard.add_empty_value()
+    instance.testComplexTypeMetKard[1].testStringField = 'b'
+    instance.testUnionType.unionString = 'u'
+
+    cleared = AllCasesTestClass()
+    cleared.assetId.identificator = '1'
+    cleared.clear_value('testIntegerField')
+    cleared.clear_value('testStringFieldMetKard')
+    cleared.testComplexType._testStringField.clear_value()
+    cleared.nonConform = 'extra'
+
+    another = AnotherTestClass()
+    another.notitie = 'note'
+    return [instance, cleared, another]
+
+
+@pytest.mark.parametrize('cast_list', [True, False])
+@pytest.mark.parametrize('cast_datetime', [True, False])
+def test_plan_gives_same_result_as_recursive_implementation(cast_list, cast_datetime):
+    for otl_object in create_objects() * 2:
+        planned = DotnotationDictConverter.to_dict(otl_object, cast_list=cast_list, cast_datetime=cast_datetime,
+                                                   warn_for_non_otl_conform_attributes=False)
+        recursive = dict(DotnotationDictConverter._iterate_over_attributes_and_values_by_dotnotation(
+            otl_object, cast_list=cast_list, cast_datetime=cast_datetime,
+            warn_for_non_otl_conform_attributes=False), typeURI=otl_object.typeURI)
+
+        assert list(planned.items()) == list(recursive.items())
+
+
+def test_plan_raises_for_list_of_lists_and_non_conform_attributes():
+    instance = AllCasesTestClass()
+    instance.testComplexTypeMetKard[0].testStringFieldMetKard = ['a', 'b']
+    with pytest.raises(DotnotationListOfListError):
+        DotnotationDictConverter.to_dict(instance)
+
+    another = AnotherTestClass()
+    another.nonConform = 'extra'
+    with pytest.raises(ValueError):
+        DotnotationDictConverter.to_dict(another, allow_non_otl_conform_attributes=False)
+
+
+def test_plan_is_reused_per_class_and_options():
+    EXPORT_PLAN_CACHE.clear()
+    for otl_object in create_objects():
+        DotnotationDictConverter.to_dict(otl_object, warn_for_non_otl_conform_attributes=False)
+        DotnotationDictConverter.to_dict(otl_object, separator='/', warn_for_non_otl_conform_attributes=False)
+
+    assert EXPORT_PLAN_CACHE.cache_info() == {'hits': 2, 'misses': 4, 'maxsize': 1024, 'currsize': 4}
+    assert DotnotationDictConverter.to_dict(create_objects()[0], separator='/')[
+        'testComplexType/testComplexType2/testStringField'] == 'a'
+
+    cache = ExportPlanCache(maxsize=1)
+    plan = cache.get_plan(AllCasesTestClass(), separator='.', cardinality_indicator='[]', waarde_shortcut=True)
+    assert cache.get_plan(AllCasesTestClass(), separator='.', cardinality_indicator='[]', waarde_shortcut=True) is plan
+    cache.get_plan(AnotherTestClass(), separator='.', cardinality_indicator='[]', waarde_shortcut=True)
+    assert cache.cache_info()['currsize'] == 1
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from otlmow_converter.DotnotationDict import DotnotationDict
+from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.DotnotationSetterPlan import SetterPlanCache, compile_setter_plan, SETTER_PLAN_CACHE
+
+model_directory_path = Path(__file__).parent.parent / 'TestModel'
+
+input_dicts = [
+    {'typeURI': AllCasesTestClass.typeURI, 'testBooleanField': 'False', 'testIntegerFieldMetKard[]': '1|2',
+     'testComplexTypeMetKard[].testBooleanField': 'True|False', 'testKwantWrd': '2.0',
+     'testComplexType.testKwantWrdMetKard[]': '3.0|4.0', 'testKeuzelijstMetKard[]': 'waarde-1|waarde-2',
+     'testDateField': '2022-02-02', 'testComplexType.testComplexType2.testStringField': 'a'},
+    {'typeURI': AllCasesTestClass.typeURI, 'testKwantWrdMetKard[]': [1.0, 2.0], 'testKeuzelijst': 'waarde-2',
+     'testComplexTypeMetKard[].testKwantWrd': [5.0, 6.0], 'testDecimalField': 2.5, 'testUnionType.unionString': 'u'},
+]
+
+
+@pytest.mark.parametrize('input_dict', input_dicts)
+@pytest.mark.parametrize('cast_list', [True, False])
+def test_plan_gives_same_result_as_recursive_implementation(input_dict, cast_list, monkeypatch):
+    if not cast_list:
+        input_dict = {k: (v.split('|') if k.count('[]') and isinstance(v, str) else v) for k, v in input_dict.items()}
+    planned = DotnotationDictConverter.from_dict(DotnotationDict(input_dict), cast_list=cast_list, cast_datetime=True,
+                                                 model_directory=model_directory_path)
+
+    monkeypatch.setattr(SETTER_PLAN_CACHE, 'get_plan', lambda *args, **kwargs: None)
+    recursive = DotnotationDictConverter.from_dict(DotnotationDict(input_dict), cast_list=cast_list,
+                                                   cast_datetime=True, model_directory=model_directory_path)
+
+    assert planned == recursive
+
+
+def test_compile_does_not_modify_instance():
+    instance = AllCasesTestClass()
+    plan = compile_setter_plan(instance, 'testComplexTypeMetKard[].testKwantWrd', separator='.',
+                               cardinality_indicator='[]', waarde_shortcut=True)
+
+    assert plan.path == [('_testComplexTypeMetKard', True)]
+    assert plan.inner_leaf is not None
+    assert instance == AllCasesTestClass()
+
+
+def test_compile_returns_none_for_list_of_lists_and_unknown_nested_attributes():
+    instance = AllCasesTestClass()
+    assert compile_setter_plan(instance, 'testComplexTypeMetKard[].testStringFieldMetKard[]', separator='.',
+                               cardinality_indicator='[]', waarde_shortcut=True) is None
+    assert compile_setter_plan(instance, 'testComplexType.doesNotExist', separator='.',
+                               cardinality_indicator='[]', waarde_shortcut=True) is None
+    assert compile_setter_plan(instance, 'testComplexTypeMetKard[].doesNotExist', separator='.',
+                               cardinality_indicator='[]', waarde_shortcut=True) is None
+    assert compile_setter_plan(instance, 'doesNotExist', separator='.',
+                               cardinality_indicator='[]', waarde_shortcut=True).is_non_conform
+
+
+def test_cache_hits_misses_and_eviction():
+    cache = SetterPlanCache(maxsize=2)
+    instance = AllCasesTestClass()
+    for _ in range(3):
+        cache.get_plan(instance, 'testBooleanField', '.', '[]', True)
+    cache.get_plan(instance, 'testKeuzelijst', '.', '[]', True)
+    cache.get_plan(instance, 'testKeuzelijst', '+', '()', False)
+
+    assert cache.cache_info() == {'hits': 2, 'misses': 3, 'maxsize': 2, 'currsize': 2}
+
+    cache.get_plan(instance, 'testBooleanField', '.', '[]', True)
+    assert cache.cache_info()['misses'] == 4
+
+    cache.clear()
+    assert cache.cache_info() == {'hits': 0, 'misses': 0, 'maxsize': 2, 'currsize': 0}
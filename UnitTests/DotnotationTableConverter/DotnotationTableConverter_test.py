@@ -5,7 +5,9 @@ from otlmow_model.OtlmowModel.BaseClasses.OTLObject import dynamic_create_instan
 
 from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
 from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AnotherTestClass import AnotherTestClass
-from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
+from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter, TablesPerTypeBuilder
 
 model_directory_path = Path(__file__).parent.parent / 'TestModel'
 
@@ -31,6 +33,52 @@ def test_get_data_from_table():
     assert objects[1].typeURI == 'https://wegenenverkeer.data.vlaanderen.be/ns/onderdeel#AnotherTestClass'
 
 
+def test_iter_data_from_table_consumes_rows_lazily():
+    consumed = []
+
+    def rows():
+        for row in [{'typeURI': 0, 'assetId.identificator': 1},
+                    {'typeURI': AllCasesTestClass.typeURI, 'assetId.identificator': '0'},
+                    {'typeURI': AnotherTestClass.typeURI, 'assetId.identificator': '1'}]:
+            consumed.append(row)
+            yield row
+
+    generator = DotnotationTableConverter.iter_data_from_table(rows(), model_directory=model_directory_path)
+    assert consumed == []
+
+    first = next(generator)
+    assert first.assetId.identificator == '0'
+    assert len(consumed) == 2
+
+    assert [o.assetId.identificator for o in generator] == ['1']
+
+
+def test_iter_data_from_table_line_errors():
+    table_data = [{'typeURI': 0, 'testIntegerField': 1},
+                  {'typeURI': AllCasesTestClass.typeURI, 'testIntegerField': 'not a number'},
+                  {'typeURI': AllCasesTestClass.typeURI, 'testIntegerField': 2}]
+
+    line_errors = []
+    objects = list(DotnotationTableConverter.iter_data_from_table(
+        [dict(d) for d in table_data], model_directory=model_directory_path, on_line_error=line_errors.append,
+        combine_errors=True))
+    assert [o.testIntegerField for o in objects] == [2]
+    assert [e.line_number for e in line_errors] == [2]
+
+    objects = []
+    with pytest.raises(BadLinesInExcelError) as exc_info:
+        for o in DotnotationTableConverter.iter_data_from_table(
+                [dict(d) for d in table_data], model_directory=model_directory_path, combine_errors=True):
+            objects.append(o)
+    assert len(objects) == 1
+    assert exc_info.value.exceptions[0].line_number == 2
+
+    with pytest.raises(BadLinesInExcelError) as exc_info:
+        DotnotationTableConverter.get_data_from_table([dict(d) for d in table_data],
+                                                      model_directory=model_directory_path, combine_errors=True)
+    assert len(exc_info.value.objects) == 1
+
+
 def test_get_single_table_from_data():
     instance_1 = AllCasesTestClass()
     instance_1.assetId.identificator = '0'
@@ -165,3 +213,63 @@ def test_get_tables_per_type_from_data(subtests):
 
         assert test_dictionary['Agent'][1]['typeURI'] == agent_instance.typeURI
         assert test_dictionary['Agent'][1]['naam'] == agent_instance.naam
+
+
+def create_sparse_objects() -> list:
+    objects = []
+    for i in range(6):
+        instance = AllCasesTestClass()
+        instance.assetId.identificator = f'{i}'
+        if i % 2:
+            instance.testStringField = f'string{i}'
+        if i % 3:
+            instance.testIntegerFieldMetKard = [i, i + 1]
+        objects.append(instance)
+        another = AnotherTestClass()
+        another.assetId.identificator = f'another{i}'
+        objects.append(another)
+    return objects
+
+
+@pytest.mark.parametrize('values_as_string', [False, True])
+@pytest.mark.parametrize('empty_string_equals_none', [False, True])
+def test_tables_per_type_builder_gives_the_tables_of_get_tables_per_type_from_data(values_as_string,
+                                                                                    empty_string_equals_none):
+    objects = create_sparse_objects()
+    builder = TablesPerTypeBuilder(values_as_string=values_as_string,
+                                   empty_string_equals_none=empty_string_equals_none)
+    for otl_object in objects:
+        builder.add(otl_object)
+
+    tables = DotnotationTableConverter.get_tables_per_type_from_data(objects, values_as_string=values_as_string)
+    assert {short_uri: [headers, *rows] for short_uri, headers, rows in builder.iter_tables()} == {
+        short_uri: DotnotationTableConverter.transform_list_of_dicts_to_2d_sequence(
+            table, empty_string_equals_none=empty_string_equals_none)
+        for short_uri, table in tables.items()}
+
+
+def test_tables_per_type_builder_leaves_the_tables_as_they_were_when_an_object_fails(monkeypatch):
+    objects = create_sparse_objects()
+    failing = objects[3]
+    iter_items = DotnotationDictConverter.iter_items
+
+    def fail_halfway(otl_object, **kwargs):
+        for index, item in enumerate(iter_items(otl_object, **kwargs)):
+            if otl_object is failing and index == 1:
+                raise ValueError('failed halfway')
+            yield item
+
+    monkeypatch.setattr(DotnotationDictConverter, 'iter_items', fail_halfway)
+    builder = TablesPerTypeBuilder()
+    for otl_object in objects:
+        try:
+            builder.add(otl_object)
+        except ValueError:
+            pass
+
+    expected = TablesPerTypeBuilder()
+    for otl_object in objects:
+        if otl_object is not failing:
+            expected.add(otl_object)
+    assert ([(short_uri, headers, list(rows)) for short_uri, headers, rows in builder.iter_tables()] ==
+            [(short_uri, headers, list(rows)) for short_uri, headers, rows in expected.iter_tables()])
@@ -3,6 +3,8 @@ import os
 from datetime import date, datetime, time
 from pathlib import Path
 
+import pytest
+
 from otlmow_model.OtlmowModel.Classes.Installatie.BeweegbareWaterkerendeConstructie import \
     BeweegbareWaterkerendeConstructie
 from otlmow_model.OtlmowModel.Classes.Installatie.Bochtafbakeningsinstallatie import Bochtafbakeningsinstallatie
@@ -10,7 +12,9 @@ from otlmow_model.OtlmowModel.Classes.Agent import Agent
 
 from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
 from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.Bevestiging import Bevestiging
-from otlmow_converter.FileFormats.ExcelExporter import ExcelExporter
+from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
+from otlmow_converter.FileFormats.ExcelExporter import ExcelExporter, LIST_AS_STRING, DATETIME_AS_STRING
 from otlmow_converter.FileFormats.ExcelImporter import ExcelImporter
 
 model_directory_path = Path(__file__).parent.parent / 'TestModel'
@@ -311,3 +315,66 @@ def test_export_agent(recwarn):
                          'testTimeField', 'theoretischeLevensduur', 'toestand']
 
     os.unlink(file_location)
+
+
+def create_sparse_objects() -> list:
+    objects = []
+    for i in range(20):
+        instance = AllCasesTestClass()
+        instance.assetId.identificator = f'{i:04}'
+        if i % 2:
+            instance.testStringField = f'string{i}'
+        if i % 3:
+            instance.testIntegerFieldMetKard = [i, i + 1]
+        if i % 5 == 0:
+            instance.testComplexType.testKwantWrd.waarde = float(i)
+        objects.append(instance)
+        bevestiging = Bevestiging()
+        bevestiging.assetId.identificator = f'b{i:04}'
+        if i % 4:
+            bevestiging.bronAssetId.identificator = f'{i:04}'
+        objects.append(bevestiging)
+    return objects
+
+
+def get_expected_sheets(objects: list) -> dict:
+    tables = DotnotationTableConverter.get_tables_per_type_from_data(
+        objects, values_as_string=True, cast_list=LIST_AS_STRING, cast_datetime=DATETIME_AS_STRING)
+    return {class_name: [[None if value == '' else value for value in row]
+                         for row in DotnotationTableConverter.transform_list_of_dicts_to_2d_sequence(
+                             table, empty_string_equals_none=True)]
+            for class_name, table in tables.items()}
+
+
+def test_export_streams_rows_of_sparse_objects_in_sorted_columns(recwarn, monkeypatch):
+    file_location = Path(__file__).parent / 'Testfiles' / 'sparse_objects_generated.xlsx'
+    objects = create_sparse_objects()
+
+    converted = []
+    iter_items = DotnotationDictConverter.iter_items
+    monkeypatch.setattr(DotnotationDictConverter, 'iter_items',
+                        lambda otl_object, **kwargs: converted.append(otl_object) or iter_items(otl_object, **kwargs))
+
+    ExcelExporter.from_objects(sequence_of_objects=iter(objects), filepath=file_location)
+    warns = [w for w in recwarn.list if w.category is not DeprecationWarning]
+    assert not warns
+    # every object is converted once, in one pass over the iterator
+    assert converted == objects
+
+    data = ExcelImporter.get_data_dict_from_file_path(filepath=file_location)
+    assert data == get_expected_sheets(objects)
+
+    os.unlink(file_location)
+
+
+@pytest.mark.asyncio
+async def test_export_async_streams_rows_of_sparse_objects_in_sorted_columns():
+    file_location = Path(__file__).parent / 'Testfiles' / 'sparse_objects_async_generated.xlsx'
+    objects = create_sparse_objects()
+
+    await ExcelExporter.from_objects_async(sequence_of_objects=objects, filepath=file_location)
+
+    data = ExcelImporter.get_data_dict_from_file_path(filepath=file_location)
+    assert data == get_expected_sheets(objects)
+
+    os.unlink(file_location)
@@ -1,9 +1,13 @@
 import datetime
 import os
+import re
+import zipfile
 from pathlib import Path
 
+import openpyxl
 import pytest
 
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
 from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
 from otlmow_converter.Exceptions.ErrorInExcelLine import ErrorInExcelLine
 from otlmow_converter.Exceptions.ExceptionsGroup import ExceptionsGroup
@@ -264,4 +268,145 @@ def test_load_multiple_errors_in_different_lines(recwarn):
              '- OTLAttributeError on attribute "testDateField" with value "aaa": CouldNotConvertToCorrectTypeError'))
     assert (str(bad_lines_error.exceptions[2]) ==
             ('Error in line 6: MultipleAttributeError with 1 error(s):\n'
-             '- OTLAttributeError on attribute "testBooleanField" with value "aaa": CouldNotConvertToCorrectTypeError'))
\ No newline at end of file
+             '- OTLAttributeError on attribute "testBooleanField" with value "aaa": CouldNotConvertToCorrectTypeError'))
+
+@pytest.mark.parametrize('file_name', ['unnested_attributes.xlsx', 'nested_attributes_2.xlsx', 'empty_lines.xlsx',
+                                       'file_with_date.xlsx', 'empty_sheet.xlsx'])
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_load_streaming_gives_same_objects(file_name):
+    file_location = Path(__file__).parent / 'Testfiles' / file_name
+
+    objects = ExcelImporter.to_objects(filepath=file_location, model_directory=model_directory_path)
+    streamed = ExcelImporter.to_objects(filepath=file_location, model_directory=model_directory_path, stream=True)
+
+    assert not isinstance(streamed, list)
+    assert list(streamed) == objects
+
+
+def test_load_streaming_multiple_errors_in_different_lines():
+    file_location = Path(__file__).parent / 'Testfiles' / 'multiple_errors_in_different_lines.xlsx'
+
+    objects = []
+    with pytest.raises(ExceptionsGroup) as ex:
+        for instance in ExcelImporter.to_objects(filepath=file_location, model_directory=model_directory_path,
+                                                 warn_for_non_otl_conform_attributes=False, stream=True):
+            objects.append(instance)
+
+    assert len(objects) == 2
+    assert len(ex.value.exceptions) == 1
+    bad_lines_error = ex.value.exceptions[0]
+    assert isinstance(bad_lines_error, BadLinesInExcelError)
+    assert [str(e).split(':')[0] for e in bad_lines_error.exceptions] == [
+        'Error in line 2', 'Error in line 4', 'Error in line 6']
+
+
+@pytest.mark.parametrize('file_name', ['unnested_attributes.xlsx', 'nested_attributes_2.xlsx', 'empty_lines.xlsx',
+                                       'file_with_date.xlsx', 'empty_sheet.xlsx', 'non_conform_attribute.xlsx'])
+def test_get_data_dict_with_lxml_gives_same_rows(file_name):
+    file_location = Path(__file__).parent / 'Testfiles' / file_name
+
+    assert (ExcelImporter.get_data_dict_from_file_path(file_location, use_lxml=True) ==
+            ExcelImporter.get_data_dict_from_file_path(file_location))
+
+
+def test_get_data_dict_with_lxml_falls_back_to_openpyxl_for_formulas(tmp_path):
+    file_location = tmp_path / 'formula.xlsx'
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['typeURI', 'testIntegerField', 'testDateField'])
+    sheet.append(['uri', 1, datetime.date(2020, 1, 2)])
+    sheet.append(['uri', '=1+1', datetime.date(2020, 1, 3)])  # written without cached value
+    sheet.append(['uri', 3, 'TRUE'])
+    workbook.save(file_location)
+
+    data = ExcelImporter.get_data_dict_from_file_path(file_location, use_lxml=True)
+
+    assert data == ExcelImporter.get_data_dict_from_file_path(file_location)
+    assert data['Sheet'][1] == ['uri', 1, datetime.datetime(2020, 1, 2)]
+    assert data['Sheet'][3] == ['uri', 3, True]
+
+
+def write_workbook_with_wrong_dimension(file_location: Path, rows: list[list]) -> None:
+    """Writes the rows to a workbook of which the sheet claims to only have cell A1, like some tools write it"""
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(file_location)
+    with zipfile.ZipFile(file_location) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    parts['xl/worksheets/sheet1.xml'] = re.sub(rb'<dimension ref="[^"]*"\s*/>', b'<dimension ref="A1"/>',
+                                               parts['xl/worksheets/sheet1.xml'])
+    with zipfile.ZipFile(file_location, 'w') as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content)
+
+
+@pytest.mark.parametrize('use_lxml', [False, True])
+@pytest.mark.parametrize('stream', [False, True])
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_load_ignores_wrong_dimension(tmp_path, use_lxml, stream):
+    file_location = tmp_path / 'wrong_dimension.xlsx'
+    write_workbook_with_wrong_dimension(file_location, [
+        ['typeURI', 'assetId.identificator', 'testIntegerField'],
+        *[[AllCasesTestClass.typeURI, f'id-{index}', index] for index in range(3)]])
+
+    objects = list(ExcelImporter.to_objects(filepath=file_location, model_directory=model_directory_path,
+                                            use_lxml=use_lxml, stream=stream))
+
+    assert [(o.assetId.identificator, o.testIntegerField) for o in objects] == [('id-0', 0), ('id-1', 1),
+                                                                                ('id-2', 2)]
+
+
+@pytest.mark.parametrize('use_lxml', [False, True])
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_load_value_without_header_with_wrong_dimension(tmp_path, use_lxml):
+    file_location = tmp_path / 'wrong_dimension.xlsx'
+    write_workbook_with_wrong_dimension(file_location, [
+        ['typeURI', 'assetId.identificator'],
+        [AllCasesTestClass.typeURI, 'id-0', 'no header']])
+
+    with pytest.raises(ExceptionsGroup) as ex:
+        ExcelImporter.to_objects(filepath=file_location, model_directory=model_directory_path, use_lxml=use_lxml)
+
+    assert isinstance(ex.value.exceptions[0], MissingHeaderError)
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_load_multiple_sheets_with_workers(tmp_path, monkeypatch):
+    # more workers than CPUs are not started, so the processes are also used on a machine with one CPU
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    file_location = tmp_path / 'multiple_sheets.xlsx'
+    workbook = openpyxl.Workbook()
+    for sheet_index, sheet_name in enumerate(['first', 'second']):
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append(['typeURI', 'assetId.identificator', 'testIntegerField', 'testKeuzelijstMetKard[]'])
+        for row_index in range(5):
+            sheet.append([AllCasesTestClass.typeURI, f'{sheet_name}-{row_index}', sheet_index * 10 + row_index,
+                          'waarde-1|waarde-2'])
+    workbook.remove(workbook['Sheet'])
+    workbook.save(file_location)
+
+    objects = ExcelImporter.to_objects(filepath=file_location, model_directory=model_directory_path)
+    with_workers = ExcelImporter.to_objects(filepath=file_location, model_directory=model_directory_path,
+                                            workers=2, worker_batch_size=2)
+
+    assert len(objects) == 10
+    assert with_workers == objects
+
+
+@pytest.mark.parametrize('file_name', ['multiple_errors_in_different_lines.xlsx', 'bad_columns.xlsx'])
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_load_errors_with_workers(file_name, monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    file_location = Path(__file__).parent / 'Testfiles' / file_name
+
+    with pytest.raises(ExceptionsGroup) as serial:
+        ExcelImporter.to_objects(filepath=file_location, model_directory=model_directory_path,
+                                 warn_for_non_otl_conform_attributes=False)
+    with pytest.raises(ExceptionsGroup) as with_workers:
+        ExcelImporter.to_objects(filepath=file_location, model_directory=model_directory_path,
+                                 warn_for_non_otl_conform_attributes=False, workers=2, worker_batch_size=2)
+
+    assert with_workers.value.objects == serial.value.objects
+    assert [(type(e), e.tab, str(e)) for e in with_workers.value.exceptions] == [
+        (type(e), e.tab, str(e)) for e in serial.value.exceptions]
@@ -2,11 +2,13 @@ import pytest
 
 from otlmow_converter.Exceptions.InvalidExtensionError import InvalidExtensionError
 from otlmow_converter.FileExporter import FileExporter
+from otlmow_converter.FileFormats.ArrowExporter import ArrowExporter
 from otlmow_converter.FileFormats.CsvExporter import CsvExporter
 from otlmow_converter.FileFormats.ExcelExporter import ExcelExporter
 from otlmow_converter.FileFormats.GeoJSONExporter import GeoJSONExporter
 from otlmow_converter.FileFormats.JsonExporter import JsonExporter
 from otlmow_converter.FileFormats.JsonLdExporter import JsonLdExporter
+from otlmow_converter.FileFormats.ParquetExporter import ParquetExporter
 from otlmow_converter.FileFormats.TtlExporter import TtlExporter
 
 
@@ -17,6 +19,9 @@ from otlmow_converter.FileFormats.TtlExporter import TtlExporter
                           ('xls', ExcelExporter),
                           ('xlsx', ExcelExporter),
                           ('csv', CsvExporter),
+                          ('parquet', ParquetExporter),
+                          ('arrow', ArrowExporter),
+                          ('feather', ArrowExporter),
                           #('ttl', TtlExporter),
                           ('dwg', None)])  # None represents the expected result when an InvalidExtensionError is raised
 def test_return_Exporter_correct_type(subtests, extension, expected_exporter):
@@ -350,3 +350,29 @@ def test_convert_wkt_string_to_geojson_multipolygon():
         "bbox": [200000.1, 200000.2, 0, 200002.5, 200002.8, 0],
         "crs": {"properties": {"name": "EPSG:31370"}, "type": "name"}}
 
+
+
+@pytest.mark.parametrize('number_of_dicts', [0, 2])
+def test_export_dotnotation_dicts_writes_same_document_as_encoding_at_once(tmp_path, number_of_dicts):
+    dicts = [{'typeURI': AllCasesTestClass.typeURI, 'assetId.identificator': f'id-{i}',
+              'geometry': 'LINESTRING Z (200000 200000 0, 200001 200001 1)', 'testStringField': 'a'}
+             for i in range(number_of_dicts)]
+    file_location = tmp_path / 'export.geojson'
+    GeoJSONExporter.from_dotnotation_dicts(iter([dict(d) for d in dicts]), filepath=file_location)
+
+    features = [{'id': d['assetId.identificator'], 'properties': {k: v for k, v in d.items() if k != 'geometry'},
+                 'type': 'Feature', 'geometry': GeoJSONExporter.convert_wkt_string_to_geojson(d['geometry'])}
+                for d in dicts]
+    assert file_location.read_text() == json.JSONEncoder(indent=4).encode(
+        {'type': 'FeatureCollection', 'features': features})
+
+
+def test_export_error_does_not_create_file(tmp_path):
+    file_location = tmp_path / 'export.geojson'
+    dicts = [{'typeURI': AllCasesTestClass.typeURI, 'assetId.identificator': 'id-0'},
+             {'typeURI': AllCasesTestClass.typeURI, 'assetId.identificator': 'id-1', 'geometry': 'NOT A WKT'}]
+
+    with pytest.raises(ValueError):
+        GeoJSONExporter.from_dotnotation_dicts(sequence_of_dotnotation_dicts=dicts, filepath=file_location)
+
+    assert list(tmp_path.iterdir()) == []
@@ -222,3 +222,41 @@ async def test_export_and_then_import_nested_attributes_level_2(recwarn):
     }]
 
     os.unlink(file_location)
+
+
+@pytest.mark.parametrize('number_of_objects', [0, 1, 3])
+def test_export_generator_writes_same_document_as_encoding_at_once(tmp_path, number_of_objects):
+    def generate_objects():
+        for i in range(number_of_objects):
+            instance = AllCasesTestClass()
+            instance.assetId.identificator = f'id-{i}'
+            instance.testComplexTypeMetKard[0].testStringField = 'nested'
+            instance.testStringFieldMetKard = ['string1', 'string2']
+            yield instance
+
+    file_location = tmp_path / 'export.json'
+    JsonExporter.from_objects(sequence_of_objects=generate_objects(), filepath=file_location, write_buffer_size=16)
+
+    expected = [dict(o.to_dict(cast_datetime=True), typeURI=o.typeURI) for o in generate_objects()]
+    assert file_location.read_text() == json.JSONEncoder(indent=4).encode(expected)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('use_async', [False, True])
+async def test_export_error_leaves_existing_file_untouched(tmp_path, use_async):
+    def generate_objects():
+        instance = AllCasesTestClass()
+        instance.assetId.identificator = 'id-0'
+        yield instance
+        raise ValueError('conversion failed')
+
+    file_location = tmp_path / 'export.json'
+    file_location.write_text('previous export')
+    with pytest.raises(ValueError):
+        if use_async:
+            await JsonExporter.from_objects_async(sequence_of_objects=generate_objects(), filepath=file_location)
+        else:
+            JsonExporter.from_objects(sequence_of_objects=generate_objects(), filepath=file_location)
+
+    assert file_location.read_text() == 'previous export'
+    assert list(tmp_path.iterdir()) == [file_location]
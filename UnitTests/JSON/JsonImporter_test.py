@@ -1,9 +1,11 @@
+import json
 import os
 from datetime import date, datetime, time
 from pathlib import Path
 
 import pytest
 
+from otlmow_converter.FileFormats.JsonDecoder import JsonDecoder
 from otlmow_converter.FileFormats.JsonImporter import JsonImporter
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -164,3 +166,69 @@ async def test_load_test_non_conform(recwarn, subtests):
         assert instance.assetId.identificator == '0000-0000'
         assert not instance.testBooleanField
         assert instance.non_conform_attribute == 'non_conform_value'
+
+
+@pytest.mark.parametrize('file_name', ['unnested_attributes.json', 'nested_attributes_1.json',
+                                       'nested_attributes_2.json'])
+def test_load_streaming_same_as_in_memory(file_name):
+    file_location = Path(__file__).parent / 'Testfiles' / file_name
+
+    expected = JsonImporter.to_objects(filepath=file_location, model_directory=model_directory_path)
+    streamed = JsonImporter.to_objects(filepath=file_location, model_directory=model_directory_path, stream=True,
+                                       chunk_size=7)
+
+    assert not isinstance(streamed, list)
+    assert list(streamed) == expected
+
+
+@pytest.mark.parametrize('use_ijson', [False, True])
+def test_iter_json_array_over_chunk_boundaries(tmp_path, use_ijson):
+    if use_ijson:
+        pytest.importorskip('ijson')
+    file_location = tmp_path / 'array.json'
+    elements = [{'a': 1, 'b': [1.5, 'x, ]'], 'c': {'d': None}}, 12345, 'text', [], {}]
+    file_location.write_text(' [\n' + ',\n  '.join(json.dumps(e) for e in elements) + '\n]\n')
+
+    for chunk_size in (1, 3, 1000):
+        assert list(JsonDecoder.iter_json_array(file_location, chunk_size=chunk_size, use_ijson=use_ijson)
+                    ) == elements
+
+    file_location.write_text('[{"a": 1} {"b": 2}]')
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonDecoder.iter_json_array(file_location, chunk_size=4, use_ijson=False))
+
+
+@pytest.mark.parametrize('use_ijson', [False, True])
+def test_iter_json_array_with_byte_order_mark(tmp_path, use_ijson):
+    if use_ijson:
+        pytest.importorskip('ijson')
+    file_location = tmp_path / 'bom.json'
+    file_location.write_text('[{"a": 1}, 2]', encoding='utf-8-sig')
+
+    assert list(JsonDecoder.iter_json_array(file_location, chunk_size=4, use_ijson=use_ijson)) == [{'a': 1}, 2]
+
+
+def test_iter_json_array_raises_on_first_malformed_element(tmp_path, monkeypatch):
+    file_location = tmp_path / 'malformed.json'
+    file_location.write_text('[{"a": 1 x}, ' + ', '.join(['{"b": 2}'] * 1000) + ']')
+    reads = []
+
+    class CountingFile:
+        def __init__(self, file):
+            self.file = file
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.file.close()
+
+        def read(self, size):
+            reads.append(size)
+            return self.file.read(size)
+
+    monkeypatch.setattr('otlmow_converter.FileFormats.JsonDecoder.open',
+                        lambda *args, **kwargs: CountingFile(open(*args, **kwargs)), raising=False)
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonDecoder.iter_json_array(file_location, chunk_size=64, use_ijson=False))
+    assert len(reads) <= 2
@@ -0,0 +1,62 @@
+import inspect
+from pathlib import Path
+
+import pytest
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
+
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from otlmow_converter.Exceptions.DotnotationListOfListError import DotnotationListOfListError
+from otlmow_converter.ModelIndex import ModelIndex
+
+model_directory_path = Path(__file__).parent / 'TestModel'
+
+
+def test_get_attribute_info():
+    model_index = ModelIndex(model_directory_path)
+
+    info = model_index.get_attribute_info(AllCasesTestClass.typeURI, 'testKeuzelijstMetKard[]', separator='.',
+                                          cardinality_indicator='[]', waarde_shortcut=True)
+    assert info.native_type is str
+    assert info.kardinaliteit_max == '*'
+    assert not info.waarde_object
+    assert 'waarde-1' in info.options
+
+    info = model_index.get_attribute_info(AllCasesTestClass.typeURI, 'testComplexType.testKwantWrd', separator='.',
+                                          cardinality_indicator='[]', waarde_shortcut=True)
+    assert info.native_type is float
+    assert info.options is None
+
+
+def test_get_attribute_info_raises_for_invalid_dotnotation_on_every_lookup():
+    model_index = ModelIndex(model_directory_path)
+    errors = []
+    for _ in range(2):
+        with pytest.raises(AttributeError) as exc_info:
+            model_index.get_attribute_info(AllCasesTestClass.typeURI, 'doesNotExist', separator='.',
+                                           cardinality_indicator='[]', waarde_shortcut=True)
+        errors.append(exc_info.value)
+        with pytest.raises(DotnotationListOfListError):
+            model_index.get_attribute_info(AllCasesTestClass.typeURI, 'testComplexTypeMetKard[].testStringFieldMetKard[]',
+                                           separator='.', cardinality_indicator='[]', waarde_shortcut=True)
+    # every lookup raises a new error, so the traceback and context of one caller do not leak to the next
+    assert errors[0] is not errors[1]
+    assert errors[0].args == errors[1].args
+
+
+def test_for_model_directory_shares_the_index_of_the_same_directory():
+    assert ModelIndex.for_model_directory(model_directory_path) is ModelIndex.for_model_directory(
+        model_directory_path / 'OtlmowModel' / '..')
+    default_directory = Path(inspect.getfile(OTLObject)).parent.parent.parent
+    assert ModelIndex.for_model_directory(None) is ModelIndex.for_model_directory(default_directory)
+
+
+def test_save_and_load(tmp_path):
+    model_index = ModelIndex(model_directory_path)
+    for dotnotation in ['testDateField', 'testComplexType', 'testKeuzelijst', 'testIntegerFieldMetKard[]']:
+        model_index.get_attribute_info(AllCasesTestClass.typeURI, dotnotation, separator='.',
+                                       cardinality_indicator='[]', waarde_shortcut=True)
+    model_index.save(tmp_path / 'index.json')
+
+    loaded = ModelIndex.load(tmp_path / 'index.json', model_directory=model_directory_path)
+
+    assert loaded._attributes == model_index._attributes
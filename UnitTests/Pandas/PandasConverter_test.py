@@ -2,11 +2,14 @@ import os
 from datetime import date, datetime, time
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pytest
 from pandas import DataFrame, isna
 
 from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
 from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AnotherTestClass import AnotherTestClass
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
 from otlmow_converter.FileFormats.PandasConverter import PandasConverter
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -506,3 +509,90 @@ def test_pandas_version_compatibility():
     assert objects_roundtrip[0].assetId.identificator == 'round-trip-id'
     assert objects_roundtrip[0].testIntegerField == 42
     assert objects_roundtrip[0].testStringFieldMetKard == ['a', 'b', 'c']
+
+
+def test_convert_dataframe_to_objects_cleans_columns():
+    type_uri = 'https://wegenenverkeer.data.vlaanderen.be/ns/onderdeel#AllCasesTestClass'
+    df = DataFrame({
+        'typeURI': [type_uri, type_uri, type_uri],
+        'assetId.identificator': pd.Series(['1', '2', 'nan'], dtype='string'),
+        'testStringField': ['nan', None, 'a'],
+        'testIntegerField': pd.Series([1, None, 3], dtype='Int64'),
+        'testDecimalField': [1.5, float('nan'), 2.5],
+        'testStringFieldMetKard[]': [np.array(['a', 'b']), None, ['c']],
+        'testDateTimeField': pd.to_datetime(['2020-01-01 10:00', None, '2020-01-03 00:00']),
+        'testBooleanField': [True, 'nan', np.bool_(False)]})
+
+    objects = PandasConverter.convert_dataframe_to_objects(dataframe=df, model_directory=model_directory_path)
+
+    assert [o.assetId.identificator for o in objects] == ['1', '2', None]
+    assert [o.testStringField for o in objects] == [None, None, 'a']
+    assert [o.testIntegerField for o in objects] == [1, None, 3]
+    assert [o.testDecimalField for o in objects] == [1.5, None, 2.5]
+    assert [o.testStringFieldMetKard for o in objects] == [['a', 'b'], None, ['c']]
+    assert [o.testDateTimeField for o in objects] == [datetime(2020, 1, 1, 10), None, datetime(2020, 1, 3)]
+    assert [o.testBooleanField for o in objects] == [True, None, False]
+
+
+def test_convert_dataframe_to_objects_raises_bad_lines_with_objects():
+    df = DataFrame({
+        'typeURI': ['https://wegenenverkeer.data.vlaanderen.be/ns/onderdeel#AllCasesTestClass', None],
+        'assetId.identificator': ['1', '2']})
+
+    with pytest.raises(BadLinesInExcelError) as exc_info:
+        PandasConverter.convert_dataframe_to_objects(dataframe=df, model_directory=model_directory_path)
+    assert [o.assetId.identificator for o in exc_info.value.objects] == ['1']
+    assert exc_info.value.exceptions[0].line_number == 3
+
+
+def test_convert_objects_to_dataframe_arrow_backend():
+    instance = AllCasesTestClass()
+    instance.assetId.identificator = '01'
+    instance.testIntegerField = 5
+    instance.testDateField = date(2020, 1, 1)
+    instance.testStringFieldMetKard = ['a', 'b']
+    instance2 = AllCasesTestClass()
+    instance2.assetId.identificator = '02'
+    instance2.testDecimalField = 1.5
+    instance3 = AnotherTestClass()
+    instance3.assetId.identificator = '03'
+    instance3.notitie = 'note'
+
+    df = PandasConverter.convert_objects_to_single_dataframe(list_of_objects=[instance, instance2, instance3],
+                                                             backend='arrow')
+
+    assert list(df.columns)[0] == 'typeURI'
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+    assert str(df['testIntegerField'].dtype) == 'int64[pyarrow]'
+    assert str(df['testDecimalField'].dtype) == 'double[pyarrow]'
+    assert str(df['testDateField'].dtype) == 'date32[day][pyarrow]'
+    assert str(df['testStringFieldMetKard[]'].dtype) == 'list<item: string>[pyarrow]'
+    assert df['testIntegerField'].tolist()[0] == 5
+    assert isna(df['testIntegerField'][2])
+
+    objects = PandasConverter.convert_dataframe_to_objects(dataframe=df, model_directory=model_directory_path)
+    assert objects == [instance, instance2, instance3]
+
+    dfs = PandasConverter.convert_objects_to_multiple_dataframes(
+        sequence_of_objects=[instance, instance2, instance3], backend='arrow')
+    assert str(dfs['onderdeel#AnotherTestClass']['notitie'].dtype) == 'string[pyarrow]'
+
+
+def test_convert_objects_to_dataframe_arrow_backend_with_clearing_values():
+    instance = AllCasesTestClass()
+    instance.assetId.identificator = '01'
+    instance.testDateField = date(2020, 1, 1)
+    instance.testIntegerField = 5
+    instance.testStringFieldMetKard = ['a', 'b']
+    instance2 = AllCasesTestClass()
+    instance2.assetId.identificator = '02'
+    instance2.testDateField = date(2020, 1, 2)
+    instance2.clear_value('testIntegerField')
+    instance2.clear_value('testStringFieldMetKard')
+
+    df = PandasConverter.convert_objects_to_single_dataframe(list_of_objects=[instance, instance2], backend='arrow')
+
+    assert str(df['testDateField'].dtype) == 'date32[day][pyarrow]'
+    assert str(df['testIntegerField'].dtype) == 'int64[pyarrow]'
+    assert df['testIntegerField'].tolist() == [5, 88888888]
+    assert df['testStringFieldMetKard[]'].tolist() == ['a|b', '88888888']
@@ -0,0 +1,158 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AnotherTestClass import AnotherTestClass
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
+from otlmow_converter.FileFormats.ParquetExporter import ParquetExporter
+from otlmow_converter.FileFormats.ParquetImporter import ParquetImporter
+from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
+from otlmow_converter.OtlmowConverter import OtlmowConverter
+
+model_directory_path = Path(__file__).parent.parent / 'TestModel'
+
+
+def return_test_objects() -> list:
+    instance = AllCasesTestClass()
+    instance.assetId.identificator = '0000'
+    instance.testBooleanField = False
+    instance.testDateField = date(2019, 9, 20)
+    instance.testDateTimeField = datetime(2001, 12, 15, 22, 22, 15, 123456)
+    instance.testDecimalFieldMetKard = [10.0, 20.0]
+    instance.testIntegerField = -55
+    instance.testKeuzelijstMetKard = ['waarde-4', 'waarde-3']
+    instance.testKwantWrd.waarde = 98.21
+    instance.testStringFieldMetKard = ['string1', 'string2']
+    instance.testTimeField = time(11, 5, 26)
+    instance.testComplexType.testStringField = 'complex'
+
+    cleared = AllCasesTestClass()
+    cleared.assetId.identificator = '0001'
+    cleared.clear_value('testIntegerField')
+    cleared.clear_value('testStringFieldMetKard')
+
+    another = AnotherTestClass()
+    another.assetId.identificator = '0002'
+    another.notitie = 'note'
+    return [instance, cleared, another]
+
+
+@pytest.mark.parametrize('split_per_type', [False, True])
+def test_export_and_import(tmp_path, split_per_type):
+    objects = return_test_objects()
+    file_path = tmp_path / 'assets.parquet'
+
+    filepaths = OtlmowConverter.from_objects_to_file(file_path=file_path, sequence_of_objects=objects,
+                                                     split_per_type=split_per_type)
+    created = OtlmowConverter.from_file_to_objects(file_path=file_path, model_directory=model_directory_path)
+
+    assert len(filepaths) == (2 if split_per_type else 1)
+    assert sorted(created, key=lambda o: o.assetId.identificator) == objects
+
+
+def test_export_uses_typed_columns(tmp_path):
+    file_path = tmp_path / 'typed.parquet'
+    ParquetExporter.from_objects(sequence_of_objects=return_test_objects(), filepath=file_path)
+
+    schema = pq.read_schema(file_path)
+    assert schema.field('testIntegerField').type == pa.int64()
+    assert schema.field('testDateField').type == pa.date32()
+    assert schema.field('testTimeField').type == pa.time64('us')
+    assert schema.field('testDecimalFieldMetKard[]').type == pa.list_(pa.float64())
+    assert schema.field('testKwantWrd').type == pa.float64()
+
+
+def test_export_split_per_type_is_hive_partitioned(tmp_path):
+    file_path = tmp_path / 'dataset.parquet'
+    ParquetExporter.from_objects(sequence_of_objects=return_test_objects(), filepath=file_path, split_per_type=True)
+
+    table = pq.read_table(file_path / f'typeURI={quote(AnotherTestClass.typeURI, safe="")}')
+    assert table.column_names == ['assetId.identificator', 'notitie']
+
+
+def test_export_split_per_type_removes_partitions_of_earlier_export(tmp_path):
+    file_path = tmp_path / 'dataset.parquet'
+    ParquetExporter.from_objects(sequence_of_objects=return_test_objects(), filepath=file_path, split_per_type=True)
+    another = AnotherTestClass()
+    another.assetId.identificator = '0002'
+
+    filepaths = ParquetExporter.from_objects(sequence_of_objects=[another], filepath=file_path, split_per_type=True)
+    created = OtlmowConverter.from_file_to_objects(file_path=file_path, model_directory=model_directory_path)
+
+    assert [p.name for p in file_path.iterdir()] == [filepaths[0].parent.name]
+    assert [o.assetId.identificator for o in created] == ['0002']
+
+
+def test_import_columns_and_stream(tmp_path):
+    file_path = tmp_path / 'projected.parquet'
+    objects = return_test_objects() * 5
+    ParquetExporter.from_objects(sequence_of_objects=objects, filepath=file_path, row_group_size=4)
+
+    created = ParquetImporter.to_objects(filepath=file_path, model_directory=model_directory_path, stream=True,
+                                         columns=['assetId.identificator', 'testIntegerField'], batch_size=2)
+
+    assert not isinstance(created, list)
+    created = list(created)
+    assert [o.assetId.identificator for o in created] == [o.assetId.identificator for o in objects]
+    assert created[0].testIntegerField == -55
+    assert created[0].testDateField is None
+
+
+def test_import_reads_a_row_group_at_a_time(tmp_path, monkeypatch):
+    file_path = tmp_path / 'row_groups.parquet'
+    objects = return_test_objects() * 5
+    ParquetExporter.from_objects(sequence_of_objects=objects, filepath=file_path, row_group_size=4)
+    iter_table_to_objects = PyArrowConverter.iter_table_to_objects
+    table_sizes = []
+
+    def count_rows(table, **kwargs):
+        table_sizes.append(table.num_rows)
+        return iter_table_to_objects(table=table, **kwargs)
+
+    monkeypatch.setattr(PyArrowConverter, 'iter_table_to_objects', count_rows)
+    created = ParquetImporter.to_objects(filepath=file_path, model_directory=model_directory_path)
+
+    assert len(table_sizes) == pq.ParquetFile(file_path).num_row_groups == 4
+    assert table_sizes == [4, 4, 4, 3]
+    assert len(created) == len(objects)
+
+
+def test_import_raises_bad_lines(tmp_path):
+    file_path = tmp_path / 'bad.parquet'
+    pq.write_table(pa.table({'typeURI': [AllCasesTestClass.typeURI, 'https://invalid/uri#Class'],
+                             'assetId.identificator': ['1', '2']}), file_path)
+
+    with pytest.raises(BadLinesInExcelError) as exc_info:
+        ParquetImporter.to_objects(filepath=file_path, model_directory=model_directory_path)
+    assert [o.assetId.identificator for o in exc_info.value.objects] == ['1']
+    assert exc_info.value.exceptions[0].line_number == 3
+
+
+@pytest.mark.asyncio
+async def test_export_and_import_async(tmp_path):
+    objects = return_test_objects()
+    file_path = tmp_path / 'async.parquet'
+    await ParquetExporter.from_objects_async(sequence_of_objects=objects, filepath=file_path)
+    created = await ParquetImporter.to_objects_async(filepath=file_path, model_directory=model_directory_path)
+    assert created == objects
+
+
+@pytest.mark.asyncio
+async def test_export_async_writes_the_file_in_the_executor(tmp_path):
+    file_path = tmp_path / 'async.parquet'
+    writing_threads = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor_thread = executor.submit(threading.get_ident).result()
+        with patch.object(ParquetExporter, '_remove_partitions',
+                          side_effect=lambda _: writing_threads.append(threading.get_ident())):
+            await ParquetExporter.from_objects_async(sequence_of_objects=return_test_objects(), filepath=file_path,
+                                                     split_per_type=True, executor=executor)
+    assert writing_threads == [executor_thread]
@@ -0,0 +1,88 @@
+from datetime import date
+
+import pyarrow as pa
+import pytest
+
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AnotherTestClass import AnotherTestClass
+from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.FileFormats.ArrowTableBuilder import ArrowTableBuilder
+from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
+
+
+def create_objects() -> list:
+    instance = AllCasesTestClass()
+    instance.assetId.identificator = '0'
+    instance_2 = AnotherTestClass()
+    instance_2.assetId.identificator = '1'
+    instance_2.notitie = 'note'
+    instance_3 = AllCasesTestClass()
+    instance_3.assetId.identificator = '2'
+    instance_3.testIntegerFieldMetKard = [1, 2]
+    instance_3.testDateField = date(2020, 1, 1)
+    return [instance, instance_2, instance_3]
+
+
+def test_builder_fills_columns_that_appear_later():
+    builder = ArrowTableBuilder()
+    for otl_object in create_objects():
+        builder.add(otl_object)
+    batch = builder.flush()
+
+    assert builder.num_rows == 0
+    assert builder.flush() is None
+    assert batch.schema.names == ['assetId.identificator', 'notitie', 'testDateField', 'testIntegerFieldMetKard[]',
+                                  'typeURI']
+    assert batch.schema.field('testIntegerFieldMetKard[]').type == pa.list_(pa.int64())
+    assert batch.column('notitie').to_pylist() == [None, 'note', None]
+    assert batch.column('testDateField').to_pylist() == [None, None, date(2020, 1, 1)]
+    assert batch.to_pylist() == [{key: d.get(key) for key in batch.schema.names}
+                                 for d in map(DotnotationDictConverter.to_dict, create_objects())]
+
+
+def test_iter_batches_is_lazy():
+    consumed = []
+
+    def generate():
+        for otl_object in create_objects() * 2:
+            consumed.append(otl_object)
+            yield otl_object
+
+    batches = ArrowTableBuilder.iter_batches(generate(), batch_size=4)
+    assert next(batches).num_rows == 4
+    assert len(consumed) == 4
+    assert next(batches).num_rows == 2
+
+
+def test_concat_batches_with_different_columns_and_types():
+    cleared = AllCasesTestClass()
+    cleared.assetId.identificator = '3'
+    cleared.clear_value('testDateField')
+    batches = list(ArrowTableBuilder.iter_batches(create_objects() + [cleared], batch_size=3))
+
+    table = ArrowTableBuilder.concat_batches(batches)
+
+    assert [batch.schema.field('testDateField').type for batch in batches] == [pa.date32(), pa.string()]
+    assert table.schema.field('testDateField').type == pa.string()
+    assert table.column('testDateField').to_pylist() == [None, None, '2020-01-01', '88888888']
+    assert table.column('notitie').to_pylist() == [None, 'note', None, None]
+    assert table == PyArrowConverter.convert_objects_to_single_table(create_objects() + [cleared], batch_size=3)
+
+
+def test_add_leaves_no_values_of_an_object_that_raises(monkeypatch):
+    builder = ArrowTableBuilder()
+    objects = create_objects()
+    builder.add(objects[0])
+    iter_items = DotnotationDictConverter.iter_items
+
+    def raise_halfway(otl_object, **kwargs):
+        yield from list(iter_items(otl_object, **kwargs))[:2]
+        raise ValueError('halfway')
+
+    monkeypatch.setattr(DotnotationDictConverter, 'iter_items', raise_halfway)
+    with pytest.raises(ValueError):
+        builder.add(objects[2])
+    monkeypatch.undo()
+    builder.add(objects[1])
+
+    assert builder.flush().to_pylist() == ArrowTableBuilder.build_table(objects[:2]).to_pylist()
@@ -1,10 +1,20 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, time
 from pathlib import Path
 
+import pyarrow as pa
+import pytest
+
 from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
 from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AnotherTestClass import AnotherTestClass
 
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
+from otlmow_converter.Exceptions.MultipleAttributeError import MultipleAttributeError
+from otlmow_converter.FileFormats.ArrowTableBuilder import ArrowTableBuilder
+from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
 from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
+from otlmow_converter.ObjectPayloadConverter import ObjectPayloadConverter
 
 model_directory_path = Path(__file__).parent.parent / 'TestModel'
 
@@ -232,3 +242,131 @@ def test_convert_table_to_objects_from_pyarrow_table_nested_2_levels():
     assert obj.testComplexTypeMetKard[1].testComplexType2.testKwantWrd.waarde == 20.0
     assert obj.testComplexTypeMetKard[0].testComplexType2.testStringField == 'string1'
     assert obj.testComplexTypeMetKard[1].testComplexType2.testStringField == 'string2'
+
+
+def test_convert_table_to_objects_same_result_as_row_dicts():
+    instance_1 = AllCasesTestClass()
+    instance_1.assetId.identificator = '0'
+    instance_1.testIntegerFieldMetKard = [1, 2]
+    instance_1.testComplexType.testKwantWrd.waarde = 1.5
+    instance_1.testKeuzelijst = 'waarde-2'
+    instance_2 = AnotherTestClass()
+    instance_2.assetId.identificator = '1'
+    instance_2.toestand = 'in-gebruik'
+    pa_table = PyArrowConverter.convert_objects_to_single_table(list_of_objects=[instance_1, instance_2])
+
+    objects = PyArrowConverter.convert_table_to_objects(pa_table, model_directory=model_directory_path)
+    row_dicts = list(PyArrowConverter._iter_table_as_dicts(pa_table))
+    expected = DotnotationTableConverter.get_data_from_table(row_dicts, model_directory=model_directory_path)
+
+    assert objects == expected
+
+
+def test_convert_table_to_objects_line_errors():
+    pa_table = pa.table({'typeURI': [AllCasesTestClass.typeURI, None, AllCasesTestClass.typeURI],
+                         'testKeuzelijst': ['waarde-2', 'waarde-2', 'no option']})
+
+    with pytest.raises(BadLinesInExcelError) as exc_info:
+        PyArrowConverter.convert_table_to_objects(pa_table, model_directory=model_directory_path,
+                                                  combine_errors=True)
+    assert [e.line_number for e in exc_info.value.exceptions] == [3, 4]
+    assert isinstance(exc_info.value.exceptions[1].error, MultipleAttributeError)
+    assert [o.testKeuzelijst for o in exc_info.value.objects] == ['waarde-2']
+
+    line_errors = []
+    objects = list(PyArrowConverter.iter_table_to_objects(
+        pa_table, model_directory=model_directory_path, on_line_error=line_errors.append, combine_errors=True))
+    assert len(objects) == 1
+    assert len(line_errors) == 2
+
+
+def test_convert_table_to_objects_with_workers(monkeypatch):
+    # more workers than CPUs are not started, so the processes are also used on a machine with one CPU
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    objects = []
+    for i in range(6):
+        instance = AllCasesTestClass()
+        instance.assetId.identificator = str(i)
+        instance.testIntegerFieldMetKard = [i, i + 1]
+        instance.testComplexTypeMetKard[0].testKwantWrd.waarde = float(i)
+        instance.testComplexType.testComplexType2.testStringField = f'string {i}'
+        instance.testDateField = date(2022, 2, i + 1)
+        objects.append(instance)
+    pa_table = PyArrowConverter.convert_objects_to_single_table(list_of_objects=objects)
+    pa_table = pa_table.append_column('testKeuzelijst', pa.array(['waarde-2', 'no option', None, None, 'waarde-1',
+                                                                  None]))
+
+    serial = PyArrowConverter.convert_table_to_objects(pa_table, model_directory=model_directory_path,
+                                                       combine_errors=True, on_line_error=lambda e: None)
+    line_errors = []
+    parallel = list(PyArrowConverter.iter_table_to_objects(
+        pa_table, model_directory=model_directory_path, combine_errors=True, on_line_error=line_errors.append,
+        workers=2, worker_batch_size=2))
+
+    assert parallel == serial
+    assert [o.assetId.identificator for o in parallel] == ['0', '2', '3', '4', '5']
+    assert [e.line_number for e in line_errors] == [3]
+    assert isinstance(line_errors[0].error, MultipleAttributeError)
+
+
+def test_get_process_count_is_at_most_the_number_of_cpus(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+    assert ObjectPayloadConverter.get_process_count(None) == 1
+    assert ObjectPayloadConverter.get_process_count(2) == 2
+    assert ObjectPayloadConverter.get_process_count(8) == 4
+    monkeypatch.setattr(os, 'cpu_count', lambda: None)
+    assert ObjectPayloadConverter.get_process_count(8) == 1
+
+
+def test_map_in_processes_submits_a_bounded_number_of_calls():
+    taken = []
+
+    def generate_args():
+        for i in range(10):
+            taken.append(i)
+            yield (i,)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = ObjectPayloadConverter.map_in_processes(executor, lambda i: i * 2, generate_args(), max_pending=3)
+        assert next(results) == 0
+        assert len(taken) == 3
+        assert list(results) == [i * 2 for i in range(1, 10)]
+
+def test_pyarrow_table_from_objects_schema_from_model():
+    instance = AllCasesTestClass()
+    instance.assetId.identificator = '0000'
+    instance.testIntegerFieldMetKard = [1, 2]
+    instance_2 = AllCasesTestClass()
+    instance_2.assetId.identificator = '0001'
+    instance_2.testDecimalField = 2.0
+    instance_2.clear_value('testDateField')
+
+    pa_table = PyArrowConverter.convert_objects_to_single_table(list_of_objects=[instance, instance_2])
+
+    assert pa_table.schema.field('testIntegerFieldMetKard[]').type == pa.list_(pa.int64())
+    assert pa_table.schema.field('testDecimalField').type == pa.float64()
+    assert pa_table['testDecimalField'].to_pylist() == [None, 2.0]
+    # a clearing value does not fit in a date column
+    assert pa_table['testDateField'].to_pylist() == [None, '88888888']
+    assert ArrowTableBuilder.get_arrow_type(AllCasesTestClass, 'testKwantWrd') == pa.float64()
+    assert ArrowTableBuilder.get_arrow_type(AllCasesTestClass, 'testDateField', cast_datetime=True) == pa.string()
+    assert ArrowTableBuilder.get_arrow_type(AllCasesTestClass, 'testStringFieldMetKard[]', cast_list=True) == pa.string()
+    assert ArrowTableBuilder.get_arrow_type(AllCasesTestClass, 'notAnAttribute') is None
+
+
+def test_pyarrow_table_from_objects_column_with_type_per_class():
+    instance = AllCasesTestClass()
+    instance.assetId.identificator = '0000'
+    instance.testDecimalField = 1.5
+    instance_2 = AnotherTestClass()
+    instance_2.assetId.identificator = '0001'
+    instance_2.testDecimalField = 'text'
+    instance_3 = AllCasesTestClass()
+    instance_3.assetId.identificator = '0002'
+
+    pa_table = PyArrowConverter.convert_objects_to_single_table(list_of_objects=[instance, instance_2, instance_3],
+                                                                warn_for_non_otl_conform_attributes=False)
+
+    assert pa_table['assetId.identificator'].to_pylist() == ['0000', '0001', '0002']
+    assert pa_table.schema.field('testDecimalField').type == pa.string()
+    assert pa_table['testDecimalField'].to_pylist() == ['1.5', 'text', None]
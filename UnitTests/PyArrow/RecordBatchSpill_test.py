@@ -0,0 +1,37 @@
+import pyarrow as pa
+
+from UnitTests.PyArrow.ArrowTableBuilder_test import create_objects
+from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from otlmow_converter.FileFormats.ArrowTableBuilder import ArrowTableBuilder
+from otlmow_converter.FileFormats.RecordBatchSpill import RecordBatchSpill
+
+
+def test_spill_writes_batches_in_the_schema_of_concat_batches(tmp_path):
+    cleared = AllCasesTestClass()
+    cleared.assetId.identificator = '3'
+    cleared.clear_value('testDateField')
+    batches = list(ArrowTableBuilder.iter_batches(create_objects() + [cleared], batch_size=3))
+    file_path = tmp_path / 'spilled.arrow'
+
+    with RecordBatchSpill() as spill:
+        for batch in batches:
+            spill.add(batch)
+        spill.write(lambda schema: pa.ipc.new_file(str(file_path), schema))
+        spill_directory = spill._get_batch_path(0).parent
+
+    table = pa.ipc.open_file(str(file_path)).read_all()
+    assert table.column('testDateField').type == pa.string()
+    assert table == ArrowTableBuilder.concat_batches(batches)
+    assert not spill_directory.exists()
+
+
+def test_spill_iter_batches_in_given_schema():
+    with RecordBatchSpill() as spill:
+        spill.add(next(ArrowTableBuilder.iter_batches(create_objects())))
+        schema = pa.schema([('assetId.identificator', pa.string()), ('missing', pa.int64())])
+
+        batches = list(spill.iter_batches(schema))
+
+    assert spill.num_rows == 3
+    assert batches[0].schema == schema
+    assert batches[0].to_pylist() == [{'assetId.identificator': str(i), 'missing': None} for i in range(3)]
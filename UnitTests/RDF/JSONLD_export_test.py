@@ -4,9 +4,59 @@ from datetime import date, datetime, time
 from pathlib import Path
 
 from UnitTests.TestModel.OtlmowModel.Classes.Onderdeel.AllCasesTestClass import AllCasesTestClass
+from otlmow_converter.FileFormats.JsonLdContext import JsonLdContext
 from otlmow_converter.FileFormats.JsonLdExporter import JsonLdExporter
 
 
+def test_compact_dict_collects_used_prefixes():
+    used_prefixes = set()
+    input_dict = {
+        '@id': 'https://data.awvvlaanderen.be/id/asset/0000',
+        'https://wegenenverkeer.data.vlaanderen.be/ns/onderdeel#Test.lijst': [
+            'https://wegenenverkeer.data.vlaanderen.be/id/concept/KlTest/waarde-1', 'geen uri', 1],
+        'https://wegenenverkeer.data.vlaanderen.be/ns/implementatieelement#AIMObject.assetId': {
+            'https://example.com/ns#identificator': 'https://example.com/ns#waarde'},
+        'https://wegenenverkeer.data.vlaanderen.be/ns/abstracten#Test.notitie':
+            'zie https://data.awvvlaanderen.be/id/assetrelatie/0001'}
+    compacted = JsonLdContext.compact_dict(input_dict, used_prefixes)
+
+    assert compacted == {
+        '@id': 'asset:0000',
+        'onderdeel:Test.lijst': ['kl:KlTest/waarde-1', 'geen uri', 1],
+        'imel:AIMObject.assetId': {'https://example.com/ns#identificator': 'https://example.com/ns#waarde'},
+        'abs:Test.notitie': 'zie assetrelatie:0001'}
+    assert used_prefixes == {'asset', 'onderdeel', 'kl', 'imel', 'abs', 'assetrelatie'}
+
+    # the same text as replacing the namespaces in the encoded dict
+    encoded = json.dumps(input_dict, indent=4)
+    for short, long in JsonLdContext.context_dict.items():
+        encoded = encoded.replace(long, f'{short}:')
+    assert json.dumps(compacted, indent=4) == encoded
+
+
+def test_compact_text_gives_the_same_text_as_replacing_every_namespace():
+    texts = [
+        'geen uri', '', 'https://data.awvvlaanderen.be/id/asset/0000', 'https://data.awvvlaanderen.be/id/asset/',
+        'https://data.awvvlaanderen.be/id/assetrelatie/0000-1/x#y',
+        'https://wegenenverkeer.data.vlaanderen.be/id/concept/KlTest/waarde-1',
+        'https://wegenenverkeer.data.vlaanderen.be/ns/onderdeel#AllCasesTestClass.testKwantWrd',
+        'https://wegenenverkeer.data.vlaanderen.be/ns/other#Test', 'https://example.com/ns#waarde',
+        'http://data.awvvlaanderen.be/id/asset/0000', 'zie https://data.awvvlaanderen.be/id/asset/0001',
+        'https://data.awvvlaanderen.be/id/asset/0000?van=https://data.awvvlaanderen.be/id/asset/0001',
+        'https://data.awvvlaanderen.be/id/asset/0000 en https://loc.data.wegenenverkeer.be/ns/implementatieelement#x']
+    for text in texts:
+        used_prefixes = set()
+        expected_prefixes = set()
+        expected = text
+        for short, long in JsonLdContext.context_dict.items():
+            if long in expected:
+                expected_prefixes.add(short)
+                expected = expected.replace(long, f'{short}:')
+
+        assert JsonLdContext.compact_text(text, used_prefixes) == expected
+        assert used_prefixes == expected_prefixes
+
+
 def test_export_unnested_attributes(recwarn):
     file_location = Path(__file__).parent / 'Testfiles' / 'export_unnested_attributes_generated.jsonld'
 
@@ -7,12 +7,17 @@ from collections import namedtuple
 from pathlib import Path
 from statistics import mean, stdev
 
+import openpyxl
+import pyarrow as pa
 from prettytable import PrettyTable
 
 # allow relative import of otlmow_converter
 base_dir = os.path.dirname(os.path.realpath(__file__))
 sys.path.append(str(Path(base_dir) / '../'))
 from otlmow_converter.OtlmowConverter import OtlmowConverter
+from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
+from otlmow_converter.FileFormats.ExcelImporter import ExcelImporter
+from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
 
 REPEAT_TIMES = 5
 logging.getLogger().setLevel(logging.ERROR)
@@ -93,6 +98,70 @@ def group_by_type_uri(data):
         grouped[obj.typeURI].append(obj)
     return grouped
 
+def benchmark_table_to_objects(data, repeat_times, rows_per_type=100):
+    """Compares building objects from Arrow tables (one per type) through row dicts with the column builder"""
+    tables = [pa.concat_tables([t] * rows_per_type)
+              for t in PyArrowConverter.convert_objects_to_multiple_tables(data).values()]
+
+    def row_dicts_path():
+        for t in tables:
+            DotnotationTableConverter.get_data_from_table(list(PyArrowConverter._iter_table_as_dicts(t)))
+
+    def column_builder_path():
+        for t in tables:
+            PyArrowConverter.convert_table_to_objects(t)
+
+    results = []
+    for label, path in (('row dicts', row_dicts_path), ('column builder', column_builder_path)):
+        times = []
+        for _ in range(repeat_times):
+            start = timeit.default_timer()
+            path()
+            times.append(timeit.default_timer() - start)
+        results.append((label, _format_mean_stdev(times)))
+    return results
+
+
+def create_big_xlsx_file(source_path: Path, target_path: Path, rows_per_sheet: int):
+    """Writes a copy of an xlsx file where the data rows of each sheet are repeated up to rows_per_sheet rows"""
+    source = ExcelImporter.get_data_dict_from_file_path(source_path)
+    book = openpyxl.Workbook(write_only=True)
+    for sheet_name, rows in source.items():
+        sheet = book.create_sheet(sheet_name)
+        header, *data_rows = rows
+        sheet.append(header)
+        for i in range(rows_per_sheet if data_rows else 0):
+            sheet.append(data_rows[i % len(data_rows)])
+    book.save(target_path)
+
+
+def benchmark_xlsx_readers(file_path: Path, repeat_times):
+    """Compares reading the rows of an xlsx file with openpyxl in full mode, in read-only mode and with lxml"""
+    def full_mode():
+        book = openpyxl.load_workbook(file_path, data_only=True)
+        for sheet in book.worksheets:
+            for _ in ExcelImporter.normalize_rows(tuple(cell.value for cell in row) for row in sheet.rows):
+                pass
+        book.close()
+
+    def read_only_mode():
+        ExcelImporter.get_data_dict_from_file_path(file_path)
+
+    def lxml_reader():
+        ExcelImporter.get_data_dict_from_file_path(file_path, use_lxml=True)
+
+    results = []
+    for label, path in (('openpyxl full mode', full_mode), ('openpyxl read-only', read_only_mode),
+                        ('lxml (use_lxml=True)', lxml_reader)):
+        times = []
+        for _ in range(repeat_times):
+            start = timeit.default_timer()
+            path()
+            times.append(timeit.default_timer() - start)
+        results.append((label, _format_mean_stdev(times)))
+    return results
+
+
 # Write to file in the new format using PrettyTable
 def build_multiline_header(table):
     table_str = str(table)
@@ -166,6 +235,9 @@ if __name__ == '__main__':
         FormatDetails(Extension='xlsx', Label='Excel', WriteArguments={}),
         FormatDetails(Extension='jsonld', Label='JSON-LD', WriteArguments={}),
         FormatDetails(Extension='geojson', Label='GeoJSON', WriteArguments={}),
+        FormatDetails(Extension='parquet', Label='Parquet', WriteArguments={'split_per_type': False}),
+        FormatDetails(Extension='parquet', Label='Parquet', WriteArguments={'split_per_type': True}),
+        FormatDetails(Extension='arrow', Label='Arrow', WriteArguments={}),
         # FormatDetails(Extension='ttl', Label='TTL', WriteArguments={'no_read': True})
     ]
 
@@ -251,4 +323,20 @@ if __name__ == '__main__':
             if i % 3 == 0 and i != 0 and i+2 < len(data_lines):
                 file.write(divider + "\n")
 
+        table_to_objects = PrettyTable()
+        table_to_objects.field_names = ['Arrow table to objects', 'Time all classes, 100 rows per type (s)']
+        all_classes_data = OtlmowConverter.from_file_to_objects(Path(base_dir) / 'files/all_classes.json',
+                                                                ignore_failed_objects=True)
+        for label, result in benchmark_table_to_objects(all_classes_data, REPEAT_TIMES):
+            table_to_objects.add_row([label, result])
+        file.write("\n" + str(table_to_objects) + "\n")
+
+        big_xlsx_path = Path(base_dir) / 'temp/ten_random_classes_big.xlsx'
+        create_big_xlsx_file(Path(base_dir) / 'files/ten_random_classes.xlsx', big_xlsx_path, rows_per_sheet=2000)
+        xlsx_readers = PrettyTable()
+        xlsx_readers.field_names = ['Excel reader', 'Read rows 10 random classes, 5000 rows per sheet (s)']
+        for label, result in benchmark_xlsx_readers(big_xlsx_path, REPEAT_TIMES):
+            xlsx_readers.add_row([label, result])
+        file.write("\n" + str(xlsx_readers) + "\n")
+
     shutil.rmtree(Path(base_dir) / 'temp')
\ No newline at end of file
@@ -0,0 +1,212 @@
+import asyncio
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import AsyncGenerator, AsyncIterable, Callable, Generator, Iterable, Optional, Union
+
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
+
+from otlmow_converter.ObjectPayloadConverter import ObjectPayloadConverter
+from otlmow_converter.SettingsManager import load_settings, GlobalVariables
+
+load_settings()
+
+async_settings = GlobalVariables.settings['async']
+OFFLOAD = async_settings['offload']
+BATCH_SIZE = async_settings['batch_size']
+QUEUE_SIZE = async_settings['queue_size']
+
+END = object()
+
+
+class AsyncRunner:
+    """Runs the blocking work of the async API in an executor, so the event loop keeps serving while a file is read,
+    converted or written. The sync code is used as is, so the async conversions give the same result as the sync ones
+    and are not slower.
+    The executor is the default (thread) executor of the loop, unless one is given. A ProcessPoolExecutor also works:
+    the objects are then sent between the processes as payloads (see ObjectPayloadConverter).
+    Code that stays on the event loop gives control back to it once per batch of rows, see iterate.
+    Async sources are read on the loop and handed over to the executor in batches through a queue of at most
+    queue_size batches, see consume and map_batches. Reading the source waits while that queue is full, so a large
+    source is never in memory as a whole."""
+
+    @classmethod
+    def pop_options(cls, kwargs: dict) -> tuple[Optional[Executor], bool, int, int]:
+        """Removes the async options from the keyword arguments and returns executor, offload, batch size and queue
+        size."""
+        return (kwargs.pop('executor', None), kwargs.pop('offload', OFFLOAD),
+                kwargs.pop('async_batch_size', BATCH_SIZE), kwargs.pop('async_queue_size', QUEUE_SIZE))
+
+    @classmethod
+    async def run(cls, func: Callable, *args, executor: Optional[Executor] = None, **kwargs):
+        """Runs func(*args, **kwargs) in the executor and returns its result."""
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args, **kwargs))
+
+    @classmethod
+    async def iterate(cls, iterable: Union[Iterable, AsyncIterable], batch_size: int = BATCH_SIZE) -> AsyncGenerator:
+        """Yields the items of a sync or async iterable and gives control to the event loop after every batch_size
+        items."""
+        if isinstance(iterable, AsyncIterable):
+            index = 0
+            async for item in iterable:
+                yield item
+                index += 1
+                if index % batch_size == 0:
+                    await asyncio.sleep(0)
+            return
+        for index, item in enumerate(iterable, start=1):
+            yield item
+            if index % batch_size == 0:
+                await asyncio.sleep(0)
+
+    @classmethod
+    async def consume(cls, func: Callable[[Iterable], object], iterable: Union[Iterable, AsyncIterable],
+                      executor: Optional[Executor] = None, batch_size: int = BATCH_SIZE,
+                      queue_size: int = QUEUE_SIZE):
+        """Runs func in the executor with a sync iterable of the items of the (async) iterable and returns its result.
+        The executor has to run func in a thread of this process, as func reads the queue of the loop."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=queue_size)
+        producer = asyncio.ensure_future(cls._fill_queue(iterable, queue, batch_size))
+        try:
+            return await loop.run_in_executor(executor, func, cls._iter_queue(queue, loop))
+        except asyncio.CancelledError:
+            # the thread can not be cancelled, it stops when it gets the next batch
+            producer.cancel()
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(asyncio.CancelledError())
+            raise
+        finally:
+            producer.cancel()
+
+    @classmethod
+    async def map_batches(cls, func: Callable[[list], Iterable], iterable: Union[Iterable, AsyncIterable],
+                          executor: Optional[Executor] = None, offload: bool = OFFLOAD,
+                          batch_size: int = BATCH_SIZE, queue_size: int = QUEUE_SIZE) -> AsyncGenerator:
+        """Yields the items of func(batch) for every batch of batch_size items of the (async) iterable.
+        func runs in the executor (on the loop if offload is False), while a task keeps reading the source, at most
+        queue_size batches ahead. The results of func are sent back as is, so a ProcessPoolExecutor is not used here:
+        the default executor of the loop is used instead."""
+        if isinstance(executor, ProcessPoolExecutor):
+            executor = None
+        queue = asyncio.Queue(maxsize=queue_size)
+        producer = asyncio.ensure_future(cls._fill_queue(iterable, queue, batch_size))
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is END:
+                    return
+                if isinstance(batch, BaseException):
+                    raise batch
+                if offload:
+                    items = await cls.run(cls._list_of, func, batch, executor=executor)
+                else:
+                    items = cls._list_of(func, batch)
+                for item in items:
+                    yield item
+        finally:
+            producer.cancel()
+
+    @classmethod
+    async def to_objects(cls, importer, filepath: Path, model_directory: Optional[Path] = None,
+                         executor: Optional[Executor] = None, batch_size: int = BATCH_SIZE, **kwargs) -> list:
+        """Reads a file with the sync to_objects of the importer in the executor."""
+        if not isinstance(executor, ProcessPoolExecutor):
+            return await cls.run(cls._import_objects, importer, filepath, model_directory, kwargs, executor=executor)
+
+        try:
+            payloads, caught_warnings = await cls.run(cls._import_payloads, importer, filepath, model_directory,
+                                                      kwargs, executor=executor)
+        except Exception:
+            # the errors of the importers hold the objects that were created, those can not be sent back by the
+            # worker, so the file is read again in a thread to raise the original error
+            return await cls.run(cls._import_objects, importer, filepath, model_directory, kwargs)
+
+        for category, message in caught_warnings:
+            warnings.warn(message, category=category, stacklevel=2)
+        types_by_uri = {}
+        return [ObjectPayloadConverter.from_payload(payload, model_directory=model_directory,
+                                                    types_by_uri=types_by_uri)
+                async for payload in cls.iterate(payloads, batch_size)]
+
+    @classmethod
+    async def from_objects(cls, exporter, sequence_of_objects: Iterable[OTLObject], filepath: Path,
+                           executor: Optional[Executor] = None, batch_size: int = BATCH_SIZE,
+                           **kwargs) -> tuple[Path]:
+        """Writes a file with the sync from_objects of the exporter in the executor."""
+        if not isinstance(executor, ProcessPoolExecutor):
+            return await cls.run(exporter.from_objects, sequence_of_objects=sequence_of_objects, filepath=filepath,
+                                 executor=executor, **kwargs)
+
+        payloads = []
+        types_by_uri = {}
+        async for otl_object in cls.iterate(sequence_of_objects, batch_size):
+            payloads.append(ObjectPayloadConverter.to_payload(otl_object))
+            types_by_uri[otl_object.typeURI] = type(otl_object)
+        filepaths, caught_warnings = await cls.run(cls._export_payloads, exporter, payloads, types_by_uri, filepath,
+                                                   kwargs, executor=executor)
+        for category, message in caught_warnings:
+            warnings.warn(message, category=category, stacklevel=2)
+        return filepaths
+
+    @classmethod
+    async def _fill_queue(cls, iterable: Union[Iterable, AsyncIterable], queue: asyncio.Queue,
+                          batch_size: int) -> None:
+        """Puts the items of the iterable in the queue in lists of batch_size items, followed by END.
+        An error of the iterable is put in the queue instead, so the reader of the queue raises it."""
+        try:
+            batch = []
+            async for item in cls.iterate(iterable, batch_size):
+                batch.append(item)
+                if len(batch) == batch_size:
+                    await queue.put(batch)
+                    batch = []
+            if batch:
+                await queue.put(batch)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(END)
+
+    @classmethod
+    def _iter_queue(cls, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop) -> Generator:
+        """Yields the items of the batches in the queue. Runs in a thread other than the one of the loop."""
+        while True:
+            batch = asyncio.run_coroutine_threadsafe(queue.get(), loop).result()
+            if batch is END:
+                return
+            if isinstance(batch, BaseException):
+                raise batch
+            yield from batch
+
+    @classmethod
+    def _list_of(cls, func: Callable[[list], Iterable], batch: list) -> list:
+        items = func(batch)
+        return items if isinstance(items, list) else list(items)
+
+    @classmethod
+    def _import_objects(cls, importer, filepath: Path, model_directory: Optional[Path], kwargs: dict) -> list:
+        objects = importer.to_objects(filepath=filepath, model_directory=model_directory, **kwargs)
+        return objects if isinstance(objects, list) else list(objects)
+
+    @classmethod
+    def _import_payloads(cls, importer, filepath: Path, model_directory: Optional[Path],
+                         kwargs: dict) -> tuple[list, list]:
+        """Runs in a worker process. Returns the payloads of the objects and the warnings."""
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            payloads = [ObjectPayloadConverter.to_payload(otl_object)
+                        for otl_object in cls._import_objects(importer, filepath, model_directory, kwargs)]
+        return payloads, [(w.category, str(w.message)) for w in caught_warnings]
+
+    @classmethod
+    def _export_payloads(cls, exporter, payloads: list, types_by_uri: dict, filepath: Path,
+                         kwargs: dict) -> tuple[tuple[Path], list]:
+        """Runs in a worker process. Returns the written file paths and the warnings."""
+        objects = [ObjectPayloadConverter.from_payload(payload, types_by_uri=types_by_uri) for payload in payloads]
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            filepaths = exporter.from_objects(sequence_of_objects=objects, filepath=filepath, **kwargs)
+        return filepaths, [(w.category, str(w.message)) for w in caught_warnings]
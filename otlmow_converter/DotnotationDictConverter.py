@@ -2,13 +2,11 @@ from __future__ import annotations
 
 import inspect
 import warnings
-from asyncio import sleep
 from datetime import time, datetime, date
 from pathlib import Path
 from typing import Generator
 
-from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject, OTLAttribuut, dynamic_create_instance_from_uri, \
-    get_attribute_by_name
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject, OTLAttribuut, get_attribute_by_name
 from otlmow_model.OtlmowModel.Exceptions.CouldNotConvertToCorrectTypeError import CouldNotConvertToCorrectTypeError
 from otlmow_model.OtlmowModel.Exceptions.NonStandardAttributeWarning import NonStandardAttributeWarning
 from otlmow_model.OtlmowModel.Exceptions.RemovedOptionError import RemovedOptionError
@@ -16,11 +14,14 @@ from otlmow_model.OtlmowModel.Exceptions.UnionTypeError import UnionTypeError
 from otlmow_model.OtlmowModel.Exceptions.WrongGeometryTypeError import WrongGeometryTypeError
 
 from otlmow_converter.DotnotationDict import DotnotationDict
+from otlmow_converter.DotnotationExportPlan import EXPORT_PLAN_CACHE, NON_CONFORM_SLOT, DotnotationExportPlan
 from otlmow_converter.DotnotationHelper import DotnotationHelper
+from otlmow_converter.DotnotationSetterPlan import SETTER_PLAN_CACHE
 from otlmow_converter.Exceptions.DotnotationListOfListError import DotnotationListOfListError
 from otlmow_converter.Exceptions.MissingHeaderError import MissingHeaderError
 from otlmow_converter.Exceptions.MultipleAttributeError import MultipleAttributeError
 from otlmow_converter.Exceptions.OTLAttributeError import OTLAttributeError
+from otlmow_converter.ModelIndex import ModelIndex
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 
 load_settings()
@@ -30,6 +31,17 @@ CARDINALITY_SEPARATOR = GlobalVariables.settings['formats']['OTLMOW']['dotnotati
 CARDINALITY_INDICATOR = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['cardinality_indicator']
 WAARDE_SHORTCUT = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['waarde_shortcut']
 
+# errors on a single attribute that are collected in a MultipleAttributeError when combine_errors is used
+# (compared by name, as the model classes may come from a different model directory)
+COMBINABLE_ERROR_NAMES = {
+    'ValueError',
+    'CouldNotConvertToCorrectTypeError',
+    'UnionTypeError',
+    'InvalidOptionError',
+    'RemovedOptionError',
+    'WrongGeometryTypeError',
+}
+
 
 class DotnotationDictConverter:
     def __init__(self, separator: str = SEPARATOR, cardinality_separator: str = CARDINALITY_SEPARATOR,
@@ -107,18 +119,40 @@ class DotnotationDictConverter:
             if native_type_dict:
                 ddict['_native_type_dict'] = native_type_dict
         else:
-            for dot_key, value in cls._iterate_over_attributes_and_values_by_dotnotation(
-                object_or_attribute=otl_object, waarde_shortcut=waarde_shortcut, separator=separator,
-                cardinality_indicator=cardinality_indicator, cardinality_separator=cardinality_separator,
+            ddict.update(cls._iterate_with_plan(
+                plan=EXPORT_PLAN_CACHE.get_plan(otl_object, separator=separator,
+                                                cardinality_indicator=cardinality_indicator,
+                                                waarde_shortcut=waarde_shortcut),
+                object_or_attribute=otl_object, cardinality_separator=cardinality_separator,
                 allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
                 warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
-                cast_list=cast_list, cast_datetime=cast_datetime):
-                ddict[dot_key] = value
+                cast_list=cast_list, cast_datetime=cast_datetime))
 
         ddict['typeURI'] = type_uri
 
         return DotnotationDict(ddict)
 
+    @classmethod
+    def iter_items(cls, otl_object: OTLObject, waarde_shortcut: bool = WAARDE_SHORTCUT, separator: str = SEPARATOR,
+                   cardinality_indicator: str = CARDINALITY_INDICATOR,
+                   cardinality_separator: str = CARDINALITY_SEPARATOR, cast_datetime: bool = False,
+                   allow_non_otl_conform_attributes: bool = True, warn_for_non_otl_conform_attributes: bool = True,
+                   cast_list: bool = False) -> Generator[tuple[str, object], None, None]:
+        """Yields the (dotnotation, value) pairs of to_dict, ending with typeURI, without creating the dict."""
+        type_uri = getattr(otl_object, 'typeURI', None)
+        if type_uri is None:
+            raise ValueError('typeURI is None. The object must have an attribute typeURI.')
+
+        yield from cls._iterate_with_plan(
+            plan=EXPORT_PLAN_CACHE.get_plan(otl_object, separator=separator,
+                                            cardinality_indicator=cardinality_indicator,
+                                            waarde_shortcut=waarde_shortcut),
+            object_or_attribute=otl_object, cardinality_separator=cardinality_separator,
+            allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
+            cast_list=cast_list, cast_datetime=cast_datetime)
+        yield 'typeURI', type_uri
+
     @classmethod
     async def to_dict_async(
             cls, otl_object: OTLObject, waarde_shortcut: bool = WAARDE_SHORTCUT, separator: str = SEPARATOR,
@@ -130,10 +164,11 @@ class DotnotationDictConverter:
         if type_uri is None:
             raise ValueError('typeURI is None. The object must have an attribute typeURI.')
 
-        await sleep(0)
-        d = DotnotationDict(cls._iterate_over_attributes_and_values_by_dotnotation(
-            object_or_attribute=otl_object, waarde_shortcut=waarde_shortcut, separator=separator,
-            cardinality_indicator=cardinality_indicator, cardinality_separator=cardinality_separator,
+        d = DotnotationDict(cls._iterate_with_plan(
+            plan=EXPORT_PLAN_CACHE.get_plan(otl_object, separator=separator,
+                                            cardinality_indicator=cardinality_indicator,
+                                            waarde_shortcut=waarde_shortcut),
+            object_or_attribute=otl_object, cardinality_separator=cardinality_separator,
             allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
             warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
             cast_list=cast_list, cast_datetime=cast_datetime))
@@ -188,6 +223,73 @@ class DotnotationDictConverter:
                 cast_list=cast_list, cast_datetime=cast_datetime, collect_native_types=collect_native_types
             )
 
+    @classmethod
+    def _iterate_with_plan(cls, plan: DotnotationExportPlan, object_or_attribute: OTLObject | OTLAttribuut,
+                           cardinality_separator: str = CARDINALITY_SEPARATOR,
+                           allow_non_otl_conform_attributes: bool = True,
+                           warn_for_non_otl_conform_attributes: bool = True, cast_list: bool = False,
+                           cast_datetime: bool = False) -> Generator[tuple[str, object], None, None]:
+        """Same as _iterate_over_attributes_and_values_by_dotnotation, but the dotnotation and kind of each
+        attribute are taken from the export plan of the class instead of being computed for every object."""
+        for attr_key, attribute in vars(object_or_attribute).items():
+            slot = plan.get_slot(attr_key, attribute)
+            if slot is None:
+                continue
+            if slot is NON_CONFORM_SLOT:
+                yield from cls.handle_non_conform_attribute(
+                    allow_non_otl_conform_attributes, attr_key, attribute, object_or_attribute,
+                    warn_for_non_otl_conform_attributes)
+                continue
+
+            waarde = attribute.waarde
+            if waarde is None:
+                if attribute.mark_to_be_cleared:
+                    yield slot.dotnotation, '88888888' if slot.is_list else slot.field.clearing_value
+                continue
+
+            if not slot.is_complex:
+                if slot.is_list_of_list:
+                    raise DotnotationListOfListError(f'Can not use dotnotation for lists of lists. '
+                                                     f'Dotnotation: {slot.dotnotation}')
+                if attribute.mark_to_be_cleared:
+                    yield slot.dotnotation, slot.field.clearing_value
+                if cast_list and slot.is_list:
+                    yield slot.dotnotation, cardinality_separator.join(str(a) for a in waarde)
+                elif cast_datetime:
+                    yield slot.dotnotation, slot.field.value_default(waarde)
+                else:
+                    yield slot.dotnotation, waarde
+                continue
+
+            if not slot.is_list:
+                yield from cls._iterate_with_plan(
+                    plan=plan.get_value_plan(slot, waarde), object_or_attribute=waarde,
+                    cardinality_separator=cardinality_separator,
+                    allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                    warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
+                    cast_list=cast_list, cast_datetime=cast_datetime)
+                continue
+
+            combined_dict = {}
+            for index, lijst_item in enumerate(waarde):
+                for k1, v1 in cls._iterate_with_plan(
+                        plan=plan.get_value_plan(slot, lijst_item), object_or_attribute=lijst_item,
+                        cardinality_separator=cardinality_separator,
+                        allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                        warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
+                        cast_list=cast_list, cast_datetime=cast_datetime):
+                    if k1 not in combined_dict:
+                        combined_dict[k1] = [None] * index
+                    combined_dict[k1].append(v1)
+                for lijst in combined_dict.values():
+                    if len(lijst) < index + 1:
+                        lijst.append(None)
+            if cast_list:
+                for k, v in combined_dict.items():
+                    yield k, cardinality_separator.join(str(a) for a in v)
+            else:
+                yield from combined_dict.items()
+
     @classmethod
     def _yield_non_conform(cls, attr_key, attribute, object_or_attribute,
                            allow_non_otl_conform_attributes, warn_for_non_otl_conform_attributes, collect_native_types):
@@ -381,7 +483,7 @@ class DotnotationDictConverter:
             model_directory = Path(otl_object_file).parent.parent.parent
 
         try:
-            o = dynamic_create_instance_from_uri(str(type_uri), model_directory=model_directory)
+            o = ModelIndex.for_model_directory(model_directory).get_type(str(type_uri))()
         except TypeError as e:
             raise ValueError('typeURI is invalid. Add a valid typeURI to the input dictionary.') from e
 
@@ -404,15 +506,7 @@ class DotnotationDictConverter:
                         allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
                         warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
                 except Exception as e:
-                    allowed_names = {
-                        'ValueError',
-                        'CouldNotConvertToCorrectTypeError',
-                        'UnionTypeError',
-                        'InvalidOptionError',
-                        'RemovedOptionError',
-                        'WrongGeometryTypeError',
-                    }
-                    if e.__class__.__name__ in allowed_names:
+                    if e.__class__.__name__ in COMBINABLE_ERROR_NAMES:
                         if error_collector is not None:
                             attr_error = OTLAttributeError(
                                 message=e.args[0], attribute_dotnotation=k, attribute_value=v, orig_exception=e
@@ -454,8 +548,7 @@ class DotnotationDictConverter:
             model_directory = Path(otl_object_file).parent.parent.parent
 
         try:
-            await sleep(0)
-            o = dynamic_create_instance_from_uri(str(type_uri), model_directory=model_directory)
+            o = ModelIndex.for_model_directory(model_directory).get_type(str(type_uri))()
         except TypeError as e:
             raise ValueError('typeURI is invalid. Add a valid typeURI to the input dictionary.') from e
 
@@ -467,7 +560,6 @@ class DotnotationDictConverter:
                     raise MissingHeaderError(f'Missing a header for value {v}')
                 if k == 'typeURI':
                     continue
-                await sleep(0)
                 if k.startswith('_'):
                     raise ValueError(f'{k} is a non standardized attribute of {obj.__class__.__name__}. '
                                      f'While this is supported, the key can not start with "_".')
@@ -508,6 +600,16 @@ class DotnotationDictConverter:
                                      cast_list: bool = False,
                                      allow_non_otl_conform_attributes: bool = True,
                                      warn_for_non_otl_conform_attributes: bool = True):
+        plan = SETTER_PLAN_CACHE.get_plan(object_or_attribute, dotnotation=dotnotation, separator=separator,
+                                          cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut)
+        # an empty list has side effects in the recursive implementation that the plan does not reproduce
+        if plan is not None and not (cast_list and isinstance(value, list) and not value):
+            plan.set_value(object_or_attribute, value=value, cardinality_separator=cardinality_separator,
+                           cast_datetime=cast_datetime, cast_list=cast_list,
+                           allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                           warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+            return
+
         if dotnotation.count(cardinality_indicator) > 1:
             raise DotnotationListOfListError("can't use dotnotation for lists of lists")
 
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from typing import Optional
+
+from otlmow_converter.DotnotationHelper import DotnotationHelper
+
+EXPORT_PLAN_CACHE_SIZE = 1024
+SKIPPED_KEYS = frozenset({'_parent', '_valid_relations', '_geometry_types', '_is_waarden_object',
+                          '_is_union_waarden_object'})
+
+
+class _ExportSlot:
+    """Everything needed to export the value of one attribute slot: its dotnotation and field. These only depend on
+    the position of the slot in the class, so they are the same for every instance."""
+    __slots__ = ('dotnotation', 'field', 'is_list', 'is_complex', 'is_list_of_list', 'plans')
+
+    def __init__(self, attribute, separator: str, cardinality_indicator: str, waarde_shortcut: bool):
+        self.dotnotation: str = DotnotationHelper.get_dotnotation(
+            attribute, waarde_shortcut=waarde_shortcut, separator=separator,
+            cardinality_indicator=cardinality_indicator)
+        self.field = attribute.field
+        self.is_list: bool = attribute.kardinaliteit_max != '1'
+        self.is_complex: bool = attribute.field.waardeObject is not None
+        self.is_list_of_list: bool = self.dotnotation.count(cardinality_indicator) > 1
+        # the plans of the value objects of a complex slot, by class
+        self.plans: dict[type, DotnotationExportPlan] = {}
+
+
+NON_CONFORM_SLOT = object()
+
+
+class DotnotationExportPlan:
+    """The attribute slots of one class, in one position of the tree (an object or a value object of a complex
+    attribute), by attribute key. The slots are compiled from the first instance that is exported, so only the
+    attributes that are present are ever compiled. A slot is None for keys that are not exported and
+    NON_CONFORM_SLOT for attributes that are not in the model.
+    Iterating over a plan gives the same result as DotnotationDictConverter._iterate_over_attributes_and_values_by_
+    dotnotation, without computing the dotnotation of each attribute again."""
+    __slots__ = ('separator', 'cardinality_indicator', 'waarde_shortcut', 'slots')
+
+    def __init__(self, separator: str, cardinality_indicator: str, waarde_shortcut: bool):
+        self.separator = separator
+        self.cardinality_indicator = cardinality_indicator
+        self.waarde_shortcut = waarde_shortcut
+        self.slots: dict[str, Optional[_ExportSlot]] = {}
+
+    def get_slot(self, attr_key: str, attribute) -> Optional[_ExportSlot]:
+        try:
+            return self.slots[attr_key]
+        except KeyError:
+            pass
+        if attr_key in SKIPPED_KEYS:
+            slot = None
+        elif not getattr(attribute, 'is_otl_attribute', False):
+            slot = NON_CONFORM_SLOT
+        else:
+            slot = _ExportSlot(attribute, separator=self.separator, cardinality_indicator=self.cardinality_indicator,
+                               waarde_shortcut=self.waarde_shortcut)
+        self.slots[attr_key] = slot
+        return slot
+
+    def get_value_plan(self, slot: _ExportSlot, value_object) -> 'DotnotationExportPlan':
+        plan = slot.plans.get(type(value_object))
+        if plan is None:
+            plan = slot.plans[type(value_object)] = DotnotationExportPlan(
+                separator=self.separator, cardinality_indicator=self.cardinality_indicator,
+                waarde_shortcut=self.waarde_shortcut)
+        return plan
+
+
+class ExportPlanCache:
+    """Bounded LRU cache of export plans, keyed on (class, separator, cardinality_indicator, waarde_shortcut).
+    The class identifies the typeURI within one model directory."""
+
+    def __init__(self, maxsize: int = EXPORT_PLAN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans: OrderedDict = OrderedDict()
+
+    def get_plan(self, otl_object, separator: str, cardinality_indicator: str, waarde_shortcut: bool
+                 ) -> DotnotationExportPlan:
+        """Returns the plan for the class of the given object, creating it on first use."""
+        key = (type(otl_object), separator, cardinality_indicator, waarde_shortcut)
+        try:
+            plan = self._plans[key]
+        except KeyError:
+            self.misses += 1
+            plan = self._plans[key] = DotnotationExportPlan(
+                separator=separator, cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut)
+            if len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+            return plan
+        self.hits += 1
+        self._plans.move_to_end(key)
+        return plan
+
+    def cache_info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'maxsize': self.maxsize, 'currsize': len(self._plans)}
+
+    def clear(self) -> None:
+        self._plans.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+EXPORT_PLAN_CACHE = ExportPlanCache()
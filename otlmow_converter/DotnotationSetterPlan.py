@@ -0,0 +1,226 @@
+import warnings
+from datetime import time, datetime, date
+from collections import OrderedDict
+from typing import Optional
+
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import get_attribute_by_name
+from otlmow_model.OtlmowModel.Exceptions.NonStandardAttributeWarning import NonStandardAttributeWarning
+
+from otlmow_converter.DotnotationHelper import DotnotationHelper
+from otlmow_converter.Exceptions.DotnotationListOfListError import DotnotationListOfListError
+
+SETTER_PLAN_CACHE_SIZE = 8192
+
+
+class _FieldPlan:
+    """Everything needed to set a value on one resolved attribute slot, taken from its field definition."""
+    __slots__ = ('private_name', 'field', 'is_temporal', 'has_options', 'field_has_cardinality')
+
+    def __init__(self, attribute):
+        self.private_name = f'_{attribute.naam}'
+        self.field = attribute.field
+        self.is_temporal = attribute.field.is_otl_field and attribute.field.native_type in {time, datetime, date}
+        self.has_options = hasattr(attribute.field, 'options')
+        self.field_has_cardinality = attribute.kardinaliteit_max != '1'
+
+    def set_value(self, attribute, value, cardinality: bool, cast_datetime: bool) -> None:
+        if cast_datetime and self.is_temporal:
+            value = self.field.convert_to_correct_type(value, log_warnings=False)
+        elif self.has_options:
+            if (cardinality or self.field_has_cardinality) and value != '88888888':
+                if isinstance(value, list):
+                    value = [str(v) for v in value]
+                else:
+                    value = [str(value)]
+            else:
+                value = str(value)
+        attribute.set_waarde(value)
+
+
+class DotnotationSetterPlan:
+    """Pre-parsed dotnotation for one class: the path of attribute slots to walk, where the cardinality is and which
+    field converts the value. Executing a plan gives the same result as
+    DotnotationDictConverter.set_attribute_by_dotnotation without parsing the dotnotation again."""
+    __slots__ = ('path', 'list_field', 'leaf', 'leaf_name', 'leaf_cardinality', 'inner_leaf')
+
+    def __init__(self):
+        self.path: list[tuple[str, bool]] = []
+        self.list_field = None
+        self.leaf: Optional[_FieldPlan] = None
+        self.leaf_name: str = ''
+        self.leaf_cardinality: bool = False
+        self.inner_leaf: Optional[_FieldPlan] = None
+
+    @property
+    def is_non_conform(self) -> bool:
+        return self.leaf is None
+
+    def set_value(self, instance, value, cardinality_separator: str, cast_datetime: bool = False,
+                  cast_list: bool = False, allow_non_otl_conform_attributes: bool = True,
+                  warn_for_non_otl_conform_attributes: bool = True) -> None:
+        self._set_value_on_level(instance, 0, value, cardinality_separator, cast_datetime, cast_list,
+                                 allow_non_otl_conform_attributes, warn_for_non_otl_conform_attributes)
+
+    def _set_value_on_level(self, owner, level: int, value, cardinality_separator: str, cast_datetime: bool,
+                            cast_list: bool, allow_non_otl_conform_attributes: bool,
+                            warn_for_non_otl_conform_attributes: bool) -> None:
+        if level == len(self.path):
+            self._set_leaf_value(owner, value, cardinality_separator, cast_datetime, cast_list,
+                                 allow_non_otl_conform_attributes, warn_for_non_otl_conform_attributes)
+            return
+
+        private_name, cardinality = self.path[level]
+        attribute = getattr(owner, private_name)
+        if cardinality:
+            if cast_list:
+                if attribute.waarde is None:
+                    attribute.add_empty_value()
+                if isinstance(value, list):
+                    value = [self.list_field.convert_to_correct_type(v, log_warnings=False) for v in value]
+                else:
+                    value = [self.list_field.convert_to_correct_type(v, log_warnings=False)
+                             for v in str(value).split(cardinality_separator)]
+            for index, v in enumerate(value):
+                if attribute.waarde is None or len(attribute.waarde) <= index:
+                    attribute.add_empty_value()
+                # only the top level receives the non-conform settings, like the recursive implementation
+                self._set_value_on_level(attribute.waarde[index], level + 1, v, cardinality_separator,
+                                         cast_datetime, cast_list, True, True)
+            return
+
+        if attribute.waarde is None:
+            attribute.add_empty_value()
+        self._set_value_on_level(attribute.waarde, level + 1, value, cardinality_separator, cast_datetime,
+                                 cast_list, True, True)
+
+    def _set_leaf_value(self, owner, value, cardinality_separator: str, cast_datetime: bool, cast_list: bool,
+                        allow_non_otl_conform_attributes: bool, warn_for_non_otl_conform_attributes: bool) -> None:
+        if self.leaf is None:
+            if not allow_non_otl_conform_attributes:
+                raise ValueError(
+                    f'{self.leaf_name} is a non standardized attribute of {owner.__class__.__name__}. '
+                    f'If you want to allow this, set allow_non_otl_conform_attributes to True.')
+            if warn_for_non_otl_conform_attributes:
+                warnings.warn(
+                    message=f'{self.leaf_name} is a non standardized attribute of {owner.__class__.__name__}. '
+                            f'The attribute will be added on the instance.',
+                    stacklevel=5,
+                    category=NonStandardAttributeWarning)
+            setattr(owner, self.leaf_name, value)
+            return
+
+        leaf = self.leaf
+        attribute = getattr(owner, leaf.private_name)
+        cardinality = self.leaf_cardinality
+        if cardinality and cast_list:
+            if value == '88888888':
+                attribute.clear_value()
+                return
+            if isinstance(value, str):
+                value = [leaf.field.convert_to_correct_type(v, log_warnings=False)
+                         for v in value.split(cardinality_separator)]
+            elif isinstance(value, list):
+                value = [leaf.field.convert_to_correct_type(v, log_warnings=False) for v in value]
+            else:
+                value = [value]
+
+        inner_leaf = self.inner_leaf
+        if inner_leaf is None:
+            leaf.set_value(attribute, value, cardinality, cast_datetime)
+            return
+
+        if cardinality:
+            for index, v in enumerate(value):
+                if attribute.waarde is None or len(attribute.waarde) <= index:
+                    attribute.add_empty_value()
+                if cast_list:
+                    v = inner_leaf.field.convert_to_correct_type(v, log_warnings=False)
+                inner_leaf.set_value(getattr(attribute.waarde[index], inner_leaf.private_name), v, False,
+                                     cast_datetime)
+        else:
+            if attribute.waarde is None:
+                attribute.add_empty_value()
+            inner_leaf.set_value(getattr(attribute.waarde, inner_leaf.private_name), value, False, cast_datetime)
+
+
+class SetterPlanCache:
+    """Bounded LRU cache of setter plans, keyed on (class, dotnotation, separator, cardinality_indicator,
+    waarde_shortcut). The class identifies the typeURI within one model directory."""
+
+    def __init__(self, maxsize: int = SETTER_PLAN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans: OrderedDict = OrderedDict()
+
+    def get_plan(self, instance, dotnotation: str, separator: str, cardinality_indicator: str,
+                 waarde_shortcut: bool) -> Optional[DotnotationSetterPlan]:
+        """Returns the plan for the class of the given instance, compiling it on first use.
+        Returns None for dotnotations that must go through the recursive implementation, e.g. invalid ones."""
+        key = (type(instance), dotnotation, separator, cardinality_indicator, waarde_shortcut)
+        try:
+            plan = self._plans[key]
+        except KeyError:
+            self.misses += 1
+            plan = compile_setter_plan(instance, dotnotation, separator, cardinality_indicator, waarde_shortcut)
+            self._plans[key] = plan
+            if len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+            return plan
+        self.hits += 1
+        self._plans.move_to_end(key)
+        return plan
+
+    def cache_info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'maxsize': self.maxsize, 'currsize': len(self._plans)}
+
+    def clear(self) -> None:
+        self._plans.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def compile_setter_plan(instance, dotnotation: str, separator: str, cardinality_indicator: str,
+                        waarde_shortcut: bool) -> Optional[DotnotationSetterPlan]:
+    """Resolves the dotnotation against the attribute definitions of the instance. Nested levels are resolved on
+    fresh value objects so the instance itself is not modified."""
+    if dotnotation.count(cardinality_indicator) > 1 or dotnotation.startswith('_'):
+        return None
+
+    owner = instance
+    plan = DotnotationSetterPlan()
+    parts = dotnotation.split(separator)
+    for level, part in enumerate(parts):
+        cardinality = part.endswith(cardinality_indicator)
+        name = part[:-len(cardinality_indicator)] if cardinality else part
+        attribute = get_attribute_by_name(owner, name)
+        if level == len(parts) - 1:
+            plan.leaf_name = name
+            plan.leaf_cardinality = cardinality
+            if attribute is None:
+                return plan if level == 0 else None
+            plan.leaf = _FieldPlan(attribute)
+            if attribute.field.waarde_shortcut_applicable and waarde_shortcut:
+                inner_attribute = get_attribute_by_name(attribute.field.waardeObject(), 'waarde')
+                if inner_attribute is None or inner_attribute.field.waarde_shortcut_applicable:
+                    return None
+                plan.inner_leaf = _FieldPlan(inner_attribute)
+            break
+
+        if attribute is None or not attribute.field.waardeObject:
+            return None
+        if cardinality:
+            try:
+                plan.list_field = DotnotationHelper.get_attribute_by_dotnotation(
+                    instance_or_attribute=attribute.field.waardeObject(), waarde_shortcut=waarde_shortcut,
+                    dotnotation=separator.join(parts[level + 1:]), separator=separator,
+                    cardinality_indicator=cardinality_indicator).field
+            except (AttributeError, DotnotationListOfListError):
+                # the rest of the dotnotation is not an attribute of the value object
+                return None
+        plan.path.append((f'_{name}', cardinality))
+        owner = attribute.field.waardeObject()
+    return plan
+
+
+SETTER_PLAN_CACHE = SetterPlanCache()
@@ -23,7 +23,14 @@ class FileExporter:
         elif extension == 'geojson':
             from otlmow_converter.FileFormats.GeoJSONExporter import GeoJSONExporter
             return GeoJSONExporter()
+        elif extension == 'parquet':
+            from otlmow_converter.FileFormats.ParquetExporter import ParquetExporter
+            return ParquetExporter()
+        elif extension in {'arrow', 'feather'}:
+            from otlmow_converter.FileFormats.ArrowExporter import ArrowExporter
+            return ArrowExporter()
         else:
             raise InvalidExtensionError('This file has an invalid extension. '
-                                        'Supported file formats are: csv, json, xlsx, xls, geojson, jsonld')
+                                        'Supported file formats are: csv, json, xlsx, xls, geojson, jsonld, parquet, '
+                                        'arrow, feather')
 
@@ -0,0 +1,69 @@
+from pathlib import Path
+from typing import Iterable
+
+import pyarrow as pa
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
+
+from otlmow_converter.AbstractExporter import AbstractExporter
+from otlmow_converter.AsyncRunner import AsyncRunner
+from otlmow_converter.FileFormats.ArrowTableBuilder import ArrowTableBuilder
+from otlmow_converter.FileFormats.RecordBatchSpill import RecordBatchSpill
+from otlmow_converter.SettingsManager import load_settings, GlobalVariables
+
+load_settings()
+
+arrow_settings = GlobalVariables.settings['formats']['arrow']
+arrow_dotnotation_settings = arrow_settings['dotnotation']
+SEPARATOR = arrow_dotnotation_settings['separator']
+CARDINALITY_SEPARATOR = arrow_dotnotation_settings['cardinality_separator']
+CARDINALITY_INDICATOR = arrow_dotnotation_settings['cardinality_indicator']
+WAARDE_SHORTCUT = arrow_dotnotation_settings['waarde_shortcut']
+COMPRESSION = arrow_settings['compression']
+BATCH_SIZE = arrow_settings['batch_size']
+ALLOW_NON_OTL_CONFORM_ATTRIBUTES = arrow_settings['allow_non_otl_conform_attributes']
+WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES = arrow_settings['warn_for_non_otl_conform_attributes']
+
+
+class ArrowExporter(AbstractExporter):
+    @classmethod
+    def from_objects(cls, sequence_of_objects: Iterable[OTLObject], filepath: Path, **kwargs) -> tuple[Path]:
+        """Writes the objects to an Arrow IPC file (.arrow, or .feather as Feather V2 is the same format), with a
+        column per dotnotation typed after the OTL field, in record batches of at most batch_size rows. The batches
+        are written one at a time (see RecordBatchSpill), the objects are not collected in one table.
+        The file is not compressed by default, so it can be memory-mapped and read without copying. Use
+        compression='lz4' or 'zstd' for a smaller file that has to be decompressed when read."""
+        if filepath is None:
+            raise ValueError(f'Can not write a file to: {filepath}')
+
+        cardinality_separator = kwargs.get('cardinality_separator', CARDINALITY_SEPARATOR)
+        batch_size = kwargs.get('batch_size', BATCH_SIZE)
+        options = pa.ipc.IpcWriteOptions(compression=kwargs.get('compression', COMPRESSION))
+        with RecordBatchSpill(cardinality_separator=cardinality_separator) as spill:
+            for batch in ArrowTableBuilder.iter_batches(
+                    sequence_of_objects, batch_size=batch_size,
+                    separator=kwargs.get('separator', SEPARATOR), cardinality_separator=cardinality_separator,
+                    cardinality_indicator=kwargs.get('cardinality_indicator', CARDINALITY_INDICATOR),
+                    waarde_shortcut=kwargs.get('waarde_shortcut', WAARDE_SHORTCUT),
+                    allow_non_otl_conform_attributes=kwargs.get('allow_non_otl_conform_attributes',
+                                                                ALLOW_NON_OTL_CONFORM_ATTRIBUTES),
+                    warn_for_non_otl_conform_attributes=kwargs.get('warn_for_non_otl_conform_attributes',
+                                                                   WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES)):
+                spill.add(batch)
+            spill.write(lambda schema: pa.ipc.new_file(str(filepath), schema, options=options))
+        return (filepath,)
+
+    @classmethod
+    async def from_objects_async(cls, sequence_of_objects: Iterable[OTLObject], filepath: Path,
+                                 **kwargs) -> tuple[Path]:
+        """Builds and writes the file with from_objects in an executor, use executor=... to pass the executor."""
+        executor, _, _, _ = AsyncRunner.pop_options(kwargs)
+        objects = [otl_object async for otl_object in AsyncRunner.iterate(sequence_of_objects)]
+        return await AsyncRunner.run(cls.from_objects, sequence_of_objects=objects, filepath=filepath,
+                                     executor=executor, **kwargs)
+
+    @classmethod
+    def from_pyarrow_table_to_file(cls, table: pa.Table, filepath: Path, compression: str = COMPRESSION,
+                                   batch_size: int = BATCH_SIZE) -> None:
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.OSFile(str(filepath), 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table, max_chunksize=batch_size)
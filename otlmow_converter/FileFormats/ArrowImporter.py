@@ -0,0 +1,111 @@
+from pathlib import Path
+from typing import Callable, Generator, Iterable, Optional
+
+import pyarrow as pa
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
+
+from otlmow_converter.AbstractImporter import AbstractImporter
+from otlmow_converter.AsyncRunner import AsyncRunner
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
+from otlmow_converter.Exceptions.ErrorInExcelLine import ErrorInExcelLine
+from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
+from otlmow_converter.SettingsManager import load_settings, GlobalVariables
+
+load_settings()
+
+arrow_settings = GlobalVariables.settings['formats']['arrow']
+arrow_dotnotation_settings = arrow_settings['dotnotation']
+SEPARATOR = arrow_dotnotation_settings['separator']
+CARDINALITY_SEPARATOR = arrow_dotnotation_settings['cardinality_separator']
+CARDINALITY_INDICATOR = arrow_dotnotation_settings['cardinality_indicator']
+WAARDE_SHORTCUT = arrow_dotnotation_settings['waarde_shortcut']
+ALLOW_NON_OTL_CONFORM_ATTRIBUTES = arrow_settings['allow_non_otl_conform_attributes']
+WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES = arrow_settings['warn_for_non_otl_conform_attributes']
+
+
+class ArrowImporter(AbstractImporter):
+    @classmethod
+    def to_objects(cls, filepath: Path, **kwargs) -> Iterable[OTLObject]:
+        """Reads an Arrow IPC file (.arrow or .feather) and converts it to OTL objects.
+        The file is memory-mapped and the objects are built one record batch at a time, column by column, with
+        PyArrowConverter.
+        - columns: only read these dotnotation columns (typeURI is always read).
+        - stream: if True, a generator is returned that only reads the next record batch when its objects are
+          requested (default is False).
+        - on_line_error: a callable that receives the ErrorInExcelLine of each row that fails. If not given, a
+          BadLinesInExcelError is raised after the last object."""
+        if filepath is None:
+            raise ValueError(f'Can not read a file from: {filepath}')
+
+        objects = cls._iter_objects(Path(filepath), **kwargs)
+        if kwargs.get('stream', False):
+            return objects
+
+        instances = []
+        try:
+            instances.extend(objects)
+        except BadLinesInExcelError as lines_error:
+            lines_error.objects = instances
+            raise lines_error
+        return instances
+
+    @classmethod
+    async def to_objects_async(cls, filepath: Path, **kwargs) -> Iterable[OTLObject]:
+        if filepath is None:
+            raise ValueError(f'Can not read a file from: {filepath}')
+
+        instances = []
+        try:
+            async for instance in AsyncRunner.iterate(cls._iter_objects(Path(filepath), **kwargs)):
+                instances.append(instance)
+        except BadLinesInExcelError as lines_error:
+            lines_error.objects = instances
+            raise lines_error
+        return instances
+
+    @classmethod
+    def to_table(cls, filepath: Path, columns: Optional[Iterable[str]] = None, **kwargs) -> pa.Table:
+        """Returns the table of the file without creating objects. The columns point into the memory-mapped file,
+        so nothing is copied or parsed unless the file is compressed."""
+        with pa.memory_map(str(filepath)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is None:
+            return table
+        return table.select([name for name in table.column_names if name in {'typeURI', *columns}])
+
+    @classmethod
+    def _iter_objects(cls, filepath: Path, model_directory: Optional[Path] = None,
+                      columns: Optional[Iterable[str]] = None,
+                      on_line_error: Optional[Callable[[ErrorInExcelLine], None]] = None,
+                      **kwargs) -> Generator[OTLObject, None, None]:
+        lines_error = BadLinesInExcelError()
+        if on_line_error is None:
+            on_line_error = lines_error.add_exception
+        convert_kwargs = dict(
+            separator=kwargs.get('separator', SEPARATOR),
+            cardinality_separator=kwargs.get('cardinality_separator', CARDINALITY_SEPARATOR),
+            cardinality_indicator=kwargs.get('cardinality_indicator', CARDINALITY_INDICATOR),
+            waarde_shortcut=kwargs.get('waarde_shortcut', WAARDE_SHORTCUT),
+            allow_non_otl_conform_attributes=kwargs.get('allow_non_otl_conform_attributes',
+                                                        ALLOW_NON_OTL_CONFORM_ATTRIBUTES),
+            warn_for_non_otl_conform_attributes=kwargs.get('warn_for_non_otl_conform_attributes',
+                                                           WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES),
+            combine_errors=kwargs.get('combine_errors', False),
+            # lists are stored as lists, only columns that mix clearing values and lists are stored as text
+            cast_list=True, cast_datetime=False)
+
+        rows_done = 0
+        with pa.memory_map(str(filepath)) as source:
+            reader = pa.ipc.open_file(source)
+            names = reader.schema.names
+            if columns is not None:
+                names = [name for name in names if name in {'typeURI', *columns}]
+            for index in range(reader.num_record_batches):
+                table = pa.Table.from_batches([reader.get_batch(index)]).select(names)
+                yield from PyArrowConverter.iter_table_to_objects(
+                    table=table, model_directory=model_directory, on_line_error=on_line_error,
+                    additional_header_lines=rows_done, **convert_kwargs)
+                rows_done += table.num_rows
+
+        if lines_error.exceptions:
+            raise lines_error
@@ -0,0 +1,243 @@
+from datetime import date, datetime, time
+from itertools import chain
+from typing import Generator, Iterable, Optional
+
+import pyarrow as pa
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
+from otlmow_model.OtlmowModel.Helpers.GenericHelper import get_shortened_uri
+
+from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.DotnotationHelper import DotnotationHelper
+from otlmow_converter.Exceptions.DotnotationListOfListError import DotnotationListOfListError
+from otlmow_converter.SettingsManager import load_settings, GlobalVariables
+
+load_settings()
+
+SEPARATOR = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['separator']
+CARDINALITY_SEPARATOR = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['cardinality_separator']
+CARDINALITY_INDICATOR = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['cardinality_indicator']
+WAARDE_SHORTCUT = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['waarde_shortcut']
+BATCH_SIZE = GlobalVariables.settings['formats']['arrow']['batch_size']
+NATIVE_ARROW_TYPES = {str: pa.string(), int: pa.int64(), float: pa.float64(), bool: pa.bool_(), date: pa.date32(),
+                      datetime: pa.timestamp('us'), time: pa.time64('us')}
+ARROW_TYPES: dict[tuple, Optional[pa.DataType]] = {}
+ARROW_TYPE_PROBES: dict[type, OTLObject] = {}
+
+
+class ArrowTableBuilder:
+    """Builds Arrow record batches from OTL objects, column by column.
+    The dotnotation values of each object are appended straight to a list per column, without a dict per object.
+    A column that first appears in a later row is filled with nulls for the rows before it.
+    When the batch is flushed, each column is written into an array of the type from the model (see
+    get_arrow_type)."""
+
+    def __init__(self, waarde_shortcut: bool = WAARDE_SHORTCUT, separator: str = SEPARATOR,
+                 cardinality_separator: str = CARDINALITY_SEPARATOR,
+                 cardinality_indicator: str = CARDINALITY_INDICATOR, cast_list: bool = False,
+                 cast_datetime: bool = False, allow_non_otl_conform_attributes: bool = True,
+                 warn_for_non_otl_conform_attributes: bool = True):
+        self.cardinality_separator = cardinality_separator
+        self._item_kwargs = dict(
+            waarde_shortcut=waarde_shortcut, separator=separator, cardinality_indicator=cardinality_indicator,
+            cardinality_separator=cardinality_separator, cast_list=cast_list, cast_datetime=cast_datetime,
+            allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+        self._type_kwargs = dict(separator=separator, cardinality_indicator=cardinality_indicator,
+                                 waarde_shortcut=waarde_shortcut, cast_list=cast_list, cast_datetime=cast_datetime)
+        self._columns: dict[str, list] = {}
+        self._rows_per_type: dict[type, list[int]] = {}
+        self.num_rows = 0
+
+    @classmethod
+    def iter_batches(cls, objects: Iterable[OTLObject], batch_size: int = BATCH_SIZE, **kwargs
+                     ) -> Generator[pa.RecordBatch, None, None]:
+        """Yields a record batch for every batch_size objects. The keyword arguments are those of the builder.
+        Batches can have different columns and, for columns with clearing values, a different type. Use
+        concat_batches to combine them."""
+        builder = cls(**kwargs)
+        for otl_object in objects:
+            builder.add(otl_object)
+            if builder.num_rows >= batch_size:
+                yield builder.flush()
+        if builder.num_rows:
+            yield builder.flush()
+
+    @classmethod
+    def iter_batches_per_type(cls, objects: Iterable[OTLObject], batch_size: int = BATCH_SIZE, **kwargs
+                              ) -> Generator[tuple[str, pa.RecordBatch], None, None]:
+        """Yields (short uri of the type, record batch) for every batch_size objects of a type, with a builder per
+        type that the objects are added to as they come. The keyword arguments are those of the builder."""
+        builders: dict[str, ArrowTableBuilder] = {}
+        for otl_object in objects:
+            if otl_object.typeURI == 'http://purl.org/dc/terms/Agent':
+                short_uri = 'Agent'
+            else:
+                short_uri = get_shortened_uri(otl_object.typeURI)
+            builder = builders.get(short_uri)
+            if builder is None:
+                builder = builders[short_uri] = cls(**kwargs)
+            builder.add(otl_object)
+            if builder.num_rows >= batch_size:
+                yield short_uri, builder.flush()
+        for short_uri, builder in builders.items():
+            if builder.num_rows:
+                yield short_uri, builder.flush()
+
+    @classmethod
+    def build_table(cls, objects: Iterable[OTLObject], batch_size: int = BATCH_SIZE, **kwargs) -> pa.Table:
+        return cls.concat_batches(list(cls.iter_batches(objects, batch_size=batch_size, **kwargs)),
+                                  cardinality_separator=kwargs.get('cardinality_separator', CARDINALITY_SEPARATOR))
+
+    def add(self, otl_object: OTLObject) -> None:
+        # the items are collected first, so an object that raises halfway leaves no values behind
+        items = list(DotnotationDictConverter.iter_items(otl_object, **self._item_kwargs))
+        row = self.num_rows
+        columns = self._columns
+        for key, value in items:
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * row
+            elif len(column) < row:
+                column.extend([None] * (row - len(column)))
+            elif len(column) > row:
+                column[row] = value
+                continue
+            column.append(value)
+        self._rows_per_type.setdefault(type(otl_object), []).append(row)
+        self.num_rows = row + 1
+
+    def flush(self) -> Optional[pa.RecordBatch]:
+        """Returns the objects added since the last flush as a record batch, with the columns sorted by name."""
+        if not self.num_rows:
+            return None
+        for column in self._columns.values():
+            if len(column) < self.num_rows:
+                column.extend([None] * (self.num_rows - len(column)))
+        names = sorted(self._columns)
+
+        if len(self._rows_per_type) == 1:
+            otl_type = next(iter(self._rows_per_type))
+            arrays = [self._create_array_of_type(self._columns[name], self.get_arrow_type(
+                otl_type, name, **self._type_kwargs), self.cardinality_separator) for name in names]
+        else:
+            # the columns are built per class and put back in the order of the objects
+            positions = [0] * self.num_rows
+            for position, row in enumerate(chain.from_iterable(self._rows_per_type.values())):
+                positions[row] = position
+            positions = pa.array(positions, type=pa.int64())
+            arrays = [self._create_array_of_types(name, positions) for name in names]
+
+        self._columns = {}
+        self._rows_per_type = {}
+        self.num_rows = 0
+        return pa.RecordBatch.from_arrays(arrays, names=names)
+
+    def _create_array_of_types(self, name: str, positions: pa.Array) -> pa.Array:
+        column = self._columns[name]
+        arrays = []
+        for otl_type, rows in self._rows_per_type.items():
+            values = [column[row] for row in rows]
+            if all(value is None for value in values):
+                arrays.append(pa.nulls(len(values)))
+            else:
+                arrays.append(self._create_array_of_type(values, self.get_arrow_type(
+                    otl_type, name, **self._type_kwargs), self.cardinality_separator))
+        return self.concat_arrays(arrays, self.cardinality_separator).take(positions)
+
+    @classmethod
+    def concat_batches(cls, batches: list[pa.RecordBatch], cardinality_separator: str = CARDINALITY_SEPARATOR
+                       ) -> pa.Table:
+        """Combines record batches with different columns into one table. Missing columns are null, columns with a
+        different type per batch become text columns."""
+        if not batches:
+            return pa.table({})
+        if len(batches) == 1:
+            return pa.Table.from_batches(batches)
+        names = sorted(set().union(*(batch.schema.names for batch in batches)))
+        return pa.Table.from_arrays([cls.concat_arrays(
+            [batch.column(name) if name in batch.schema.names else pa.nulls(batch.num_rows) for batch in batches],
+            cardinality_separator) for name in names], names=names)
+
+    @classmethod
+    def concat_arrays(cls, arrays: list[pa.Array], cardinality_separator: str = CARDINALITY_SEPARATOR) -> pa.Array:
+        arrow_type = cls.get_common_type(array.type for array in arrays)
+        return pa.concat_arrays([cls.cast_array(array, arrow_type, cardinality_separator) for array in arrays])
+
+    @staticmethod
+    def get_common_type(arrow_types: Iterable[pa.DataType]) -> pa.DataType:
+        """Returns the type that columns of the given types are combined into: the one type that is not null, else
+        text."""
+        arrow_types = {arrow_type for arrow_type in arrow_types if not pa.types.is_null(arrow_type)}
+        return arrow_types.pop() if len(arrow_types) == 1 else pa.string()
+
+    @classmethod
+    def cast_array(cls, array: pa.Array, arrow_type: pa.DataType, cardinality_separator: str = CARDINALITY_SEPARATOR
+                   ) -> pa.Array:
+        if array.type == arrow_type:
+            return array
+        try:
+            return array.cast(arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            # lists can not be cast to text by Arrow
+            return cls._create_text_array(array.to_pylist(), cardinality_separator)
+
+    @classmethod
+    def get_arrow_type(cls, otl_type: type, dotnotation: str, separator: str = SEPARATOR,
+                       cardinality_indicator: str = CARDINALITY_INDICATOR, waarde_shortcut: bool = WAARDE_SHORTCUT,
+                       cast_list: bool = False, cast_datetime: bool = False) -> Optional[pa.DataType]:
+        """Returns the Arrow type of a dotnotation column of an OTL class: the native type of the field, in a list
+        if the dotnotation has a cardinality indicator. Returns None if the dotnotation is not an attribute of the
+        class. The types are cached per class and dotnotation."""
+        key = (otl_type, dotnotation, separator, cardinality_indicator, waarde_shortcut, cast_list, cast_datetime)
+        try:
+            return ARROW_TYPES[key]
+        except KeyError:
+            arrow_type = ARROW_TYPES[key] = cls._resolve_arrow_type(*key)
+            return arrow_type
+
+    @classmethod
+    def _resolve_arrow_type(cls, otl_type: type, dotnotation: str, separator: str, cardinality_indicator: str,
+                            waarde_shortcut: bool, cast_list: bool, cast_datetime: bool) -> Optional[pa.DataType]:
+        if dotnotation == 'typeURI':
+            return pa.string()
+        # the walk adds empty values to the probe, so the probe is never handed out
+        probe = ARROW_TYPE_PROBES.get(otl_type)
+        if probe is None:
+            probe = ARROW_TYPE_PROBES[otl_type] = otl_type()
+        try:
+            attribute = DotnotationHelper.get_attribute_by_dotnotation(
+                instance_or_attribute=probe, dotnotation=dotnotation, separator=separator,
+                cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut)
+        except (AttributeError, DotnotationListOfListError):
+            return None
+        native_type = getattr(getattr(attribute, 'field', None), 'native_type', None)
+        arrow_type = NATIVE_ARROW_TYPES.get(native_type)
+        if arrow_type is None:
+            return None
+        if cast_datetime and native_type in {date, datetime, time}:
+            arrow_type = pa.string()
+        if cardinality_indicator in dotnotation:
+            return pa.string() if cast_list else pa.list_(arrow_type)
+        return arrow_type
+
+    @classmethod
+    def _create_array_of_type(cls, values: list, arrow_type: Optional[pa.DataType], cardinality_separator: str
+                              ) -> pa.Array:
+        # Arrow would read a clearing value in a list column as a list of characters
+        if arrow_type is not None and not (pa.types.is_list(arrow_type) and any(
+                value is not None and not isinstance(value, list) for value in values)):
+            try:
+                return pa.array(values, type=arrow_type)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return cls._create_text_array(values, cardinality_separator)
+
+    @classmethod
+    def _create_text_array(cls, values: list, cardinality_separator: str) -> pa.Array:
+        """Values of different types, e.g. clearing values, are written as text, lists as with cast_list."""
+        return pa.array([None if value is None else
+                         cardinality_separator.join(str(v) for v in value) if isinstance(value, list) else
+                         str(value) for value in values], type=pa.string())
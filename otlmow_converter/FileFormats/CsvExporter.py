@@ -1,12 +1,14 @@
 
 import csv
 from asyncio import sleep
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Iterable
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
 from otlmow_converter.AbstractExporter import AbstractExporter
 from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
-from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
+from otlmow_converter.FileFormats.RecordBatchSpill import RecordBatchSpill
+from otlmow_converter.FileFormats.ArrowTableBuilder import ArrowTableBuilder
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 from pyarrow import Table
 import pyarrow as pa
@@ -61,34 +63,36 @@ class CsvExporter(AbstractExporter):
         if delimiter == '':
             delimiter = ';'
 
+        builder_kwargs = dict(
+            separator=separator, cardinality_separator=cardinality_separator,
+            cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
+            cast_list=cast_list, cast_datetime=cast_datetime,
+            allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+        write_options = pacsv.WriteOptions(delimiter=delimiter)
+
         if not split_per_type:
-            table = PyArrowConverter.convert_objects_to_single_table(
-                list_of_objects=sequence_of_objects,
-                separator=separator, cardinality_separator=cardinality_separator,
-                cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
-                cast_list=cast_list, cast_datetime=cast_datetime,
-                allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
-                avoid_multiple_types_in_single_column=True)
-            CsvExporter.from_pyarrow_table_to_file(table, Path(filepath), delimiter=delimiter)
+            with RecordBatchSpill(cardinality_separator=cardinality_separator) as spill:
+                for batch in ArrowTableBuilder.iter_batches(sequence_of_objects, **builder_kwargs):
+                    spill.add(batch)
+                spill.write(lambda schema: pacsv.CSVWriter(filepath, schema, write_options=write_options),
+                            schema=cls._get_csv_schema(spill.get_schema()))
             return (filepath,)
-        else:
-            multi_table_dict = PyArrowConverter.convert_objects_to_multiple_tables(
-                list_of_objects=sequence_of_objects,
-                separator=separator, cardinality_separator=cardinality_separator,
-                cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
-                cast_list=cast_list, cast_datetime=cast_datetime,
-                allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+
+        with ExitStack() as stack:
+            spills: dict[str, RecordBatchSpill] = {}
+            for short_uri, batch in ArrowTableBuilder.iter_batches_per_type(sequence_of_objects, **builder_kwargs):
+                spill = spills.get(short_uri)
+                if spill is None:
+                    spill = spills[short_uri] = stack.enter_context(RecordBatchSpill(cardinality_separator))
+                spill.add(batch)
 
             created_filepaths = []
-            for short_uri, table_data in multi_table_dict.items():
+            for short_uri, spill in spills.items():
                 specific_filename = (f'{filepath.stem}_' + short_uri.replace('#', '_') + filepath.suffix)
                 created_filepath = Path(filepath.parent / specific_filename)
-
-                cls.from_pyarrow_table_to_file(
-                    table=table_data, filepath=created_filepath, delimiter=delimiter)
-                created_filepath.touch()
+                spill.write(lambda schema: pacsv.CSVWriter(created_filepath, schema, write_options=write_options),
+                            schema=cls._get_csv_schema(spill.get_schema()))
                 created_filepaths.append(created_filepath)
         return tuple(created_filepaths)
 
@@ -172,30 +176,10 @@ class CsvExporter(AbstractExporter):
         if delimiter is None:
             delimiter = DELIMITER or ';'
 
-        required_first = ['typeURI', 'assetId.identificator', 'assetId.toegekendDoor']
-        table_colnames = table.schema.names
-        if 'agentId.identificator' in table_colnames:
-            required_first = ['typeURI', 'agentId.identificator', 'agentId.toegekendDoor']
-        num_rows = table.num_rows
-
-        # Add missing required columns as empty string columns
-        new_fields = list(table.schema)
-        new_columns = list(table.itercolumns())
-        for col in required_first:
-            if col not in table_colnames:
-                new_fields.append(pa.field(col, pa.string()))
-                new_columns.append(pa.array([None] * num_rows))
-
-        # Build a new table with all columns (original + missing)
-        full_table = pa.table(new_columns, names=[f.name for f in new_fields])
-
-        # Reorder columns: required_first, then the rest (excluding duplicates)
-        all_names = full_table.schema.names
-        rest = sorted(name for name in all_names if name not in required_first)
-        final_order = required_first + rest
-        reordered_columns = [full_table.column(name) for name in final_order]
-
-        final_table = pa.table(reordered_columns, names=final_order)
+        schema = cls._get_csv_schema(table.schema)
+        final_table = pa.Table.from_arrays(
+            [table.column(field.name) if field.name in table.schema.names else pa.nulls(table.num_rows, field.type)
+             for field in schema], schema=schema)
 
         write_options = pacsv.WriteOptions(delimiter=delimiter)
         with open(filepath, "wb") as f:
@@ -203,6 +187,17 @@ class CsvExporter(AbstractExporter):
         filepath.touch()
         return filepath
 
+    @staticmethod
+    def _get_csv_schema(schema: pa.Schema) -> pa.Schema:
+        """Puts 'typeURI' and the id columns first, as text columns if they are missing, then the other columns."""
+        required_first = ['typeURI', 'assetId.identificator', 'assetId.toegekendDoor']
+        if 'agentId.identificator' in schema.names:
+            required_first = ['typeURI', 'agentId.identificator', 'agentId.toegekendDoor']
+        fields = [schema.field(name) if name in schema.names else pa.field(name, pa.string())
+                  for name in required_first]
+        fields.extend(schema.field(name) for name in sorted(schema.names) if name not in required_first)
+        return pa.schema(fields)
+
     @classmethod
     def _write_file(cls, file_location: Path, data: Iterable[Iterable], delimiter: str, quote_char: str) -> None:
         with open(file_location, "w", newline='', encoding='utf-8') as file:
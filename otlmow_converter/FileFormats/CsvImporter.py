@@ -1,22 +1,25 @@
 import csv
 import logging
-from asyncio import sleep
 from datetime import datetime, date, time
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Optional, Generator, Callable
 
 import pyarrow as pa
 import pyarrow.compute as pc
 import pyarrow.csv as pa_csv
-from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject, dynamic_create_instance_from_uri
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
+from otlmow_model.OtlmowModel.Exceptions.CouldNotCreateInstanceError import CouldNotCreateInstanceError
 from pyarrow._csv import read_csv, ParseOptions, ReadOptions, ConvertOptions
 
 from otlmow_converter.AbstractImporter import AbstractImporter
-from otlmow_converter.DotnotationHelper import DotnotationHelper
+from otlmow_converter.AsyncRunner import AsyncRunner
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
+from otlmow_converter.Exceptions.ErrorInExcelLine import ErrorInExcelLine
 from otlmow_converter.Exceptions.NoTypeUriInTableError import NoTypeUriInTableError
 from otlmow_converter.Exceptions.TypeUriNotInFirstRowError import TypeUriNotInFirstRowError
 from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
-from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
+from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter, WORKER_BATCH_SIZE
+from otlmow_converter.ModelIndex import ModelIndex
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 
 csv.field_size_limit(2147483647)
@@ -35,6 +38,7 @@ CAST_DATETIME = csv_settings['cast_datetime']
 ALLOW_NON_OTL_CONFORM_ATTRIBUTES = csv_settings['allow_non_otl_conform_attributes']
 WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES = csv_settings['warn_for_non_otl_conform_attributes']
 DELIMITER = csv_settings['delimiter']
+STREAM_BLOCK_SIZE = 1 << 20
 
 
 class CsvImporter(AbstractImporter):
@@ -55,6 +59,14 @@ class CsvImporter(AbstractImporter):
         - allow_non_otl_conform_attributes: Whether to allow attributes that are not OTL conform (default is True).
         - warn_for_non_otl_conform_attributes: Whether to warn for non-OTL conform attributes (default is True).
         - contains_exactly_one_type: If True, the CSV file is expected to contain only one type of OTLObject.
+        - workers: The number of processes used to create the objects of a file with a single type (default is None,
+          meaning everything happens in the current process).
+        - stream: If True, the file is read in blocks and the objects are yielded lazily (default is False).
+        - block_size: When streaming, the size in bytes of the blocks that are read at once (default is 1 MiB).
+          This is the block size of the Arrow CSV reader, not a limit on the memory used.
+        - batch_size: When streaming, the maximum number of rows that are converted at once (default is a whole block).
+        - on_line_error: When streaming, a callable that receives the ErrorInExcelLine of each row that fails. If not
+          given, a BadLinesInExcelError is raised after the last object.
         :return: An iterable of OTLObjects.
         :raises ValueError: If the filepath is None or empty.
         :raises TypeUriNotInFirstRowError: If the typeURI is not found in the first row of the CSV file.
@@ -71,6 +83,15 @@ class CsvImporter(AbstractImporter):
         delimiter = cls._normalize_delimiter(delimiter)
         model_directory = kwargs.get('model_directory', None)
 
+        if kwargs.get('stream', False):
+            return cls._iter_objects_streaming(
+                filepath=filepath, kwargs=kwargs, delimiter=delimiter, quote_char=quote_char, separator=separator,
+                cardinality_indicator=cardinality_indicator, cardinality_separator=cardinality_separator,
+                waarde_shortcut=waarde_shortcut, cast_datetime=cast_datetime,
+                allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
+                contains_exactly_one_type=contains_exactly_one_type, model_directory=model_directory)
+
         # Single-type fast path
         if contains_exactly_one_type:
             return cls._convert_single_type_path(
@@ -100,11 +121,14 @@ class CsvImporter(AbstractImporter):
                 cardinality_separator=cardinality_separator, waarde_shortcut=waarde_shortcut,
                 cast_datetime=cast_datetime, cast_list=cast_list, contains_exactly_one_type=True,
                 allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
+                workers=kwargs.get('workers', None),
+                worker_batch_size=kwargs.get('worker_batch_size', WORKER_BATCH_SIZE))
 
-        # Python fallback path
-        return cls._python_fallback_to_objects(
+        # Multi-type path, falls back to Python when pyarrow can not parse a value
+        return cls._convert_multiple_types_path(
             filepath=filepath,
+            kwargs=kwargs,
             delimiter=delimiter,
             quote_char=quote_char,
             model_directory=model_directory,  # type: ignore[arg-type]
@@ -171,10 +195,9 @@ class CsvImporter(AbstractImporter):
             kwargs['cast_datetime'] = False
 
         first_row, headers = cls._read_first_row_and_headers(filepath, delimiter, quote_char)
-        instance = dynamic_create_instance_from_uri(first_row['typeURI'], model_directory=model_directory)
-
         schema, headers_with_cardinality = cls._build_schema_for_headers(
-            instance=instance,
+            type_uri=first_row['typeURI'],
+            model_directory=model_directory,
             headers=headers,
             separator=separator,
             cardinality_indicator=cardinality_indicator,
@@ -206,6 +229,246 @@ class CsvImporter(AbstractImporter):
                 )
             raise
 
+    @classmethod
+    def _convert_multiple_types_path(
+        cls, filepath: Path, kwargs: dict[str, object], delimiter: str, quote_char: str,
+        model_directory: Optional[Path], separator: str, cardinality_indicator: str, waarde_shortcut: bool,
+        cardinality_separator: str, cast_datetime: bool, cast_list: bool, allow_non_otl_conform_attributes: bool,
+        warn_for_non_otl_conform_attributes: bool) -> list[OTLObject]:
+        """Reads the file once as strings, partitions the rows by typeURI and converts each partition with the
+        typed schema of its type, like the single-type path. Objects and line errors keep the order of the file."""
+        fallback_kwargs = dict(
+            filepath=filepath, delimiter=delimiter, quote_char=quote_char, model_directory=model_directory,
+            separator=separator, cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
+            cardinality_separator=cardinality_separator, cast_datetime=cast_datetime, cast_list=cast_list,
+            allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+
+        try:
+            _, headers = cls._read_first_row_and_headers(filepath, delimiter, quote_char)
+        except StopIteration:
+            # only a header row, so there are no objects
+            return []
+        string_schema = pa.schema([(header, pa.string()) for header in ['typeURI'] + headers])
+        try:
+            table = cls._read_csv_table_with_schema(filepath, delimiter, quote_char, string_schema)
+            partitions = cls._partition_table_by_type(
+                table=table, model_directory=model_directory, separator=separator,
+                cardinality_indicator=cardinality_indicator, cardinality_separator=cardinality_separator,
+                waarde_shortcut=waarde_shortcut, allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes, filepath=filepath)
+        except (pa.lib.ArrowInvalid, NotImplementedError, AttributeError) as e:
+            logging.debug(f'PyArrow parsing failed, falling back to Python CSV reader for {filepath.name}: {e}')
+            return cls._python_fallback_to_objects(**fallback_kwargs)
+
+        # the values are already parsed by pyarrow, prevent double casting downstream
+        convert_kwargs = {k: v for k, v in kwargs.items() if k not in {'on_line_error', 'additional_header_lines'}}
+        convert_kwargs.update(cast_list=False, cast_datetime=False)
+
+        objects_by_row: dict[int, OTLObject] = {}
+        errors_by_row: dict[int, ErrorInExcelLine] = {}
+        for partition, row_numbers in partitions:
+            failed_rows = set()
+
+            def on_line_error(line_error: ErrorInExcelLine) -> None:
+                row_nr = row_numbers[line_error.line_number - 2]
+                failed_rows.add(row_nr)
+                errors_by_row[row_nr] = ErrorInExcelLine(
+                    message=f'Error creating instance from line {row_nr + 2}: {line_error.error}',
+                    line_number=row_nr + 2, error=line_error.error)
+
+            objects = list(PyArrowConverter.iter_table_to_objects(
+                table=partition, on_line_error=on_line_error, **convert_kwargs))
+            objects_by_row.update(zip((r for r in row_numbers if r not in failed_rows), objects))
+
+        objects = [objects_by_row[row_nr] for row_nr in sorted(objects_by_row)]
+        if errors_by_row:
+            lines_error = BadLinesInExcelError(objects=objects)
+            for row_nr in sorted(errors_by_row):
+                lines_error.add_exception(errors_by_row[row_nr])
+            raise lines_error
+        return objects
+
+    @classmethod
+    def _partition_table_by_type(
+        cls, table: pa.Table, model_directory: Optional[Path], separator: str, cardinality_indicator: str,
+        cardinality_separator: str, waarde_shortcut: bool, allow_non_otl_conform_attributes: bool,
+        warn_for_non_otl_conform_attributes: bool, filepath: Path) -> list[tuple[pa.Table, list[int]]]:
+        """Splits a table of strings in a typed table per typeURI, with the row numbers of its rows.
+        Rows without any value are skipped and not counted, like the Python CSV reader does, so the line numbers in
+        the errors are the same on both paths."""
+        has_values = pc.is_valid(table.column(0))
+        for column in table.columns[1:]:
+            has_values = pc.or_(has_values, pc.is_valid(column))
+        table = table.filter(has_values)
+        type_column = table.column('typeURI')
+        model_index = ModelIndex.for_model_directory(model_directory)
+
+        partitions = []
+        for type_uri in pc.unique(type_column).to_pylist():
+            if type_uri is None:
+                mask = pc.is_null(type_column)
+            else:
+                mask = pc.fill_null(pc.equal(type_column, type_uri), False)
+            row_numbers = pc.indices_nonzero(mask)
+            partition = table.take(row_numbers)
+            row_numbers = row_numbers.to_pylist()
+            headers = [name for name in partition.column_names[1:]
+                       if partition.column(name).null_count < partition.num_rows]
+
+            try:
+                type_ = None if type_uri is None else model_index.get_type(type_uri)
+            except (TypeError, ValueError, CouldNotCreateInstanceError):
+                type_ = None
+            if type_ is None:
+                # the typeURI is enough to report the error of these rows
+                partitions.append((partition.select(['typeURI']), row_numbers))
+                continue
+
+            schema, headers_with_cardinality = cls._build_schema_for_headers(
+                type_uri=type_uri, model_directory=model_directory, headers=headers, separator=separator, cardinality_indicator=cardinality_indicator,
+                waarde_shortcut=waarde_shortcut, allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes, filepath=filepath)
+            partition = partition.select(schema.names)
+            for field in schema:
+                if field.type != pa.string():
+                    partition = partition.set_column(partition.schema.get_field_index(field.name), field.name,
+                                                     cls._cast_string_column(partition.column(field.name), field.type))
+            partition = cls._apply_cardinality_splitting(partition, headers_with_cardinality, cardinality_separator)
+            partition = cls._append_missing_columns_to_table(
+                partition, cls._compute_missing_columns(type_uri, headers))
+            partitions.append((partition, row_numbers))
+        return partitions
+
+    @classmethod
+    def _cast_string_column(cls, column: pa.ChunkedArray, data_type: pa.DataType) -> pa.ChunkedArray:
+        if pa.types.is_time(data_type):
+            return pc.strptime(column, format='%H:%M:%S', unit='ns').cast(data_type)
+        return column.cast(data_type)
+
+    @classmethod
+    def _iter_objects_streaming(
+        cls, filepath: Path, kwargs: dict[str, object], delimiter: str, quote_char: str, separator: str,
+        cardinality_indicator: str, cardinality_separator: str, waarde_shortcut: bool, cast_datetime: bool,
+        allow_non_otl_conform_attributes: bool, warn_for_non_otl_conform_attributes: bool,
+        contains_exactly_one_type: bool, model_directory: Optional[Path]) -> Generator[OTLObject, None, None]:
+        """Reads the file in blocks of block_size bytes and yields the objects of each block before reading the next,
+        so the whole file is never in memory. Line errors are reported to on_line_error or raised at the end."""
+        block_size = int(kwargs.get('block_size', STREAM_BLOCK_SIZE))
+        batch_size = kwargs.get('batch_size', None)
+        on_line_error = kwargs.get('on_line_error', None)
+        lines_error = BadLinesInExcelError()
+        if on_line_error is None:
+            on_line_error = lines_error.add_exception
+        fallback_kwargs = dict(
+            filepath=filepath, delimiter=delimiter, quote_char=quote_char, model_directory=model_directory,
+            separator=separator, cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
+            cardinality_separator=cardinality_separator, cast_datetime=cast_datetime,
+            allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes, on_line_error=on_line_error)
+
+        if not contains_exactly_one_type:
+            try:
+                type_uris = cls._read_unique_typeuris(filepath, delimiter, quote_char)
+            except pa.lib.ArrowKeyError as e:
+                cls.check_for_type_uri_in_first_five_rows_using_csv(delimiter, e, filepath, quote_char)
+                raise
+            if len(type_uris) != 1:
+                yield from cls._iter_python_fallback_objects(skip_rows=0, **fallback_kwargs)
+                if lines_error.exceptions:
+                    raise lines_error
+                return
+
+        first_row, headers = cls._read_first_row_and_headers(filepath, delimiter, quote_char)
+        schema, headers_with_cardinality = cls._build_schema_for_headers(
+            type_uri=first_row['typeURI'], model_directory=model_directory, headers=headers, separator=separator, cardinality_indicator=cardinality_indicator,
+            waarde_shortcut=waarde_shortcut, allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes, filepath=filepath)
+        missing_columns = cls._compute_missing_columns(first_row['typeURI'], headers)
+
+        # the values are already parsed by pyarrow, prevent double casting downstream
+        convert_kwargs = {k: v for k, v in kwargs.items() if k not in {'on_line_error', 'additional_header_lines'}}
+        convert_kwargs.update(cast_list=False, cast_datetime=False)
+
+        reader = None
+        rows_done = 0
+        while True:
+            try:
+                # opening the reader already converts the first block
+                if reader is None:
+                    reader = cls._open_csv_reader_with_schema(filepath, delimiter, quote_char, schema,
+                                                              block_size=block_size)
+                batch = reader.read_next_batch()
+            except StopIteration:
+                break
+            except pa.lib.ArrowInvalid as e:
+                if 'CSV conversion error' not in str(e):
+                    raise
+                # continue with the Python CSV reader from the first row that was not converted yet
+                logging.debug(f'PyArrow parsing failed, falling back to Python CSV reader for {filepath.name}: {e}')
+                yield from cls._iter_python_fallback_objects(skip_rows=rows_done, **fallback_kwargs)
+                break
+
+            for start in range(0, batch.num_rows, batch_size or max(batch.num_rows, 1)):
+                table = pa.Table.from_batches([batch.slice(start, batch_size)])
+                table = cls._apply_cardinality_splitting(table, headers_with_cardinality, cardinality_separator)
+                table = cls._append_missing_columns_to_table(table, missing_columns)
+                yield from PyArrowConverter.iter_table_to_objects(
+                    table=table, on_line_error=on_line_error, additional_header_lines=rows_done, **convert_kwargs)
+                rows_done += table.num_rows
+
+        if lines_error.exceptions:
+            raise lines_error
+
+    @classmethod
+    def _iter_python_fallback_objects(
+        cls, filepath: Path, delimiter: str, quote_char: str, model_directory: Optional[Path], separator: str,
+        cardinality_indicator: str, waarde_shortcut: bool, cardinality_separator: str, cast_datetime: bool,
+        allow_non_otl_conform_attributes: bool, warn_for_non_otl_conform_attributes: bool,
+        on_line_error: Callable[[ErrorInExcelLine], None], skip_rows: int) -> Generator[OTLObject, None, None]:
+        """Streaming variant of _python_fallback_to_objects that skips the first skip_rows rows of data"""
+        with open(filepath, encoding='utf-8-sig') as file:
+            csv_reader = csv.reader(file, delimiter=delimiter, quotechar=quote_char)
+            if skip_rows:
+                csv_reader = cls._skip_csv_rows(csv_reader, skip_rows)
+            rows = cls._iter_python_rows(csv_reader=csv_reader, cardinality_indicator=cardinality_indicator,
+                                         cardinality_separator=cardinality_separator)
+            dicts = DotnotationTableConverter.iter_2d_sequence_to_dicts(
+                two_d_sequence=rows, empty_string_equals_none=True)
+            try:
+                yield from DotnotationTableConverter.iter_data_from_table(
+                    table_data=dicts, model_directory=model_directory,
+                    separator=separator, cardinality_indicator=cardinality_indicator,
+                    waarde_shortcut=waarde_shortcut, cardinality_separator=cardinality_separator,
+                    cast_datetime=cast_datetime, cast_list=True,
+                    allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                    warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
+                    additional_header_lines=skip_rows, on_line_error=on_line_error)
+            except TypeUriNotInFirstRowError as e:
+                raise TypeUriNotInFirstRowError(
+                    message=f'The typeURI is not in the first row in file {filepath.name}. Please remove the excess '
+                            f'rows', file_path=filepath) from e
+            except NoTypeUriInTableError as e:
+                raise NoTypeUriInTableError(
+                    message=f'Could not find typeURI within 5 rows in the csv file {filepath.name}',
+                    file_path=filepath) from e
+
+    @classmethod
+    def _skip_csv_rows(cls, csv_reader, skip_rows: int) -> Generator[list[str], None, None]:
+        """Yields the header row and the rows after the first skip_rows rows. Blank lines are not counted, like
+        pyarrow does."""
+        headers = next(csv_reader, None)
+        if headers is None:
+            return
+        yield headers
+        skipped = 0
+        for row in csv_reader:
+            if skipped < skip_rows:
+                if row:
+                    skipped += 1
+                continue
+            yield row
+
     @classmethod
     async def _convert_single_type_path_async(cls, filepath: Path, kwargs: dict[str, object], delimiter: str, quote_char: str,
         separator: str, cardinality_indicator: str, waarde_shortcut: bool, allow_non_otl_conform_attributes: bool,
@@ -218,10 +481,9 @@ class CsvImporter(AbstractImporter):
             kwargs['cast_datetime'] = False
 
         first_row, headers = cls._read_first_row_and_headers(filepath, delimiter, quote_char)
-        instance = dynamic_create_instance_from_uri(first_row['typeURI'], model_directory=model_directory)
-
         schema, headers_with_cardinality = cls._build_schema_for_headers(
-            instance=instance,
+            type_uri=first_row['typeURI'],
+            model_directory=model_directory,
             headers=headers,
             separator=separator,
             cardinality_indicator=cardinality_indicator,
@@ -273,16 +535,17 @@ class CsvImporter(AbstractImporter):
 
     @classmethod
     def _build_schema_for_headers(
-        cls, instance: OTLObject, headers: list[str], separator: str, cardinality_indicator: str,
-        waarde_shortcut: bool, allow_non_otl_conform_attributes: bool, warn_for_non_otl_conform_attributes: bool,
-        filepath: Path) -> tuple[pa.Schema, list[tuple[str, pa.DataType]]]:
+        cls, type_uri: str, model_directory: Optional[Path], headers: list[str], separator: str,
+        cardinality_indicator: str, waarde_shortcut: bool, allow_non_otl_conform_attributes: bool,
+        warn_for_non_otl_conform_attributes: bool, filepath: Path) -> tuple[pa.Schema, list[tuple[str, pa.DataType]]]:
+        model_index = ModelIndex.for_model_directory(model_directory)
         schema_list: list[tuple[str, pa.DataType]] = [('typeURI', pa.string())]
         headers_with_cardinality: list[tuple[str, pa.DataType]] = []
 
         for header in headers:
             try:
-                attribute = DotnotationHelper.get_attribute_by_dotnotation(
-                    instance, dotnotation=header, separator=separator,
+                attribute_info = model_index.get_attribute_info(
+                    type_uri, dotnotation=header, separator=separator,
                     cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut)
             except AttributeError as e:
                 if e.args and e.args[0] == "'NoneType' object has no attribute 'field'":
@@ -299,7 +562,7 @@ class CsvImporter(AbstractImporter):
                 logging.error(f'Error while processing header {header} in file {filepath.name}: {e}')
                 raise
 
-            nt = attribute.field.native_type
+            nt = attribute_info.native_type
             if cardinality_indicator in header:
                 schema_list.append((header, pa.string()))
                 if nt == str:
@@ -318,7 +581,7 @@ class CsvImporter(AbstractImporter):
                     headers_with_cardinality.append((header, pa.list_(pa.date32())))
                 else:
                     raise NotImplementedError(
-                        f'Unsupported native type for cardinality > 1: {nt} from {attribute.field.__class__.__name__} for header {header}'
+                        f'Unsupported native type for cardinality > 1: {nt} from {attribute_info.field_name} for header {header}'
                     )
             else:
                 if nt == str:
@@ -337,7 +600,7 @@ class CsvImporter(AbstractImporter):
                     schema_list.append((header, pa.date32()))
                 else:
                     raise NotImplementedError(
-                        f'Unsupported native type: {nt} from {attribute.field.__class__.__name__} for header {header}'
+                        f'Unsupported native type: {nt} from {attribute_info.field_name} for header {header}'
                     )
 
         return pa.schema(schema_list), headers_with_cardinality
@@ -353,19 +616,32 @@ class CsvImporter(AbstractImporter):
     @classmethod
     def _read_csv_table_with_schema(
         cls, filepath: Path, delimiter: str, quote_char: str, schema: pa.Schema) -> pa.Table:
-        include_columns = list(schema.names)  # projection pushdown
-        parse_options = ParseOptions(delimiter=delimiter, quote_char=quote_char)
+        parse_options, convert_options = cls._get_arrow_csv_options(delimiter, quote_char, schema)
+        table = read_csv(
+            filepath,
+            read_options=ReadOptions(use_threads=True, encoding='utf-8-sig', block_size=(8 << 20)),  # larger blocks for throughput
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+        # Fewer chunks -> faster downstream ops
+        return table.combine_chunks()
 
-        # Build timestamp_parsers for date/time fields to handle various formats
-        timestamp_parsers = {}
-        for field in schema:
-            if pa.types.is_string(field.type):
-                # Check if this might be a date/time field that we're reading as string
-                # We'll add common date formats for parsing
-                timestamp_parsers[field.name] = [
-                    pa.string(),  # Keep as string by default
-                ]
+    @classmethod
+    def _open_csv_reader_with_schema(cls, filepath: Path, delimiter: str, quote_char: str, schema: pa.Schema,
+                                     block_size: int) -> pa_csv.CSVStreamingReader:
+        parse_options, convert_options = cls._get_arrow_csv_options(delimiter, quote_char, schema)
+        return pa_csv.open_csv(
+            filepath,
+            read_options=ReadOptions(use_threads=True, encoding='utf-8-sig', block_size=block_size),
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
 
+    @classmethod
+    def _get_arrow_csv_options(cls, delimiter: str, quote_char: str, schema: pa.Schema
+                               ) -> tuple[ParseOptions, ConvertOptions]:
+        include_columns = list(schema.names)  # projection pushdown
+        parse_options = ParseOptions(delimiter=delimiter, quote_char=quote_char)
         convert_options = ConvertOptions(
             column_types=schema,
             include_columns=include_columns,
@@ -375,14 +651,7 @@ class CsvImporter(AbstractImporter):
             true_values=["true", "True", "1", "Y", "Yes"],
             false_values=["false", "False", "0", "N", "No"],
         )
-        table = read_csv(
-            filepath,
-            read_options=ReadOptions(use_threads=True, encoding='utf-8-sig', block_size=(8 << 20)),  # larger blocks for throughput
-            parse_options=parse_options,
-            convert_options=convert_options,
-        )
-        # Fewer chunks -> faster downstream ops
-        return table.combine_chunks()
+        return parse_options, convert_options
 
     @classmethod
     def _apply_cardinality_splitting(
@@ -407,15 +676,17 @@ class CsvImporter(AbstractImporter):
 
     @classmethod
     def _read_unique_typeuris(cls, filepath: Path, delimiter: str, quote_char: str) -> set[str]:
-        table_typeuri = pa_csv.read_csv(
+        # streamed per block so only the unique values are kept in memory
+        reader = pa_csv.open_csv(
             filepath,
             read_options=pa_csv.ReadOptions(encoding='utf-8-sig'),
             parse_options=pa_csv.ParseOptions(delimiter=delimiter, quote_char=quote_char),
-            convert_options=pa_csv.ConvertOptions(include_columns=['typeURI'])
+            convert_options=pa_csv.ConvertOptions(include_columns=['typeURI'], column_types={'typeURI': pa.string()})
         )
-        arr = table_typeuri["typeURI"].combine_chunks()
-        uniques = pc.unique(arr).to_pylist()
-        return {v for v in uniques if isinstance(v, str)}
+        type_uris = set()
+        for batch in reader:
+            type_uris.update(v for v in pc.unique(batch.column(0)).to_pylist() if isinstance(v, str))
+        return type_uris
 
     @classmethod
     def _python_fallback_to_objects(
@@ -426,37 +697,13 @@ class CsvImporter(AbstractImporter):
         try:
             with open(filepath, encoding='utf-8-sig') as file:
                 csv_reader = csv.reader(file, delimiter=delimiter, quotechar=quote_char)
-                headers = next(csv_reader)
-                data: list[list[object]] = [headers]
-
-                # Identify which columns are cardinality fields (have [] in the name)
-                cardinality_columns = {i: header for i, header in enumerate(headers) if cardinality_indicator in header}
-
-                for row in csv_reader:
-                    r: list[object] = []
-                    for col_idx, d in enumerate(row):
-                        if d is None or d == '':
-                            r.append(None)
-                        elif d == 'True':
-                            r.append(True)
-                        elif d == 'False':
-                            r.append(False)
-                        elif col_idx in cardinality_columns and d:
-                            # For cardinality fields, split by separator and create a list
-                            # If there's no separator, wrap the single value in a list
-                            if cardinality_separator in str(d):
-                                r.append(str(d).split(cardinality_separator))
-                            else:
-                                r.append([d])  # Wrap single value in list
-                        else:
-                            r.append(d)
-                    data.append(r)
-
-                list_of_dicts = DotnotationTableConverter.transform_2d_sequence_to_list_of_dicts(
-                    two_d_sequence=data, empty_string_equals_none=True)
+                rows = cls._iter_python_rows(csv_reader=csv_reader, cardinality_indicator=cardinality_indicator,
+                                             cardinality_separator=cardinality_separator)
+                dicts = DotnotationTableConverter.iter_2d_sequence_to_dicts(
+                    two_d_sequence=rows, empty_string_equals_none=True)
 
                 return DotnotationTableConverter.get_data_from_table(
-                    table_data=list_of_dicts, model_directory=model_directory,
+                    table_data=dicts, model_directory=model_directory,
                     separator=separator, cardinality_indicator=cardinality_indicator,
                     waarde_shortcut=waarde_shortcut, cardinality_separator=cardinality_separator,
                     cast_datetime=cast_datetime, cast_list=True,  # Force cast_list=True since we're converting to lists
@@ -473,6 +720,38 @@ class CsvImporter(AbstractImporter):
                 file_path=filepath,
             ) from e
 
+    @classmethod
+    def _iter_python_rows(cls, csv_reader, cardinality_indicator: str, cardinality_separator: str
+                          ) -> Generator[list[object], None, None]:
+        """Yields the header row of the csv reader and then each row with its values converted, one row at a time"""
+        headers = next(csv_reader, None)
+        if headers is None:
+            return
+        yield headers
+
+        # Identify which columns are cardinality fields (have [] in the name)
+        cardinality_columns = {i: header for i, header in enumerate(headers) if cardinality_indicator in header}
+
+        for row in csv_reader:
+            r: list[object] = []
+            for col_idx, d in enumerate(row):
+                if d is None or d == '':
+                    r.append(None)
+                elif d == 'True':
+                    r.append(True)
+                elif d == 'False':
+                    r.append(False)
+                elif col_idx in cardinality_columns and d:
+                    # For cardinality fields, split by separator and create a list
+                    # If there's no separator, wrap the single value in a list
+                    if cardinality_separator in str(d):
+                        r.append(str(d).split(cardinality_separator))
+                    else:
+                        r.append([d])  # Wrap single value in list
+                else:
+                    r.append(d)
+            yield r
+
     @classmethod
     async def _python_fallback_to_objects_async(
         cls, filepath: Path, delimiter: str, quote_char: str, model_directory: Optional[Path], separator: str,
@@ -482,32 +761,9 @@ class CsvImporter(AbstractImporter):
         try:
             with open(filepath, encoding='utf-8-sig') as file:
                 csv_reader = csv.reader(file, delimiter=delimiter, quotechar=quote_char)
-                headers = next(csv_reader)
-                data: list[list[object]] = [headers]
-
-                # Identify which columns are cardinality fields (have [] in the name)
-                cardinality_columns = {i: header for i, header in enumerate(headers) if cardinality_indicator in header}
-
-                for row in csv_reader:
-                    await sleep(0)
-                    r: list[object] = []
-                    for col_idx, d in enumerate(row):
-                        if d is None or d == '':
-                            r.append(None)
-                        elif d == 'True':
-                            r.append(True)
-                        elif d == 'False':
-                            r.append(False)
-                        elif col_idx in cardinality_columns and d:
-                            # For cardinality fields, split by separator and create a list
-                            # If there's no separator, wrap the single value in a list
-                            if cardinality_separator in str(d):
-                                r.append(str(d).split(cardinality_separator))
-                            else:
-                                r.append([d])  # Wrap single value in list
-                        else:
-                            r.append(d)
-                    data.append(r)
+                rows = cls._iter_python_rows(csv_reader=csv_reader, cardinality_indicator=cardinality_indicator,
+                                             cardinality_separator=cardinality_separator)
+                data = [row async for row in AsyncRunner.iterate(rows)]
 
                 list_of_dicts = await DotnotationTableConverter.transform_2d_sequence_to_list_of_dicts_async(
                     two_d_sequence=data, empty_string_equals_none=True)
@@ -520,8 +776,7 @@ class CsvImporter(AbstractImporter):
                     allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
                     warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
 
-                for obj in objects:
-                    await sleep(0)
+                async for obj in AsyncRunner.iterate(objects):
                     yield obj
         except TypeUriNotInFirstRowError as e:
             raise TypeUriNotInFirstRowError(
@@ -600,8 +855,7 @@ class CsvImporter(AbstractImporter):
                 warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
                 model_directory=model_directory,
                 cardinality_separator=cardinality_separator)
-            for obj in objects:
-                await sleep(0)
+            async for obj in AsyncRunner.iterate(objects):
                 yield obj
             return
 
@@ -623,9 +877,12 @@ class CsvImporter(AbstractImporter):
                 yield obj
             return
 
-        # Python fallback path
-        async for obj in cls._python_fallback_to_objects_async(
+        # Multi-type path, falls back to Python when pyarrow can not parse a value.
+        # The file is read and converted in the executor of the loop, so the loop is not blocked.
+        async for obj in AsyncRunner.iterate(await AsyncRunner.run(
+            cls._convert_multiple_types_path,
             filepath=filepath,
+            kwargs=kwargs,
             delimiter=delimiter,
             quote_char=quote_char,
             model_directory=model_directory,  # type: ignore[arg-type]
@@ -637,5 +894,5 @@ class CsvImporter(AbstractImporter):
             cast_list=cast_list,
             allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
             warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes
-        ):
+        )):
             yield obj
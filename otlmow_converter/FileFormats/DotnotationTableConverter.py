@@ -1,7 +1,10 @@
+import os
+import pickle
+import tempfile
 import warnings
-from asyncio import sleep
+from array import array
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Callable, Generator, Iterable, Optional
 
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
 from otlmow_model.OtlmowModel.Exceptions.CouldNotConvertToCorrectTypeError import CouldNotConvertToCorrectTypeError
@@ -9,6 +12,7 @@ from otlmow_model.OtlmowModel.Exceptions.CouldNotCreateInstanceError import Coul
 from otlmow_model.OtlmowModel.Exceptions.CouldNotCreateRelationError import CouldNotCreateRelationError
 from otlmow_model.OtlmowModel.Helpers.GenericHelper import get_shortened_uri
 
+from otlmow_converter.AsyncRunner import AsyncRunner
 from otlmow_converter.DotnotationDict import DotnotationDict
 from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
 from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
@@ -131,7 +135,7 @@ class DotnotationTableConverter:
         header_dict = {'typeURI': 0, identificator_key: 1, toegekend_door_key: 2}
         header_count = 3
 
-        for otl_object in list_of_objects:
+        async for otl_object in AsyncRunner.iterate(list_of_objects):
             if not hasattr(otl_object, 'typeURI'):
                 warnings.warn(BadTypeWarning(f'{otl_object} does not have a typeURI so this can not be instantiated. '
                                              f'Ignoring this object'))
@@ -144,7 +148,6 @@ class DotnotationTableConverter:
                 elif otl_object.assetId.identificator is None or otl_object.assetId.identificator == '':
                     raise ValueError(f'{otl_object} does not have a valid assetId.')
 
-            await sleep(0)
             data_dict = await DotnotationDictConverter.to_dict_async(
                 otl_object, separator=separator, cardinality_separator=cardinality_separator,
                 cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
@@ -247,7 +250,7 @@ class DotnotationTableConverter:
 
         master_dict = {}
 
-        for otl_object in sequence_of_objects:
+        async for otl_object in AsyncRunner.iterate(sequence_of_objects):
             if not hasattr(otl_object, 'typeURI'):
                 warnings.warn(BadTypeWarning(f'{otl_object} does not have a typeURI so this can not be instantiated. '
                                              f'Ignoring this object'))
@@ -274,7 +277,6 @@ class DotnotationTableConverter:
             header_dict = master_dict[short_uri][0]
             header_count = len(header_dict)
 
-            await sleep(0)
             data_dict = await DotnotationDictConverter.to_dict_async(
                 otl_object, separator=separator, cardinality_separator=cardinality_separator,
                 cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
@@ -296,7 +298,7 @@ class DotnotationTableConverter:
         return master_dict
 
     @classmethod
-    def get_data_from_table(cls, table_data: list[dict], model_directory: Path = None,
+    def get_data_from_table(cls, table_data: Iterable[dict], model_directory: Path = None,
                                   cast_list: bool = False, cast_datetime: bool = False,
                                   allow_non_otl_conform_attributes: bool = True,
                                   warn_for_non_otl_conform_attributes: bool = True,
@@ -309,7 +311,40 @@ class DotnotationTableConverter:
         """Returns a list of OTL objects from a list of dicts, where each dict is a row, and the first row is the
         header"""
         instances = []
-        headers, *rows = table_data
+        try:
+            instances.extend(cls.iter_data_from_table(
+                table_data=table_data, model_directory=model_directory, cast_list=cast_list,
+                cast_datetime=cast_datetime, separator=separator, cardinality_indicator=cardinality_indicator,
+                waarde_shortcut=waarde_shortcut, cardinality_separator=cardinality_separator,
+                allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
+                combine_errors=combine_errors, additional_header_lines=additional_header_lines))
+        except BadLinesInExcelError as lines_error:
+            lines_error.objects = instances
+            raise lines_error
+        return instances
+
+    @classmethod
+    def iter_data_from_table(cls, table_data: Iterable[dict], model_directory: Path = None,
+                             cast_list: bool = False, cast_datetime: bool = False,
+                             allow_non_otl_conform_attributes: bool = True,
+                             warn_for_non_otl_conform_attributes: bool = True,
+                             waarde_shortcut: bool = WAARDE_SHORTCUT,
+                             separator: str = SEPARATOR,
+                             cardinality_indicator: str = CARDINALITY_INDICATOR,
+                             cardinality_separator: str = CARDINALITY_SEPARATOR,
+                             combine_errors: bool = False, additional_header_lines: int = 0,
+                             on_line_error: Callable[[ErrorInExcelLine], None] = None,
+                             **kwargs) -> Generator[OTLObject, None, None]:
+        """Yields OTL objects from an iterable of dicts, where each dict is a row, and the first row is the header.
+        Rows are only consumed as the objects are requested. Errors in lines are passed to on_line_error when given,
+        otherwise they are raised together as a BadLinesInExcelError after the last object has been yielded.
+        The objects attribute of that error is left empty, as the objects were already yielded."""
+        rows = iter(table_data)
+        try:
+            headers = next(rows)
+        except StopIteration:
+            raise NoTypeUriInTableError from None
         if 'typeURI' not in headers:
             type_uri_in_first_rows = any('typeURI' in row.values() for row in rows)
             if not type_uri_in_first_rows:
@@ -327,19 +362,21 @@ class DotnotationTableConverter:
                     allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
                     warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
                     combine_errors=combine_errors)
-                instances.append(instance)
             except (ValueError, CouldNotConvertToCorrectTypeError, CouldNotCreateInstanceError,
                     CouldNotCreateRelationError, MultipleAttributeError) as e:
                 line_number = row_nr + 2 + additional_header_lines
                 line_error = ErrorInExcelLine(
                     message=f'Error creating instance from line {line_number}: {e}',
                     line_number=line_number, error = e)
-                lines_error.add_exception(line_error)
+                if on_line_error is not None:
+                    on_line_error(line_error)
+                else:
+                    lines_error.add_exception(line_error)
+                continue
+            yield instance
 
         if lines_error.exceptions:
-            lines_error.objects = instances
             raise lines_error
-        return instances
 
     @classmethod
     async def get_data_from_table_async(cls, table_data: list[dict], model_directory: Path = None,
@@ -363,7 +400,7 @@ class DotnotationTableConverter:
                 raise TypeUriNotInFirstRowError
         headers.pop('typeURI')
         lines_error = BadLinesInExcelError()
-        for row_nr, row in enumerate(rows):
+        async for row_nr, row in AsyncRunner.iterate(enumerate(rows)):
             try:
                 instance = await cls.create_instance_from_row_async(
                     row=row, model_directory=model_directory, cast_list=cast_list, cast_datetime=cast_datetime,
@@ -373,7 +410,6 @@ class DotnotationTableConverter:
                     warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
                     combine_errors=combine_errors)
                 instances.append(instance)
-                await sleep(0)
             except (ValueError, CouldNotConvertToCorrectTypeError, CouldNotCreateInstanceError,
                     CouldNotCreateRelationError, MultipleAttributeError) as e:
                 line_number = row_nr + 2 + additional_header_lines
@@ -381,7 +417,6 @@ class DotnotationTableConverter:
                     message=f'Error creating instance from line {line_number}: {e}',
                     line_number=line_number, error = e)
                 lines_error.add_exception(line_error)
-                await sleep(0)
 
         if lines_error.exceptions:
             lines_error.objects = instances
@@ -454,27 +489,41 @@ class DotnotationTableConverter:
 
         header_dict, *data_dicts = list_of_dicts
         sorted_headers = cls._sort_headers(header_dict, separator=separator)
-        await sleep(0)
-        matrix = []
-        for d in data_dicts:
-            row = []
-            for header in sorted_headers:
-                row.append(cls._get_item_from_dict(input_dict=d, item=header, empty_string_equals_none=empty_string_equals_none))
-                await sleep(0)
-            matrix.append(row)
-        matrix.insert(0, list(sorted_headers))
+        matrix = [list(sorted_headers)]
+        async for d in AsyncRunner.iterate(data_dicts):
+            matrix.append([cls._get_item_from_dict(input_dict=d, item=header,
+                                                   empty_string_equals_none=empty_string_equals_none)
+                           for header in sorted_headers])
         return matrix
 
     @classmethod
     def transform_2d_sequence_to_list_of_dicts(cls, two_d_sequence: list[list],
                                                      empty_string_equals_none: bool = False) -> list[dict]:
         """Returns a list of dicts from a 2d array, where each dict is a row, and the first row is the header"""
+        return list(cls.iter_2d_sequence_to_dicts(two_d_sequence=two_d_sequence,
+                                                  empty_string_equals_none=empty_string_equals_none))
+
+    @classmethod
+    def iter_2d_sequence_to_dicts(cls, two_d_sequence: Iterable[list], empty_string_equals_none: bool = False
+                                  ) -> Generator[dict, None, None]:
+        """Yields a dict per row of a 2d sequence, preceded by the header dict (header to column index).
+        Rows are read lazily so this can be chained with iter_data_from_table."""
         # TODO also try this with numpy arrays to see what is faster
-        header_row, *data_rows = two_d_sequence
+        rows = iter(two_d_sequence)
+        header_row = next(rows, None)
+        if header_row is None:
+            raise ValueError('The 2d sequence does not contain a header row')
         header_dict = {header: index for index, header in enumerate(header_row)}
-
-        list_of_dicts = [header_dict]
-        for row in data_rows:
+        header_count = len(header_row)
+        yield dict(header_dict)
+
+        for row in rows:
+            if len(row) > header_count:
+                # rows of sheets read without their dimension can be longer than the header row
+                for index in range(header_count, len(row)):
+                    value = row[index]
+                    if value is not None and not (empty_string_equals_none and value == ''):
+                        raise MissingHeaderError(f'Header is None at column {index+1}')
             data_dict = {}
             for header, index in header_dict.items():
                 value = row[index]
@@ -491,43 +540,120 @@ class DotnotationTableConverter:
                 data_dict[str(header)] = value
             if not data_dict:
                 continue
-            list_of_dicts.append(data_dict)
-
-        return list_of_dicts
+            yield data_dict
 
     @classmethod
     async def transform_2d_sequence_to_list_of_dicts_async(cls, two_d_sequence: list[list],
                                                      empty_string_equals_none: bool = False) -> list[dict]:
         """Returns a list of dicts from a 2d array, where each dict is a row, and the first row is the header"""
-        # TODO also try this with numpy arrays to see what is faster
-        header_row, *data_rows = two_d_sequence
-        header_dict = {header: index for index, header in enumerate(header_row)}
-
-        list_of_dicts = [header_dict]
-        for row in data_rows:
-            data_dict = {}
-            for header, index in header_dict.items():
-                value = row[index]
-                if value is None:
-                    continue
-                if header is None:
-                    raise MissingHeaderError(f'Header is None at column {index + 1}')
-                if empty_string_equals_none and value == '':
-                    continue
-                if value == 'true':
-                    value = True
-                if value == 'false':
-                    value = False
-                data_dict[str(header)] = value
-            if not data_dict:
-                continue
-            list_of_dicts.append(data_dict)
-            await sleep(0)
-
-        return list_of_dicts
+        return [d async for d in AsyncRunner.iterate(cls.iter_2d_sequence_to_dicts(
+            two_d_sequence=two_d_sequence, empty_string_equals_none=empty_string_equals_none))]
 
     @classmethod
     def _get_item_from_dict(cls, input_dict: dict, item: str, empty_string_equals_none: bool) -> object:
         value = input_dict.get(item)
         return '' if empty_string_equals_none and value is None else value
 
+
+class TablesPerTypeBuilder:
+    """Collects the dotnotation values of OTL objects in a table per type, converting each object once.
+    The headers of a type are only known after its last object, so the tables are given when all objects are added
+    (see iter_tables). Until then the values of each row are kept in a temporary file, only the headers and the
+    position of each row in the file are kept in memory. The headers and rows are the same as
+    transform_list_of_dicts_to_2d_sequence gives for get_tables_per_type_from_data."""
+
+    def __init__(self, values_as_string: bool = False, empty_string_equals_none: bool = False,
+                 separator: str = SEPARATOR, cardinality_separator: str = CARDINALITY_SEPARATOR,
+                 cardinality_indicator: str = CARDINALITY_INDICATOR, waarde_shortcut: bool = WAARDE_SHORTCUT,
+                 cast_list: bool = False, cast_datetime: bool = False,
+                 allow_non_otl_conform_attributes: bool = True, warn_for_non_otl_conform_attributes: bool = True,
+                 allow_empty_asset_id: bool = True):
+        self.values_as_string = values_as_string
+        self.empty_value = '' if empty_string_equals_none else None
+        self.separator = separator
+        self.allow_empty_asset_id = allow_empty_asset_id
+        self._item_kwargs = dict(
+            waarde_shortcut=waarde_shortcut, separator=separator, cardinality_indicator=cardinality_indicator,
+            cardinality_separator=cardinality_separator, cast_list=cast_list, cast_datetime=cast_datetime,
+            allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+        self._headers_per_type: dict[str, dict[str, None]] = {}
+        self._offsets_per_type: dict[str, array] = {}
+        self._spill_file: Optional[BinaryIO] = None
+
+    def __enter__(self) -> 'TablesPerTypeBuilder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def add(self, otl_object: OTLObject) -> None:
+        """Adds the values of an object to the table of its type. Objects without a typeURI are skipped with a
+        warning. If the object can not be converted, the tables are left as they were."""
+        short_uri = self._get_short_uri_of_object(otl_object)
+        if short_uri is None:
+            return
+        values = {}
+        for key, value in DotnotationDictConverter.iter_items(otl_object, **self._item_kwargs):
+            if value is None:
+                value = 'None' if self.values_as_string else None
+            elif self.values_as_string and not isinstance(value, str):
+                value = str(value)
+            values[key] = value
+
+        headers = self._headers_per_type.get(short_uri)
+        if headers is None:
+            headers = self._headers_per_type[short_uri] = {}
+            self._offsets_per_type[short_uri] = array('q')
+        headers.update(dict.fromkeys(values))
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile()
+        self._spill_file.seek(0, os.SEEK_END)
+        self._offsets_per_type[short_uri].append(self._spill_file.tell())
+        pickle.dump(values, self._spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def iter_tables(self) -> Generator[tuple[str, list[str], Generator[list, None, None]], None, None]:
+        """Yields the shortened typeURI, the sorted headers and a generator of the rows of each type, in the order
+        the types were first added. The rows are read back from the temporary file one at a time."""
+        for short_uri, header_keys in self._headers_per_type.items():
+            header_dict = self._get_initial_header_dict(short_uri)
+            header_dict.update(header_keys)
+            headers = DotnotationTableConverter._sort_headers(header_dict, separator=self.separator)
+            yield short_uri, headers, self._iter_rows(self._offsets_per_type[short_uri], headers)
+
+    def _iter_rows(self, offsets: array, headers: list[str]) -> Generator[list, None, None]:
+        empty_value = self.empty_value
+        spill_file = self._spill_file
+        for offset in offsets:
+            spill_file.seek(offset)
+            values = pickle.load(spill_file)
+            yield [empty_value if (value := values.get(header)) is None else value for header in headers]
+
+    def _get_short_uri_of_object(self, otl_object: OTLObject) -> Optional[str]:
+        if not hasattr(otl_object, 'typeURI'):
+            warnings.warn(BadTypeWarning(f'{otl_object} does not have a typeURI so this can not be instantiated. '
+                                         f'Ignoring this object'))
+            return None
+
+        if not self.allow_empty_asset_id:
+            if otl_object.typeURI == 'http://purl.org/dc/terms/Agent':
+                if otl_object.agentId.identificator is None or otl_object.agentId.identificator == '':
+                    raise ValueError(f'{otl_object} does not have a valid agentId.')
+            elif otl_object.assetId.identificator is None or otl_object.assetId.identificator == '':
+                raise ValueError(f'{otl_object} does not have a valid assetId.')
+
+        if otl_object.typeURI == 'http://purl.org/dc/terms/Agent':
+            return 'Agent'
+        return get_shortened_uri(otl_object.typeURI)
+
+    def _get_initial_header_dict(self, short_uri: str) -> dict:
+        if short_uri == 'Agent':
+            return {'typeURI': 0, 'agentId.identificator'.replace('.', self.separator): 1,
+                    'agentId.toegekendDoor'.replace('.', self.separator): 2}
+        return {'typeURI': 0, 'assetId.identificator'.replace('.', self.separator): 1,
+                'assetId.toegekendDoor'.replace('.', self.separator): 2}
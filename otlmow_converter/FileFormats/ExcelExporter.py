@@ -1,10 +1,11 @@
 from asyncio import sleep
 from pathlib import Path
-from typing import List, Iterable
+from typing import Iterable, List
 from openpyxl import Workbook
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
 from otlmow_converter.AbstractExporter import AbstractExporter
-from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
+from otlmow_converter.AsyncRunner import AsyncRunner
+from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter, TablesPerTypeBuilder
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 
 load_settings()
@@ -24,84 +25,73 @@ ABBREVIATE_EXCEL_SHEETTITLES = False
 class ExcelExporter(AbstractExporter):
     @classmethod
     def from_objects(cls, sequence_of_objects: Iterable[OTLObject], filepath: Path, **kwargs) -> tuple[Path]:
-        cardinality_separator = kwargs.get('cardinality_separator', CARDINALITY_SEPARATOR)
-        cardinality_indicator = kwargs.get('cardinality_indicator', CARDINALITY_INDICATOR)
-        waarde_shortcut = kwargs.get('waarde_shortcut', WAARDE_SHORTCUT)
-        list_as_string = kwargs.get('cast_list', LIST_AS_STRING)
-        datetime_as_string = kwargs.get('cast_datetime', DATETIME_AS_STRING)
-        allow_non_otl_conform_attributes = kwargs.get('allow_non_otl_conform_attributes',
-                                                        ALLOW_NON_OTL_CONFORM_ATTRIBUTES)
-        warn_for_non_otl_conform_attributes = kwargs.get('warn_for_non_otl_conform_attributes',
-                                                            WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES)
-        abbreviate_excel_sheettitles = kwargs.get('abbreviate_excel_sheettitles',
-                                                         ABBREVIATE_EXCEL_SHEETTITLES)
-
-        table_dict = DotnotationTableConverter.get_tables_per_type_from_data(
-            cardinality_separator=cardinality_separator, cardinality_indicator=cardinality_indicator,
-            waarde_shortcut=waarde_shortcut, cast_list=list_as_string, cast_datetime=datetime_as_string,
-            allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
-            sequence_of_objects=sequence_of_objects, values_as_string=True)
-
-        wb = Workbook()
         if not sequence_of_objects:
             raise ValueError('There are no asset data to export to Excel')
-
-        created_a_sheet = False
-        for class_name in table_dict:
-            created_a_sheet = cls.create_sheet_by_name(
-                wb=wb, class_name=class_name, table_data=table_dict[class_name],
-                abbreviate_excel_sheettitles=abbreviate_excel_sheettitles) or created_a_sheet
-
-        if created_a_sheet:
-            del wb['Sheet']
-
-        wb.save(filepath)
-
-        filepath.touch()
-        return (filepath,)
+        with cls._create_builder(**kwargs) as builder:
+            for otl_object in sequence_of_objects:
+                builder.add(otl_object)
+            return cls._write_workbook(builder=builder, filepath=filepath, **kwargs)
 
     @classmethod
     async def from_objects_async(cls, sequence_of_objects: Iterable[OTLObject], filepath: Path, **kwargs) -> tuple[Path]:
-        cardinality_separator = kwargs.get('cardinality_separator', CARDINALITY_SEPARATOR)
-        cardinality_indicator = kwargs.get('cardinality_indicator', CARDINALITY_INDICATOR)
-        waarde_shortcut = kwargs.get('waarde_shortcut', WAARDE_SHORTCUT)
-        list_as_string = kwargs.get('cast_list', LIST_AS_STRING)
-        datetime_as_string = kwargs.get('cast_datetime', DATETIME_AS_STRING)
-        allow_non_otl_conform_attributes = kwargs.get('allow_non_otl_conform_attributes',
-                                                        ALLOW_NON_OTL_CONFORM_ATTRIBUTES)
-        warn_for_non_otl_conform_attributes = kwargs.get('warn_for_non_otl_conform_attributes',
-                                                            WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES)
-        abbreviate_excel_sheettitles = kwargs.get('abbreviate_excel_sheettitles',
-                                                         ABBREVIATE_EXCEL_SHEETTITLES)
-
-        table_dict = await DotnotationTableConverter.get_tables_per_type_from_data_async(
-            cardinality_separator=cardinality_separator, cardinality_indicator=cardinality_indicator,
-            waarde_shortcut=waarde_shortcut, cast_list=list_as_string, cast_datetime=datetime_as_string,
-            allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
-            sequence_of_objects=sequence_of_objects, values_as_string=True)
-
-        wb = Workbook()
         if not sequence_of_objects:
             raise ValueError('There are no asset data to export to Excel')
-
-        created_a_sheet = False
-        for class_name in table_dict:
-            created_a_sheet = await cls.create_sheet_by_name_async(
-                wb=wb, class_name=class_name, table_data=table_dict[class_name],
-                abbreviate_excel_sheettitles=abbreviate_excel_sheettitles) or created_a_sheet
+        with cls._create_builder(**kwargs) as builder:
+            async for otl_object in AsyncRunner.iterate(sequence_of_objects):
+                builder.add(otl_object)
             await sleep(0)
+            return cls._write_workbook(builder=builder, filepath=filepath, **kwargs)
 
-        if created_a_sheet:
-            del wb['Sheet']
+    @classmethod
+    def _create_builder(cls, **kwargs) -> TablesPerTypeBuilder:
+        """The objects are converted once, the rows are kept in a temporary file until the headers of all types are
+        known, as a write-only sheet gets its header row first."""
+        return TablesPerTypeBuilder(
+            values_as_string=True, empty_string_equals_none=True,
+            cardinality_separator=kwargs.get('cardinality_separator', CARDINALITY_SEPARATOR),
+            cardinality_indicator=kwargs.get('cardinality_indicator', CARDINALITY_INDICATOR),
+            waarde_shortcut=kwargs.get('waarde_shortcut', WAARDE_SHORTCUT),
+            cast_list=kwargs.get('cast_list', LIST_AS_STRING),
+            cast_datetime=kwargs.get('cast_datetime', DATETIME_AS_STRING),
+            allow_non_otl_conform_attributes=kwargs.get('allow_non_otl_conform_attributes',
+                                                        ALLOW_NON_OTL_CONFORM_ATTRIBUTES),
+            warn_for_non_otl_conform_attributes=kwargs.get('warn_for_non_otl_conform_attributes',
+                                                           WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES))
+
+    @classmethod
+    def _write_workbook(cls, builder: TablesPerTypeBuilder, filepath: Path, **kwargs) -> tuple[Path]:
+        """Writes a write-only sheet per type, with the header row first. The workbook keeps an empty sheet if there
+        are no types."""
+        abbreviate_excel_sheettitles = kwargs.get('abbreviate_excel_sheettitles', ABBREVIATE_EXCEL_SHEETTITLES)
+        wb = Workbook(write_only=True)
+        has_sheets = False
+        for class_name, headers, rows in builder.iter_tables():
+            sheet = wb.create_sheet(cls._get_sheet_title(class_name, abbreviate_excel_sheettitles))
+            # the sheet format is written with the first row, so it is set before any row is appended
+            sheet.sheet_format.defaultColWidth = 20
+            sheet.append(headers)
+            for row in rows:
+                sheet.append(row)
+            has_sheets = True
+        if not has_sheets:
+            wb.create_sheet('Sheet')
 
-        await sleep(0)
         wb.save(filepath)
 
         filepath.touch()
         return (filepath,)
 
+    @classmethod
+    def _get_sheet_title(cls, class_name: str, abbreviate_excel_sheettitles: bool) -> str:
+        if not abbreviate_excel_sheettitles:
+            return class_name
+        # abbreviates the class_name so it doesn't exceed the 31 character limit of sheet titles in excel
+        split_name = class_name.split("#")
+        namespace_name = split_name[0]
+        subclass_name = split_name[1]
+        class_name = f"{namespace_name[:3]}#{subclass_name}"
+        return class_name[:31]
+
     @classmethod
     def create_sheet_by_name(cls, wb: Workbook, class_name: str, table_data: List[dict],
                                    abbreviate_excel_sheettitles: bool = False, separator: str = SEPARATOR) -> bool:
@@ -111,15 +101,7 @@ class ExcelExporter(AbstractExporter):
         data = DotnotationTableConverter.transform_list_of_dicts_to_2d_sequence(
             list_of_dicts=table_data, empty_string_equals_none=True, separator=separator)
 
-        if abbreviate_excel_sheettitles:
-            # abbreviates the class_name so it doesn't exceed the 31 character limit of sheet titles in excel
-            split_name = class_name.split("#")
-            namespace_name = split_name[0]
-            subclass_name = split_name[1]
-            class_name = f"{namespace_name[:3]}#{subclass_name}"
-            class_name = class_name[:31]
-
-        sheet = wb.create_sheet(class_name)
+        sheet = wb.create_sheet(cls._get_sheet_title(class_name, abbreviate_excel_sheettitles))
         for row in data:
             sheet.append(row)
 
@@ -135,18 +117,9 @@ class ExcelExporter(AbstractExporter):
         data = await DotnotationTableConverter.transform_list_of_dicts_to_2d_sequence_async(
             list_of_dicts=table_data, empty_string_equals_none=True, separator=separator)
 
-        if abbreviate_excel_sheettitles:
-            # abbreviates the class_name so it doesn't exceed the 31 character limit of sheet titles in excel
-            split_name = class_name.split("#")
-            namespace_name = split_name[0]
-            subclass_name = split_name[1]
-            class_name = f"{namespace_name[:3]}#{subclass_name}"
-            class_name = class_name[:31]
-
-        sheet = wb.create_sheet(class_name)
-        for row in data:
+        sheet = wb.create_sheet(cls._get_sheet_title(class_name, abbreviate_excel_sheettitles))
+        async for row in AsyncRunner.iterate(data):
             sheet.append(row)
-            await sleep(0)
 
         sheet.sheet_format.defaultColWidth = 20
         return True
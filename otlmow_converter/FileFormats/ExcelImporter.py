@@ -4,12 +4,15 @@ import sys
 import traceback
 import warnings
 from asyncio import sleep
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
+from typing import Generator, Iterable, Optional
+
 import openpyxl
-from otlmow_model.OtlmowModel.BaseClasses.OTLObject import dynamic_create_instance_from_uri
 from otlmow_model.OtlmowModel.Exceptions.NonStandardAttributeWarning import NonStandardAttributeWarning
 from otlmow_converter.AbstractImporter import AbstractImporter
-from otlmow_converter.DotnotationHelper import DotnotationHelper
+from otlmow_converter.AsyncRunner import AsyncRunner
 from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
 from otlmow_converter.Exceptions.DotnotationListOfListError import DotnotationListOfListError
 from otlmow_converter.Exceptions.ExceptionsGroup import ExceptionsGroup
@@ -20,6 +23,10 @@ from otlmow_converter.Exceptions.NoTypeUriInTableError import NoTypeUriInTableEr
 from otlmow_converter.Exceptions.TypeUriNotInFirstRowError import TypeUriNotInFirstRowError
 from otlmow_converter.Exceptions.UnknownExcelError import UnknownExcelError
 from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
+from otlmow_converter.FileFormats.PyArrowConverter import WORKER_BATCH_SIZE
+from otlmow_converter.FileFormats.XlsxSheetReader import XlsxSheetReader
+from otlmow_converter.ModelIndex import ModelIndex
+from otlmow_converter.ObjectPayloadConverter import ObjectPayloadConverter
 from otlmow_converter.SettingsManager import GlobalVariables, load_settings
 
 load_settings()
@@ -34,6 +41,7 @@ CAST_LIST = xlsx_settings['cast_list']
 CAST_DATETIME = xlsx_settings['cast_datetime']
 ALLOW_NON_OTL_CONFORM_ATTRIBUTES = xlsx_settings['allow_non_otl_conform_attributes']
 WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES = xlsx_settings['warn_for_non_otl_conform_attributes']
+BOOLEAN_STRINGS = frozenset({'True', 'TRUE', 'False', 'FALSE'})
 
 
 class ExcelImporter(AbstractImporter):
@@ -52,75 +60,157 @@ class ExcelImporter(AbstractImporter):
                                                       ALLOW_NON_OTL_CONFORM_ATTRIBUTES)
         warn_for_non_otl_conform_attributes = kwargs.get('warn_for_non_otl_conform_attributes',
                                                          WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES)
+        use_lxml = kwargs.get('use_lxml', False)
 
         model_directory = None
         if kwargs is not None and 'model_directory' in kwargs:
             model_directory = kwargs['model_directory']
 
-        data = cls.get_data_dict_from_file_path(filepath=filepath)
+        if kwargs.get('stream', False):
+            return cls._iter_objects_streaming(
+                filepath=filepath, model_directory=model_directory, separator=separator,
+                cardinality_indicator=cardinality_indicator, cardinality_separator=cardinality_separator,
+                waarde_shortcut=waarde_shortcut, cast_list=cast_list, cast_datetime=cast_datetime,
+                allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes, use_lxml=use_lxml)
+
+        data = cls.get_data_dict_from_file_path(filepath=filepath, use_lxml=use_lxml)
+
+        options = dict(separator=separator, cardinality_indicator=cardinality_indicator,
+                       waarde_shortcut=waarde_shortcut, cardinality_separator=cardinality_separator,
+                       cast_datetime=cast_datetime, cast_list=cast_list,
+                       allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                       warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes, combine_errors=True)
+        workers = ObjectPayloadConverter.get_process_count(kwargs.get('workers'))
+        worker_batch_size = kwargs.get('worker_batch_size', WORKER_BATCH_SIZE)
+        # a workbook of at most one batch is converted here, starting the processes would only add time
+        if workers > 1 and sum(map(len, data.values())) > worker_batch_size:
+            return cls._to_objects_in_processes(
+                filepath=filepath, data=data, model_directory=model_directory, options=options, workers=workers,
+                worker_batch_size=worker_batch_size)
 
         list_of_objects = []
         exception_group = ExceptionsGroup(message=f'Failed to create objects from Excel file {filepath}')
         for sheet, sheet_data in data.items():
             try:
-                if len(sheet_data) == 0:
-                    if sheet_data == []:
-                        continue
-                    raise NoTypeUriInExcelTabError(
-                        message=f'Could not find typeURI within 5 rows in Excel tab {sheet} in file {filepath.name}',
-                        file_path=filepath, tab=sheet)
-                if len(sheet_data) == 1:
-                    # means there is a header but no data
+                sheet_dicts = cls._get_sheet_dicts(filepath=filepath, sheet=sheet, sheet_data=sheet_data,
+                                                   model_directory=model_directory, options=options)
+                if sheet_dicts is None:
                     continue
-                headers = sheet_data[0]
-                type_uri_index = cls.get_index_of_typeURI_column_in_sheet(
-                    filepath=filepath, sheet=sheet, headers=headers, data=sheet_data)
-                cls.check_headers(headers=headers, sheet=sheet, filepath=filepath,
-                                  type_uri=sheet_data[1][type_uri_index], model_directory=model_directory,
-                                  cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
-                                  separator=separator,
-                                  allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-                                  warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-
-                list_of_dicts = DotnotationTableConverter.transform_2d_sequence_to_list_of_dicts(
-                    two_d_sequence=sheet_data, empty_string_equals_none=True)
+                dicts, type_uri_index = sheet_dicts
                 list_of_objects.extend(DotnotationTableConverter.get_data_from_table(
-                    table_data=list_of_dicts, model_directory=model_directory,
-                    separator=separator, cardinality_indicator=cardinality_indicator,
-                    waarde_shortcut=waarde_shortcut, cardinality_separator=cardinality_separator,
-                    cast_datetime=cast_datetime, cast_list=cast_list,
-                    allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-                    warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes, combine_errors=True,
-                    additional_header_lines=type_uri_index))
-            except TypeUriNotInFirstRowError:
-                exception_group.add_exception(TypeUriNotInFirstRowError(
-                    message=f'The typeURI is not in the first row in file {filepath.name}.'
-                            f' Please remove the excess rows',
-                    file_path=filepath, tab=sheet
-                ))
-            except NoTypeUriInTableError:
-                if sheet.title() == 'Keuzelijsten':
-                    continue
-                exception_group.add_exception(NoTypeUriInExcelTabError(
-                    message=f'Could not find typeURI within 5 rows in the file {filepath.name} in sheet {sheet}',
-                    file_path=filepath, tab=sheet
-                ))
-            except MissingHeaderError as ex:
-                exception_group.add_exception(MissingHeaderError(
-                    message=f'{ex.args[0]} in file {filepath.name}',
-                    file_path=filepath, tab=sheet
-                ))
-            except BadLinesInExcelError as ex:
-                ex.tab = sheet
-                ex.file_path = filepath
-                exception_group.add_exception(ex)
-                list_of_objects.extend(ex.objects)
+                    table_data=dicts, model_directory=model_directory, additional_header_lines=type_uri_index,
+                    **options))
             except BaseException as ex:
-                exc_type, exc_value, exc_tb = sys.exc_info()
-                tb = "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
-                logging.error("error caught!")
-                logging.error("error message: \n: " + tb)
-                exception_group.add_exception(UnknownExcelError(original_exception=ex, tab=sheet))
+                cls._add_sheet_exception(exception_group=exception_group, exception=ex, sheet=sheet,
+                                         filepath=filepath, list_of_objects=list_of_objects)
+
+        if len(exception_group.exceptions) > 0:
+            exception_group.objects = list_of_objects
+            raise exception_group
+
+        return list_of_objects
+
+    @classmethod
+    def _get_sheet_dicts(cls, filepath: Path, sheet: str, sheet_data: list[list], model_directory: Path,
+                         options: dict) -> Optional[tuple[Iterable[dict], int]]:
+        """Checks the headers of a sheet and returns the rows of the sheet as dicts, preceded by the header dict,
+        with the number of rows above the headers. Returns None for sheets without data."""
+        if len(sheet_data) == 0:
+            if sheet_data == []:
+                return None
+            raise NoTypeUriInExcelTabError(
+                message=f'Could not find typeURI within 5 rows in Excel tab {sheet} in file {filepath.name}',
+                file_path=filepath, tab=sheet)
+        if len(sheet_data) == 1:
+            # means there is a header but no data
+            return None
+        headers = sheet_data[0]
+        type_uri_index = cls.get_index_of_typeURI_column_in_sheet(
+            filepath=filepath, sheet=sheet, headers=headers, data=sheet_data)
+        cls.check_headers(headers=headers, sheet=sheet, filepath=filepath,
+                          type_uri=sheet_data[1][type_uri_index], model_directory=model_directory,
+                          cardinality_indicator=options['cardinality_indicator'],
+                          waarde_shortcut=options['waarde_shortcut'], separator=options['separator'],
+                          allow_non_otl_conform_attributes=options['allow_non_otl_conform_attributes'],
+                          warn_for_non_otl_conform_attributes=options['warn_for_non_otl_conform_attributes'])
+
+        dicts = DotnotationTableConverter.iter_2d_sequence_to_dicts(
+            two_d_sequence=sheet_data, empty_string_equals_none=True)
+        return dicts, type_uri_index
+
+    @classmethod
+    def _add_sheet_exception(cls, exception_group: ExceptionsGroup, exception: BaseException, sheet: str,
+                             filepath: Path, list_of_objects: list) -> None:
+        if isinstance(exception, TypeUriNotInFirstRowError):
+            exception_group.add_exception(TypeUriNotInFirstRowError(
+                message=f'The typeURI is not in the first row in file {filepath.name}.'
+                        f' Please remove the excess rows',
+                file_path=filepath, tab=sheet
+            ))
+        elif isinstance(exception, NoTypeUriInTableError):
+            if sheet.title() == 'Keuzelijsten':
+                return
+            exception_group.add_exception(NoTypeUriInExcelTabError(
+                message=f'Could not find typeURI within 5 rows in the file {filepath.name} in sheet {sheet}',
+                file_path=filepath, tab=sheet
+            ))
+        elif isinstance(exception, MissingHeaderError):
+            exception_group.add_exception(MissingHeaderError(
+                message=f'{exception.args[0]} in file {filepath.name}',
+                file_path=filepath, tab=sheet
+            ))
+        elif isinstance(exception, BadLinesInExcelError):
+            exception.tab = sheet
+            exception.file_path = filepath
+            exception_group.add_exception(exception)
+            if exception.objects is not None:
+                list_of_objects.extend(exception.objects)
+        else:
+            tb = "".join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+            logging.error("error caught!")
+            logging.error("error message: \n: " + tb)
+            exception_group.add_exception(UnknownExcelError(original_exception=exception, tab=sheet))
+
+    @classmethod
+    def _to_objects_in_processes(cls, filepath: Path, data: dict[str, list[list]], model_directory: Path,
+                                 options: dict, workers: int, worker_batch_size: int) -> list:
+        """Converts the rows of the sheets in a process pool, in chunks of worker_batch_size rows, so the sheets of
+        a multi-type workbook are converted at the same time. The headers are checked in this process and the
+        objects and errors are gathered in the order of the sheets and rows, like the serial conversion does.
+        The objects are created again in this process from the payloads of the workers, which is about half the work
+        of a row, so the speedup is at most about 2x."""
+        list_of_objects = []
+        exception_group = ExceptionsGroup(message=f'Failed to create objects from Excel file {filepath}')
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            sheet_jobs = []
+            for sheet, sheet_data in data.items():
+                try:
+                    sheet_dicts = cls._get_sheet_dicts(filepath=filepath, sheet=sheet, sheet_data=sheet_data,
+                                                       model_directory=model_directory, options=options)
+                    if sheet_dicts is None:
+                        continue
+                    dicts, type_uri_index = sheet_dicts
+                    header, *rows = dicts
+                except BaseException as ex:
+                    sheet_jobs.append((sheet, ex, None))
+                    continue
+                chunks = [(offset, rows[offset:offset + worker_batch_size])
+                          for offset in range(0, len(rows), worker_batch_size)]
+                futures = [executor.submit(cls._convert_rows_to_payloads, header, chunk, model_directory, options)
+                           for _, chunk in chunks]
+                sheet_jobs.append((sheet, None, (header, type_uri_index, chunks, futures)))
+
+            for sheet, exception, job in sheet_jobs:
+                if exception is None:
+                    try:
+                        list_of_objects.extend(cls._get_objects_from_sheet_job(
+                            *job, model_directory=model_directory, options=options))
+                        continue
+                    except BaseException as ex:
+                        exception = ex
+                cls._add_sheet_exception(exception_group=exception_group, exception=exception, sheet=sheet,
+                                         filepath=filepath, list_of_objects=list_of_objects)
 
         if len(exception_group.exceptions) > 0:
             exception_group.objects = list_of_objects
@@ -128,6 +218,86 @@ class ExcelImporter(AbstractImporter):
 
         return list_of_objects
 
+    @classmethod
+    def _get_objects_from_sheet_job(cls, header: dict, type_uri_index: int, chunks: list[tuple[int, list[dict]]],
+                                    futures: list, model_directory: Path, options: dict) -> list:
+        objects = []
+        lines_error = BadLinesInExcelError()
+        types_by_uri = {}
+        for (offset, chunk), future in zip(chunks, futures):
+            objects.extend(ObjectPayloadConverter.iter_objects_from_payloads(
+                future.result(), model_directory=model_directory, types_by_uri=types_by_uri,
+                convert_row_again=lambda row_nr: DotnotationTableConverter.iter_data_from_table(
+                    table_data=[dict(header), chunk[row_nr]], model_directory=model_directory,
+                    additional_header_lines=type_uri_index + offset + row_nr,
+                    on_line_error=lines_error.add_exception, **options)))
+
+        if lines_error.exceptions:
+            lines_error.objects = objects
+            raise lines_error
+        return objects
+
+    @classmethod
+    def _convert_rows_to_payloads(cls, header: dict, rows: list[dict], model_directory: Path,
+                                  options: dict) -> tuple[list, list]:
+        """Runs in a worker process, see ObjectPayloadConverter.convert_to_payloads."""
+        return ObjectPayloadConverter.convert_to_payloads(
+            lambda on_line_error: DotnotationTableConverter.iter_data_from_table(
+                table_data=[dict(header)] + rows, model_directory=model_directory, on_line_error=on_line_error,
+                **options),
+            row_count=len(rows))
+
+    @classmethod
+    def _iter_objects_streaming(cls, filepath: Path, model_directory: Path, separator: str,
+                                cardinality_indicator: str, cardinality_separator: str, waarde_shortcut: bool,
+                                cast_list: bool, cast_datetime: bool, allow_non_otl_conform_attributes: bool,
+                                warn_for_non_otl_conform_attributes: bool, use_lxml: bool = False) -> Generator:
+        """Reads the workbook in read-only mode and yields the objects one sheet at a time, reading the rows of a
+        sheet only as the objects are requested. Errors are raised together as an ExceptionsGroup after the last
+        object has been yielded. The objects attribute of that error is left empty, as the objects were already
+        yielded."""
+        exception_group = ExceptionsGroup(message=f'Failed to create objects from Excel file {filepath}')
+        sheets = cls.iter_sheets(filepath, use_lxml=use_lxml)
+        try:
+            for sheet_name, rows in sheets:
+                # the typeURI column is searched in the first 5 rows
+                first_rows = list(islice(rows, 5))
+                if len(first_rows) <= 1:
+                    continue
+                try:
+                    headers = first_rows[0]
+                    type_uri_index = cls.get_index_of_typeURI_column_in_sheet(
+                        filepath=filepath, sheet=sheet_name, headers=headers, data=first_rows)
+                    cls.check_headers(headers=headers, sheet=sheet_name, filepath=filepath,
+                                      type_uri=first_rows[1][type_uri_index], model_directory=model_directory,
+                                      cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
+                                      separator=separator,
+                                      allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                                      warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+
+                    dicts = DotnotationTableConverter.iter_2d_sequence_to_dicts(
+                        two_d_sequence=chain(first_rows, rows), empty_string_equals_none=True)
+                    yield from DotnotationTableConverter.iter_data_from_table(
+                        table_data=dicts, model_directory=model_directory,
+                        separator=separator, cardinality_indicator=cardinality_indicator,
+                        waarde_shortcut=waarde_shortcut, cardinality_separator=cardinality_separator,
+                        cast_datetime=cast_datetime, cast_list=cast_list,
+                        allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                        warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
+                        combine_errors=True, additional_header_lines=type_uri_index)
+                except GeneratorExit:
+                    # closing the generator raises GeneratorExit at the yield
+                    raise
+                except BaseException as ex:
+                    # the objects were already yielded
+                    cls._add_sheet_exception(exception_group=exception_group, exception=ex, sheet=sheet_name,
+                                             filepath=filepath, list_of_objects=[])
+        finally:
+            sheets.close()
+
+        if len(exception_group.exceptions) > 0:
+            raise exception_group
+
     @classmethod
     async def to_objects_async(cls, filepath: Path = None, **kwargs) -> list:
         if not os.path.isfile(filepath):
@@ -143,12 +313,13 @@ class ExcelImporter(AbstractImporter):
                                                       ALLOW_NON_OTL_CONFORM_ATTRIBUTES)
         warn_for_non_otl_conform_attributes = kwargs.get('warn_for_non_otl_conform_attributes',
                                                          WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES)
+        use_lxml = kwargs.get('use_lxml', False)
 
         model_directory = None
         if kwargs is not None and 'model_directory' in kwargs:
             model_directory = kwargs['model_directory']
 
-        data = await cls.get_data_dict_from_file_path_async(filepath=filepath)
+        data = await cls.get_data_dict_from_file_path_async(filepath=filepath, use_lxml=use_lxml)
 
         list_of_objects = []
         exception_group = ExceptionsGroup(message=f'Failed to create objects from Excel file {filepath}')
@@ -220,62 +391,67 @@ class ExcelImporter(AbstractImporter):
         return list_of_objects
 
     @classmethod
-    def get_data_dict_from_file_path(cls, filepath) -> dict[str, list[list]]:
-        data = {}
-        book = openpyxl.load_workbook(filepath, data_only=True)
-
-        for sheet in book.worksheets:
-            sheet_name = sheet.title
-            data[sheet_name] = []
-            for row in sheet.rows:
-                row_data = []
-                all_none = True
-                for cell in row:
-                    if cell.value in {'True', 'TRUE', 'False', 'FALSE'}:
-                        row_data.append(cell.value.lower() == 'true')
-                        all_none = False
-                    else:
-                        row_data.append(cell.value)
-                        if all_none and cell.value is not None:
-                            all_none = False
+    def get_data_dict_from_file_path(cls, filepath, use_lxml: bool = False) -> dict[str, list[list]]:
+        return {sheet_name: list(rows) for sheet_name, rows in cls.iter_sheets(filepath, use_lxml=use_lxml)}
 
-                # check if row_data contains all None values
-                if all_none:
-                    continue
-                data[sheet_name].append(row_data)
+    @classmethod
+    async def get_data_dict_from_file_path_async(cls, filepath, use_lxml: bool = False,
+                                                 executor: Optional[Executor] = None) -> dict[str, list[list]]:
+        """Reads the workbook in an executor (default: the executor of the loop), so the event loop is not blocked."""
+        return await AsyncRunner.run(cls.get_data_dict_from_file_path, filepath, use_lxml=use_lxml, executor=executor)
 
-        book.close()
-        return data
+    @classmethod
+    def iter_sheets(cls, filepath, use_lxml: bool = False) -> Generator[tuple[str, Generator[list, None, None]],
+                                                                        None, None]:
+        """Yields the title and the rows (see iter_sheet_rows) of each worksheet, reading the workbook in read-only
+        mode. With use_lxml the sheets are parsed directly with lxml by XlsxSheetReader, which is faster for big
+        files. The file is closed when the generator is exhausted or closed."""
+        if use_lxml:
+            with XlsxSheetReader(filepath) as reader:
+                for sheet_name, rows in reader.iter_sheets():
+                    yield sheet_name, cls.normalize_rows(rows)
+            return
+
+        book = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            for sheet in book.worksheets:
+                yield sheet.title, cls.iter_sheet_rows(sheet)
+        finally:
+            book.close()
 
     @classmethod
-    async def get_data_dict_from_file_path_async(cls, filepath) -> dict[str, list[list]]:
-        data = {}
-        await sleep(0)
-        book = openpyxl.load_workbook(filepath, data_only=True)
-
-        for sheet in book.worksheets:
-            sheet_name = sheet.title
-            data[sheet_name] = []
-            for row in sheet.rows:
-                row_data = []
-                all_none = True
-                for cell in row:
-                    await sleep(0)
-                    if cell.value in {'True', 'TRUE', 'False', 'FALSE'}:
-                        row_data.append(cell.value.lower() == 'true')
-                        all_none = False
-                    else:
-                        row_data.append(cell.value)
-                        if all_none and cell.value is not None:
-                            all_none = False
+    def iter_sheet_rows(cls, sheet) -> Generator[list, None, None]:
+        """Yields the values of each row of a worksheet as a list, skipping rows without values.
+        The strings 'True' and 'False' (in any case used by Excel) are converted to booleans."""
+        # the dimension tag written by other tools is not always right, a wrong one would cut off rows and columns
+        sheet.reset_dimensions()
+        return cls.normalize_rows(sheet.iter_rows(values_only=True))
 
-                # check if row_data contains all None values
-                if all_none:
-                    continue
-                data[sheet_name].append(row_data)
+    @classmethod
+    def normalize_rows(cls, rows: Iterable[tuple]) -> Generator[list, None, None]:
+        """Yields the value rows as lists, skipping rows without values and converting the strings 'True' and
+        'False' (in any case used by Excel) to booleans. Rows shorter than the first row are padded with None."""
+        width = None
+        for row in rows:
+            row_data = []
+            all_none = True
+            for value in row:
+                if value in BOOLEAN_STRINGS:
+                    row_data.append(value.lower() == 'true')
+                    all_none = False
+                else:
+                    row_data.append(value)
+                    if all_none and value is not None:
+                        all_none = False
 
-        book.close()
-        return data
+            # check if row_data contains all None values
+            if all_none:
+                continue
+            if width is None:
+                width = len(row_data)
+            elif len(row_data) < width:
+                row_data.extend([None] * (width - len(row_data)))
+            yield row_data
 
     @classmethod
     def get_index_of_typeURI_column_in_sheet(cls, filepath: Path, sheet: str,  headers: list[str],
@@ -308,7 +484,8 @@ class ExcelImporter(AbstractImporter):
                       separator: str = SEPARATOR,
                       allow_non_otl_conform_attributes: bool = ALLOW_NON_OTL_CONFORM_ATTRIBUTES,
                       warn_for_non_otl_conform_attributes: bool = WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES) -> None:
-        instance = dynamic_create_instance_from_uri(type_uri, model_directory=model_directory)
+        model_index = ModelIndex.for_model_directory(model_directory)
+        model_index.get_type(type_uri)
         bad_columns = []
 
         for header in headers:
@@ -323,8 +500,8 @@ class ExcelImporter(AbstractImporter):
                 bad_columns.append(header)
                 continue
             try:
-                DotnotationHelper.get_attribute_by_dotnotation(
-                    instance_or_attribute=instance, dotnotation=header, separator=separator,
+                model_index.get_attribute_info(
+                    type_uri, dotnotation=header, separator=separator,
                     cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut)
             except DotnotationListOfListError:
                 bad_columns.append(header)
@@ -351,12 +528,12 @@ class ExcelImporter(AbstractImporter):
                       warn_for_non_otl_conform_attributes: bool = WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES) -> None:
         await sleep(0)
         bad_columns = []
-        instance = dynamic_create_instance_from_uri(type_uri, model_directory=model_directory)
+        model_index = ModelIndex.for_model_directory(model_directory)
+        model_index.get_type(type_uri)
         error = InvalidColumnNamesInExcelTabError(
             message=f'There are invalid column names in Excel tab {sheet} in file {filepath.name}, see attribute '
                     f'bad_columns', file_path=filepath, tab=sheet)
         for header in headers:
-            await sleep(0)
             if header == 'typeURI':
                 continue
             if header in ['bron.typeURI', 'doel.typeURI']:
@@ -368,8 +545,8 @@ class ExcelImporter(AbstractImporter):
                 error.bad_columns.append(header)
                 continue
             try:
-                DotnotationHelper.get_attribute_by_dotnotation(
-                    instance_or_attribute=instance, dotnotation=header, separator=separator,
+                model_index.get_attribute_info(
+                    type_uri, dotnotation=header, separator=separator,
                     cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut)
             except DotnotationListOfListError:
                 bad_columns.append(header)
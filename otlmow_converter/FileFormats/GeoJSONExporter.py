@@ -1,4 +1,3 @@
-from asyncio import sleep
 from json import JSONEncoder
 from pathlib import Path
 from typing import Iterable
@@ -6,7 +5,9 @@ import geojson
 from geojson import LineString, Point, MultiPoint, MultiLineString, Polygon, MultiPolygon, GeometryCollection
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
 from otlmow_converter.AbstractExporter import AbstractExporter
+from otlmow_converter.AsyncRunner import AsyncRunner
 from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.FileFormats.JsonStreamWriter import JsonStreamWriter, WRITE_BUFFER_SIZE, open_replacing
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 
 load_settings()
@@ -21,63 +22,56 @@ CAST_LIST = geojson_settings['cast_list']
 CAST_DATETIME = geojson_settings['cast_datetime']
 ALLOW_NON_OTL_CONFORM_ATTRIBUTES = geojson_settings['allow_non_otl_conform_attributes']
 WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES = geojson_settings['warn_for_non_otl_conform_attributes']
+FEATURE_COLLECTION_HEADER = '{\n    "type": "FeatureCollection",\n    "features": '
 
 
 class GeoJSONExporter(AbstractExporter):
     @classmethod
-    def from_dotnotation_dicts(cls, sequence_of_dotnotation_dicts: Iterable[dict], filepath: Path) -> tuple[Path]:
-        list_of_objects = []
-        for d in sequence_of_dotnotation_dicts:
-            feature_dict = {
-                'id': d['assetId.identificator'] if d['typeURI'] != 'http://purl.org/dc/terms/Agent' else d['agentId.identificator'],
-                'properties': d,
-                'type': 'Feature'}
-
-            geometry = d.get('geometry', None)
-            if geometry is not None:
-                geom = cls.convert_wkt_string_to_geojson(d.pop("geometry"))
-                feature_dict['geometry'] = geom
-
-            list_of_objects.append(feature_dict)
-
-        fc = {
-            'type': 'FeatureCollection',
-            'features': list_of_objects
-        }
-        encoded_json = JSONEncoder(indent=4).encode(fc)
-
-        with open(filepath, "w") as file:
-            file.write(encoded_json)
+    def from_dotnotation_dicts(cls, sequence_of_dotnotation_dicts: Iterable[dict], filepath: Path,
+                               write_buffer_size: int = WRITE_BUFFER_SIZE) -> tuple[Path]:
+        """Writes a FeatureCollection, one feature at a time as the dicts are produced, in chunks of
+        write_buffer_size bytes, to a temporary file that only replaces filepath when all features are written"""
+        with open_replacing(filepath, buffering=write_buffer_size) as file:
+            file.write(FEATURE_COLLECTION_HEADER)
+            writer = JsonStreamWriter(file, encoder=JSONEncoder(indent=4), level=1)
+            for d in sequence_of_dotnotation_dicts:
+                feature_dict = {
+                    'id': d['assetId.identificator'] if d['typeURI'] != 'http://purl.org/dc/terms/Agent' else d['agentId.identificator'],
+                    'properties': d,
+                    'type': 'Feature'}
+
+                geometry = d.get('geometry', None)
+                if geometry is not None:
+                    geom = cls.convert_wkt_string_to_geojson(d.pop("geometry"))
+                    feature_dict['geometry'] = geom
+
+                writer.write(feature_dict)
+            writer.close()
+            file.write('\n}')
 
         filepath.touch()
         return (filepath,)
 
     @classmethod
-    async def from_dotnotation_dicts_async(cls, sequence_of_dotnotation_dicts: Iterable[dict], filepath: Path) -> tuple[Path]:
-        list_of_objects = []
-        for d in sequence_of_dotnotation_dicts:
-            feature_dict = {
-                'id': d['assetId.identificator'],
-                'properties': d,
-                'type': 'Feature'}
-
-            geometry = d.get('geometry', None)
-            if geometry is not None:
-                geom = cls.convert_wkt_string_to_geojson(d.pop("geometry"))
-                feature_dict['geometry'] = geom
-
-            list_of_objects.append(feature_dict)
-            await sleep(0)
-
-        fc = {
-            'type': 'FeatureCollection',
-            'features': list_of_objects
-        }
-        encoded_json = JSONEncoder(indent=4).encode(fc)
-        await sleep(0)
-
-        with open(filepath, "w") as file:
-            file.write(encoded_json)
+    async def from_dotnotation_dicts_async(cls, sequence_of_dotnotation_dicts: Iterable[dict], filepath: Path,
+                                           write_buffer_size: int = WRITE_BUFFER_SIZE) -> tuple[Path]:
+        with open_replacing(filepath, buffering=write_buffer_size) as file:
+            file.write(FEATURE_COLLECTION_HEADER)
+            writer = JsonStreamWriter(file, encoder=JSONEncoder(indent=4), level=1)
+            async for d in AsyncRunner.iterate(sequence_of_dotnotation_dicts):
+                feature_dict = {
+                    'id': d['assetId.identificator'],
+                    'properties': d,
+                    'type': 'Feature'}
+
+                geometry = d.get('geometry', None)
+                if geometry is not None:
+                    geom = cls.convert_wkt_string_to_geojson(d.pop("geometry"))
+                    feature_dict['geometry'] = geom
+
+                writer.write(feature_dict)
+            writer.close()
+            file.write('\n}')
 
         filepath.touch()
         return (filepath,)
@@ -96,13 +90,14 @@ class GeoJSONExporter(AbstractExporter):
                                                          WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES)
 
         return cls.from_dotnotation_dicts(
-            [DotnotationDictConverter.to_dict(
+            (DotnotationDictConverter.to_dict(
                 asset, separator=separator, cardinality_indicator=cardinality_indicator,
                 waarde_shortcut=waarde_shortcut, cardinality_separator=cardinality_separator,
                 cast_datetime=cast_datetime, cast_list=cast_list,
                 allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
                 warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-                for asset in sequence_of_objects], filepath=filepath)
+                for asset in sequence_of_objects), filepath=filepath,
+            write_buffer_size=kwargs.get('write_buffer_size', WRITE_BUFFER_SIZE))
 
     @classmethod
     async def from_objects_async(cls, sequence_of_objects: Iterable[OTLObject], filepath: Path, **kwargs) -> tuple[Path]:
@@ -124,7 +119,8 @@ class GeoJSONExporter(AbstractExporter):
                 cast_datetime=cast_datetime, cast_list=cast_list,
                 allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
                 warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-             for asset in sequence_of_objects], filepath=filepath)
+             for asset in sequence_of_objects], filepath=filepath,
+            write_buffer_size=kwargs.get('write_buffer_size', WRITE_BUFFER_SIZE))
 
     @classmethod
     def convert_wkt_string_to_geojson(cls, wkt_string: str):
@@ -1,9 +1,9 @@
 import json
-from asyncio import sleep
 from pathlib import Path
 from typing import Iterable, List
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
 from otlmow_converter.AbstractImporter import AbstractImporter
+from otlmow_converter.AsyncRunner import AsyncRunner
 from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 
@@ -147,15 +147,13 @@ class GeoJSONImporter(AbstractImporter):
                        cardinality_separator: str = CARDINALITY_SEPARATOR) -> List[OTLObject]:
         list_of_objects = []
 
-        for data_object in data['features']:
+        async for data_object in AsyncRunner.iterate(data['features']):
             props = data_object['properties']
             if 'typeURI' not in props:
                 if ignore_failed_objects:
                     continue
                 raise ValueError('typeURI not found in properties')
 
-            await sleep(0)
-
             asset = await DotnotationDictConverter.from_dict_async(
                 input_dict=props, model_directory=model_directory, cast_list=cast_list, cast_datetime=cast_datetime,
                 separator=separator, cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
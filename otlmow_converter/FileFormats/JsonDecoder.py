@@ -1,9 +1,21 @@
 import json
-from asyncio import sleep
+import re
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Generator
 
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
+from otlmow_converter.AsyncRunner import AsyncRunner
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+JSON_CHUNK_SIZE = 1 << 20
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+UTF8_BOM = b'\xef\xbb\xbf'
+# a decode error this far before the end of the buffer can not be caused by a value that continues in the next chunk
+TRUNCATION_MARGIN = 16
 
 
 class JsonDecoder:
@@ -12,8 +24,30 @@ class JsonDecoder:
                            allow_non_otl_conform_attributes: bool=True, warn_for_non_otl_conform_attributes: bool=True,
                            waarde_shortcut: bool=True) -> Iterable[OTLObject]:
         dict_list = json.loads(json_string)
-        object_list = []
-        for index, obj in enumerate(dict_list):
+        return list(cls.iter_objects_from_dicts(
+            dict_list, ignore_failed_objects=ignore_failed_objects, model_directory=model_directory,
+            allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes, waarde_shortcut=waarde_shortcut))
+
+    @classmethod
+    def decode_json_file_iter(cls, filepath: Path, ignore_failed_objects: bool = False, model_directory: Path = None,
+                              allow_non_otl_conform_attributes: bool = True,
+                              warn_for_non_otl_conform_attributes: bool = True, waarde_shortcut: bool = True,
+                              chunk_size: int = JSON_CHUNK_SIZE) -> Generator[OTLObject, None, None]:
+        """Decodes a json file with a top level array one object at a time, so only the current object is in memory.
+        Uses ijson when it is installed (pip install otlmow_converter[json]), otherwise the file is read in chunks of
+        chunk_size characters."""
+        yield from cls.iter_objects_from_dicts(
+            cls.iter_json_array(filepath, chunk_size=chunk_size), ignore_failed_objects=ignore_failed_objects,
+            model_directory=model_directory, allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+            warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes, waarde_shortcut=waarde_shortcut)
+
+    @classmethod
+    def iter_objects_from_dicts(cls, dicts: Iterable[dict], ignore_failed_objects: bool = False,
+                                model_directory: Path = None, allow_non_otl_conform_attributes: bool = True,
+                                warn_for_non_otl_conform_attributes: bool = True, waarde_shortcut: bool = True
+                                ) -> Generator[OTLObject, None, None]:
+        for index, obj in enumerate(dicts):
             try:
                 type_uri = obj.get('typeURI', None)
                 if type_uri is None:
@@ -23,12 +57,79 @@ class JsonDecoder:
                     obj, model_directory=model_directory, waarde_shortcut=waarde_shortcut, cast_datetime=True,
                     allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
                     warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-                object_list.append(instance)
-
             except Exception as ex:
                 if not ignore_failed_objects:
                     raise ex from ex
-        return object_list
+                continue
+            yield instance
+
+    @classmethod
+    def iter_json_array(cls, filepath: Path, chunk_size: int = JSON_CHUNK_SIZE, use_ijson: bool = True
+                        ) -> Generator[object, None, None]:
+        """Yields the elements of the top level array in a json file one at a time"""
+        if use_ijson and ijson is not None:
+            with open(filepath, 'rb') as file:
+                if file.read(len(UTF8_BOM)) != UTF8_BOM:
+                    file.seek(0)
+                yield from ijson.items(file, 'item', use_float=True)
+            return
+
+        decoder = json.JSONDecoder()
+        with open(filepath, encoding='utf-8-sig') as file:
+            buffer = file.read(chunk_size)
+            eof = not buffer
+            pos = cls._skip_whitespace(buffer, 0)
+            while pos == len(buffer) and not eof:
+                buffer = file.read(chunk_size)
+                eof = not buffer
+                pos = cls._skip_whitespace(buffer, 0)
+            if pos == len(buffer):
+                raise json.JSONDecodeError('Expecting value', buffer, pos)
+            if buffer[pos] != '[':
+                raise json.JSONDecodeError('Expecting a top level array', buffer, pos)
+            pos += 1
+            expect_element = True
+            empty = True
+
+            while True:
+                pos = cls._skip_whitespace(buffer, pos)
+                if pos < len(buffer):
+                    char = buffer[pos]
+                    if char == ']' and (empty or not expect_element):
+                        return
+                    if not expect_element:
+                        if char != ',':
+                            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                        pos += 1
+                        expect_element = True
+                        continue
+                    try:
+                        element, end = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError as e:
+                        # only an error at the end of the buffer, or in a string that is not closed yet, can be
+                        # solved by reading the next chunk, other errors are raised without reading the rest
+                        if eof or (e.pos + TRUNCATION_MARGIN < len(buffer)
+                                   and not e.msg.startswith('Unterminated string')):
+                            raise
+                        end = None
+                    # a value that ends at the end of the buffer (e.g. a number) might continue in the next chunk
+                    if end is not None and (end < len(buffer) or eof):
+                        yield element
+                        pos = end
+                        expect_element = False
+                        empty = False
+                        continue
+                if eof:
+                    raise json.JSONDecodeError('Unterminated array', buffer, pos)
+                # keep only the part that is not decoded yet and read the next chunk
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+
+    @classmethod
+    def _skip_whitespace(cls, buffer: str, pos: int) -> int:
+        return WHITESPACE.match(buffer, pos).end()
 
     @classmethod
     async def decode_json_string_async(cls, json_string: str, ignore_failed_objects: bool = False,
@@ -38,7 +139,7 @@ class JsonDecoder:
                                  waarde_shortcut: bool = True) -> Iterable[OTLObject]:
         dict_list = json.loads(json_string)
         object_list = []
-        for index, obj in enumerate(dict_list):
+        async for index, obj in AsyncRunner.iterate(enumerate(dict_list)):
             try:
                 type_uri = obj.get('typeURI', None)
                 if type_uri is None:
@@ -48,7 +149,6 @@ class JsonDecoder:
                                                cast_datetime=True,
                                                allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
                                                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-                await sleep(0)
                 object_list.append(instance)
 
             except Exception as ex:
@@ -1,9 +1,10 @@
-﻿from asyncio import sleep
-from json import JSONEncoder
+﻿from json import JSONEncoder
 from pathlib import Path
 from typing import Iterable
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject, create_dict_from_asset
 from otlmow_converter.AbstractExporter import AbstractExporter
+from otlmow_converter.AsyncRunner import AsyncRunner
+from otlmow_converter.FileFormats.JsonStreamWriter import JsonStreamWriter, WRITE_BUFFER_SIZE, open_replacing
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 
 load_settings()
@@ -16,24 +17,24 @@ WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES = json_settings['warn_for_non_otl_conform_at
 class JsonExporter(AbstractExporter):
     @classmethod
     def from_objects(cls, sequence_of_objects: Iterable[OTLObject], filepath: Path, **kwargs) -> tuple[Path]:
+        """Writes the objects to a json array, one object at a time as they are produced by sequence_of_objects.
+        The file is written in chunks of write_buffer_size bytes (default 1 MiB), to a temporary file that only
+        replaces filepath when all objects are written."""
         waarde_shortcut = kwargs.get('waarde_shortcut', WAARDE_SHORTCUT)
         allow_non_otl_conform_attributes = kwargs.get('allow_non_otl_conform_attributes',
                                                       ALLOW_NON_OTL_CONFORM_ATTRIBUTES)
         warn_for_non_otl_conform_attributes = kwargs.get('warn_for_non_otl_conform_attributes',
                                                          WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES)
 
-        list_of_objects = []
-        for asset in sequence_of_objects:
-            d = create_dict_from_asset(asset, cast_datetime=True, waarde_shortcut=waarde_shortcut,
-                                       allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-                                       warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-            d['typeURI'] = asset.typeURI
-            list_of_objects.append(d)
-
-        encoded_json = JSONEncoder(indent=4).encode(list_of_objects)
-
-        with open(filepath, "w") as file:
-            file.write(encoded_json)
+        with open_replacing(filepath, buffering=kwargs.get('write_buffer_size', WRITE_BUFFER_SIZE)) as file:
+            writer = JsonStreamWriter(file, encoder=JSONEncoder(indent=4))
+            for asset in sequence_of_objects:
+                d = create_dict_from_asset(asset, cast_datetime=True, waarde_shortcut=waarde_shortcut,
+                                           allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                                           warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+                d['typeURI'] = asset.typeURI
+                writer.write(d)
+            writer.close()
 
         filepath.touch()
         return (filepath,)
@@ -46,19 +47,15 @@ class JsonExporter(AbstractExporter):
         warn_for_non_otl_conform_attributes = kwargs.get('warn_for_non_otl_conform_attributes',
                                                          WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES)
 
-        list_of_objects = []
-        for asset in sequence_of_objects:
-            d = create_dict_from_asset(asset, cast_datetime=True, waarde_shortcut=waarde_shortcut,
-                                       allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-                                       warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-            d['typeURI'] = asset.typeURI
-            list_of_objects.append(d)
-            await sleep(0)
-
-        encoded_json = JSONEncoder(indent=4).encode(list_of_objects)
-
-        with open(filepath, "w") as file:
-            file.write(encoded_json)
+        with open_replacing(filepath, buffering=kwargs.get('write_buffer_size', WRITE_BUFFER_SIZE)) as file:
+            writer = JsonStreamWriter(file, encoder=JSONEncoder(indent=4))
+            async for asset in AsyncRunner.iterate(sequence_of_objects):
+                d = create_dict_from_asset(asset, cast_datetime=True, waarde_shortcut=waarde_shortcut,
+                                           allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                                           warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+                d['typeURI'] = asset.typeURI
+                writer.write(d)
+            writer.close()
 
         filepath.touch()
         return (filepath,)
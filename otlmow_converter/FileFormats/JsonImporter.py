@@ -2,7 +2,7 @@
 from typing import Iterable
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
 from otlmow_converter.AbstractImporter import AbstractImporter
-from otlmow_converter.FileFormats.JsonDecoder import JsonDecoder
+from otlmow_converter.FileFormats.JsonDecoder import JsonDecoder, JSON_CHUNK_SIZE
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 
 load_settings()
@@ -21,7 +21,8 @@ class JsonImporter(AbstractImporter):
         :param filepath: location of the file to import
         :type: Path
         :rtype: list
-        :return: returns a list of OTL objects
+        :return: returns a list of OTL objects, or a generator of OTL objects when stream=True is given. When
+        streaming, the file is decoded one object at a time so memory use does not grow with the size of the file.
         """
 
         waarde_shortcut = kwargs.get('waarde_shortcut', WAARDE_SHORTCUT)
@@ -42,6 +43,14 @@ class JsonImporter(AbstractImporter):
         if kwargs is not None and 'ignore_failed_objects' in kwargs:
             ignore_failed_objects = kwargs['ignore_failed_objects']
 
+        if kwargs.get('stream', False):
+            return JsonDecoder.decode_json_file_iter(
+                filepath=filepath, ignore_failed_objects=ignore_failed_objects,
+                allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes,
+                model_directory=model_directory, waarde_shortcut=waarde_shortcut,
+                chunk_size=kwargs.get('chunk_size', JSON_CHUNK_SIZE))
+
         data = Path(filepath).read_text()
         return JsonDecoder.decode_json_string(json_string=data, ignore_failed_objects=ignore_failed_objects,
                                               allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
@@ -1,5 +1,8 @@
+from functools import lru_cache
 from typing import Optional
 
+COMPACTED_IRIS_CACHE_SIZE = 4096
+
 
 class JsonLdContext:
     context_dict = {
@@ -14,6 +17,74 @@ class JsonLdContext:
         'loc': 'https://loc.data.wegenenverkeer.be/ns/implementatieelement#'
     }
 
+    _prefixes_by_namespace: Optional[dict[str, str]] = None
+
+    @classmethod
+    def compact_text(cls, text: str, used_prefixes: set) -> str:
+        """Replaces every namespace of the context in the text by its prefix, adding the prefixes that were used.
+        This is the replacement the exporter used to do on the encoded document, applied to a single string.
+        A text that is a single IRI is compacted with a lookup of its namespace, only other texts that contain an IRI
+        (e.g. free text) are searched for every namespace."""
+        if '://' not in text:
+            return text
+        if text.startswith('https://') and text.find('://', 8) == -1:
+            compacted, prefix = cls._compact_iri(text)
+            if prefix is not None:
+                used_prefixes.add(prefix)
+            return compacted
+        for short, long in cls.context_dict.items():
+            if long in text:
+                used_prefixes.add(short)
+                text = text.replace(long, f'{short}:')
+        return text
+
+    @staticmethod
+    @lru_cache(maxsize=COMPACTED_IRIS_CACHE_SIZE)
+    def _compact_iri(iri: str) -> tuple[str, Optional[str]]:
+        # the longest namespace that the iri starts with, namespaces end with '/' or '#'
+        prefixes_by_namespace = JsonLdContext._get_prefixes_by_namespace()
+        end = len(iri)
+        while (end := max(iri.rfind('/', 8, end), iri.rfind('#', 8, end))) != -1:
+            if (prefix := prefixes_by_namespace.get(iri[:end + 1])) is not None:
+                return f'{prefix}:{iri[end + 1:]}', prefix
+        return iri, None
+
+    @classmethod
+    def _get_prefixes_by_namespace(cls) -> dict[str, str]:
+        if cls._prefixes_by_namespace is None:
+            cls._prefixes_by_namespace = {long: short for short, long in cls.context_dict.items()}
+        return cls._prefixes_by_namespace
+
+    @classmethod
+    def compact_dict(cls, input_dict: dict, used_prefixes: set) -> dict:
+        """Returns a copy of the dict with compact_text applied to the keys and to all string values, nested or not.
+        Encoding the result gives the same text as encoding the dict and replacing the namespaces in that text.
+        Keys are attribute uris that repeat in every object of a type, like the uris of types and choice list values,
+        so the compacted form of an IRI is cached."""
+        new_dict = {}
+        for k, v in input_dict.items():
+            k, prefixes = cls._compact_key(k)
+            if prefixes:
+                used_prefixes.update(prefixes)
+            new_dict[k] = cls._compact_value(v, used_prefixes)
+        return new_dict
+
+    @classmethod
+    def _compact_value(cls, value, used_prefixes: set):
+        if isinstance(value, str):
+            return cls.compact_text(value, used_prefixes)
+        if isinstance(value, dict):
+            return cls.compact_dict(value, used_prefixes)
+        if isinstance(value, list):
+            return [cls._compact_value(item, used_prefixes) for item in value]
+        return value
+
+    @staticmethod
+    @lru_cache(maxsize=COMPACTED_IRIS_CACHE_SIZE)
+    def _compact_key(key: str) -> tuple[str, frozenset]:
+        used_prefixes = set()
+        return JsonLdContext.compact_text(key, used_prefixes), frozenset(used_prefixes)
+
     @staticmethod
     def replace_context(short_uri: str, context_dict: dict) -> Optional[str]:
         if short_uri is None:
@@ -1,15 +1,19 @@
 import json
+import shutil
+import tempfile
 from asyncio import sleep
 from datetime import date, datetime, time
 from json import JSONEncoder
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, TextIO
 
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject, create_dict_from_asset
 from otlmow_model.OtlmowModel.Helpers.OTLObjectHelper import is_relation
 
 from otlmow_converter.AbstractExporter import AbstractExporter
+from otlmow_converter.AsyncRunner import AsyncRunner
 from otlmow_converter.FileFormats.JsonLdContext import JsonLdContext
+from otlmow_converter.FileFormats.JsonStreamWriter import JsonStreamWriter, WRITE_BUFFER_SIZE
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 
 load_settings()
@@ -45,30 +49,29 @@ class JsonLdExporter(AbstractExporter):
         if 'model_directory' in kwargs:
             model_directory = kwargs['model_directory']
 
-        list_of_objects = []
-        for asset in sequence_of_objects:
-            d = create_dict_from_asset(asset, rdf=True, cast_datetime=True, waarde_shortcut=waarde_shortcut,
-                                       allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-                                       warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-            d['@type'] = asset.typeURI
-            d['https://wegenenverkeer.data.vlaanderen.be/ns/implementatieelement#AIMObject.typeURI'] = asset.typeURI
-            id = asset.assetId.identificator if asset.typeURI != 'http://purl.org/dc/terms/Agent' else asset.agentId.identificator
-            if id is None:
-                raise ValueError(f'No identificator found for asset: {d}')
-            else:
-                if is_relation(asset, model_directory):
-                    d['@id'] = 'https://data.awvvlaanderen.be/id/assetrelatie/' + id
+        used_prefixes = set()
+        # the context has to be written before the graph but is only known after the last object,
+        # so the graph is spooled to a temporary file next to the result
+        with tempfile.TemporaryFile('w+', dir=filepath.parent) as graph_file:
+            writer = JsonStreamWriter(graph_file, encoder=DateTimeEncoder(indent=4), level=1)
+            for asset in sequence_of_objects:
+                d = create_dict_from_asset(asset, rdf=True, cast_datetime=True, waarde_shortcut=waarde_shortcut,
+                                           allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                                           warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+                d['@type'] = asset.typeURI
+                d['https://wegenenverkeer.data.vlaanderen.be/ns/implementatieelement#AIMObject.typeURI'] = asset.typeURI
+                id = asset.assetId.identificator if asset.typeURI != 'http://purl.org/dc/terms/Agent' else asset.agentId.identificator
+                if id is None:
+                    raise ValueError(f'No identificator found for asset: {d}')
                 else:
-                    d['@id'] = 'https://data.awvvlaanderen.be/id/asset/' + id
-            list_of_objects.append(d)
-
-        graph_dict = {'@graph': (list_of_objects if isinstance(list_of_objects, list) else [list_of_objects])}
-
-        encoded_json = DateTimeEncoder(indent=4).encode(graph_dict)
-        encoded_json = cls.modify_jsonld_for_context(encoded_json)
-
-        with open(filepath, "w") as file:
-            file.write(encoded_json)
+                    if is_relation(asset, model_directory):
+                        d['@id'] = 'https://data.awvvlaanderen.be/id/assetrelatie/' + id
+                    else:
+                        d['@id'] = 'https://data.awvvlaanderen.be/id/asset/' + id
+                writer.write(JsonLdContext.compact_dict(d, used_prefixes))
+            writer.close()
+            cls._write_document(filepath, graph_file, used_prefixes,
+                                write_buffer_size=kwargs.get('write_buffer_size', WRITE_BUFFER_SIZE))
 
         filepath.touch()
         return (filepath,)
@@ -85,34 +88,29 @@ class JsonLdExporter(AbstractExporter):
         if 'model_directory' in kwargs:
             model_directory = kwargs['model_directory']
 
-        list_of_objects = []
-        for asset in sequence_of_objects:
-            await sleep(0)
-            d = create_dict_from_asset(asset, rdf=True, cast_datetime=True, waarde_shortcut=waarde_shortcut,
-                                       allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
-                                       warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-            d['@type'] = asset.typeURI
-            d['https://wegenenverkeer.data.vlaanderen.be/ns/implementatieelement#AIMObject.typeURI'] = asset.typeURI
-            if asset.assetId.identificator is None:
-                raise ValueError(f'No identificator found for asset: {d}')
-            else:
-                if is_relation(asset, model_directory):
-                    d['@id'] = (
-                        f'https://data.awvvlaanderen.be/id/assetrelatie/{asset.assetId.identificator}'
-                    )
+        used_prefixes = set()
+        with tempfile.TemporaryFile('w+', dir=filepath.parent) as graph_file:
+            writer = JsonStreamWriter(graph_file, encoder=DateTimeEncoder(indent=4), level=1)
+            async for asset in AsyncRunner.iterate(sequence_of_objects):
+                d = create_dict_from_asset(asset, rdf=True, cast_datetime=True, waarde_shortcut=waarde_shortcut,
+                                           allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                                           warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+                d['@type'] = asset.typeURI
+                d['https://wegenenverkeer.data.vlaanderen.be/ns/implementatieelement#AIMObject.typeURI'] = asset.typeURI
+                if asset.assetId.identificator is None:
+                    raise ValueError(f'No identificator found for asset: {d}')
                 else:
-                    d['@id'] = 'https://data.awvvlaanderen.be/id/asset/' + asset.assetId.identificator
-            list_of_objects.append(d)
-
-        graph_dict = {'@graph': (list_of_objects if isinstance(list_of_objects, list) else [list_of_objects])}
-
-        encoded_json = DateTimeEncoder(indent=4).encode(graph_dict)
-        encoded_json = cls.modify_jsonld_for_context(encoded_json)
-
-        await sleep(0)
-
-        with open(filepath, "w") as file:
-            file.write(encoded_json)
+                    if is_relation(asset, model_directory):
+                        d['@id'] = (
+                            f'https://data.awvvlaanderen.be/id/assetrelatie/{asset.assetId.identificator}'
+                        )
+                    else:
+                        d['@id'] = 'https://data.awvvlaanderen.be/id/asset/' + asset.assetId.identificator
+                writer.write(JsonLdContext.compact_dict(d, used_prefixes))
+            writer.close()
+            await sleep(0)
+            cls._write_document(filepath, graph_file, used_prefixes,
+                                write_buffer_size=kwargs.get('write_buffer_size', WRITE_BUFFER_SIZE))
 
         filepath.touch()
         return (filepath,)
@@ -129,3 +127,16 @@ class JsonLdExporter(AbstractExporter):
         encoded_json = encoded_json.replace('"@graph"',
                                             f'"@context": {json.dumps(new_context_dict, indent=4)},\n"@graph"')
         return encoded_json
+
+    @classmethod
+    def _get_context_dict(cls, used_prefixes) -> dict:
+        return {short: long for short, long in JsonLdContext.context_dict.items() if short in used_prefixes}
+
+    @classmethod
+    def _write_document(cls, filepath: Path, graph_file: TextIO, used_prefixes: set, write_buffer_size: int) -> None:
+        graph_file.seek(0)
+        with open(filepath, "w", buffering=write_buffer_size) as file:
+            file.write(f'{{\n    "@context": {json.dumps(cls._get_context_dict(used_prefixes), indent=4)},\n'
+                       f'"@graph": ')
+            shutil.copyfileobj(graph_file, file, write_buffer_size)
+            file.write('\n}')
@@ -0,0 +1,50 @@
+import os
+from contextlib import contextmanager, suppress
+from json import JSONEncoder
+from pathlib import Path
+from typing import Generator, TextIO
+from uuid import uuid4
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+@contextmanager
+def open_replacing(filepath: Path, buffering: int = WRITE_BUFFER_SIZE) -> Generator[TextIO, None, None]:
+    """Opens a temporary file next to filepath for writing, that replaces filepath when the block ends without an
+    error. When the block raises, filepath is left as it was and the temporary file is removed."""
+    filepath = Path(filepath)
+    temp_path = filepath.with_name(f'.{filepath.name}.{uuid4().hex}.tmp')
+    try:
+        with open(temp_path, 'x', buffering=buffering) as file:
+            yield file
+        os.replace(temp_path, filepath)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+
+
+class JsonStreamWriter:
+    """Writes a json array one element at a time. The text is the same as encoding the whole array at once with
+    JSONEncoder(indent=4), when the array is the value of a key at the given indentation level."""
+
+    def __init__(self, file: TextIO, encoder: JSONEncoder = None, level: int = 0):
+        self.file = file
+        self.encoder = JSONEncoder(indent=4) if encoder is None else encoder
+        self.indent = ' ' * (self.encoder.indent * (level + 1))
+        self.closing = '\n' + ' ' * (self.encoder.indent * level) + ']'
+        self.count = 0
+
+    def write(self, element) -> str:
+        """Writes an element and returns its encoded text"""
+        encoded = self.encoder.encode(element)
+        self.write_encoded(encoded)
+        return encoded
+
+    def write_encoded(self, encoded: str) -> None:
+        self.file.write(('[\n' if self.count == 0 else ',\n') + self.indent +
+                        encoded.replace('\n', '\n' + self.indent))
+        self.count += 1
+
+    def close(self) -> None:
+        self.file.write('[]' if self.count == 0 else self.closing)
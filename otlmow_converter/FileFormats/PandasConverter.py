@@ -1,40 +1,80 @@
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Generator, Optional
+
+import numpy as np
+import pyarrow as pa
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
 import pandas as pd
 from pandas import DataFrame
+from pandas.api.types import (infer_dtype, is_datetime64_any_dtype, is_numeric_dtype, is_object_dtype,
+                              is_timedelta64_dtype)
 
+from otlmow_converter.AsyncRunner import AsyncRunner
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
 from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
+from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
+
+BACKENDS = (None, 'arrow')
 
 
 class PandasConverter:
     @classmethod
-    def convert_objects_to_single_dataframe(cls, list_of_objects: Iterable[OTLObject], **kwargs) -> DataFrame:
+    def convert_objects_to_single_dataframe(cls, list_of_objects: Iterable[OTLObject], backend: Optional[str] = None,
+                                            **kwargs) -> DataFrame:
+        """With backend='arrow' the DataFrame wraps a pa.Table built by PyArrowConverter, with a pd.ArrowDtype column
+        per OTL field typed after the native type of the field, instead of object columns with inferred dtypes."""
+        if cls._use_arrow_backend(backend):
+            return cls._table_to_dataframe(PyArrowConverter.convert_objects_to_single_table(
+                list_of_objects=list_of_objects, **kwargs))
         single_table = DotnotationTableConverter.get_single_table_from_data(
             list_of_objects=list_of_objects, **kwargs)
         return DataFrame(data=single_table[1:])
 
     @classmethod
-    async def convert_objects_to_single_dataframe_async(cls, list_of_objects: Iterable[OTLObject], **kwargs
-                                                        ) -> (DataFrame):
+    async def convert_objects_to_single_dataframe_async(cls, list_of_objects: Iterable[OTLObject],
+                                                        backend: Optional[str] = None, **kwargs) -> (DataFrame):
+        if cls._use_arrow_backend(backend):
+            return await AsyncRunner.run(cls.convert_objects_to_single_dataframe, list_of_objects, backend=backend,
+                                         **kwargs)
         single_table = await DotnotationTableConverter.get_single_table_from_data_async(
             list_of_objects=list_of_objects, **kwargs)
         return DataFrame(data=single_table[1:])
 
     @classmethod
-    def convert_objects_to_multiple_dataframes(cls, sequence_of_objects: Iterable[OTLObject], **kwargs
-                                               ) -> dict[str, DataFrame]:
+    def convert_objects_to_multiple_dataframes(cls, sequence_of_objects: Iterable[OTLObject],
+                                               backend: Optional[str] = None, **kwargs) -> dict[str, DataFrame]:
+        if cls._use_arrow_backend(backend):
+            tables = PyArrowConverter.convert_objects_to_multiple_tables(
+                list_of_objects=sequence_of_objects, **kwargs)
+            return {key: cls._table_to_dataframe(table) for key, table in tables.items()}
         dict_tables = DotnotationTableConverter.get_tables_per_type_from_data(
             sequence_of_objects=sequence_of_objects, **kwargs)
         return {key: DataFrame(data=value[1:]) for key, value in dict_tables.items()}
 
     @classmethod
-    async def convert_objects_to_multiple_dataframes_async(cls, sequence_of_objects: Iterable[OTLObject], **kwargs
-                                               ) -> dict[str, DataFrame]:
+    async def convert_objects_to_multiple_dataframes_async(cls, sequence_of_objects: Iterable[OTLObject],
+                                                           backend: Optional[str] = None, **kwargs
+                                                           ) -> dict[str, DataFrame]:
+        if cls._use_arrow_backend(backend):
+            return await AsyncRunner.run(cls.convert_objects_to_multiple_dataframes, sequence_of_objects,
+                                         backend=backend, **kwargs)
         dict_tables = await DotnotationTableConverter.get_tables_per_type_from_data_async(
             sequence_of_objects=sequence_of_objects, **kwargs)
         return {key: DataFrame(data=value[1:]) for key, value in dict_tables.items()}
 
+    @classmethod
+    def _use_arrow_backend(cls, backend: Optional[str]) -> bool:
+        if backend not in BACKENDS:
+            raise ValueError(f'backend must be one of {", ".join(repr(b) for b in BACKENDS)}, not {backend!r}')
+        return backend == 'arrow'
+
+    @classmethod
+    def _table_to_dataframe(cls, table: pa.Table) -> DataFrame:
+        """Wraps the columns of the table in pd.ArrowDtype columns without copying them, typeURI first."""
+        if 'typeURI' in table.column_names:
+            table = table.select(['typeURI'] + [name for name in table.column_names if name != 'typeURI'])
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
     @classmethod
     def tolist_if_possible(cls, x):
         tolist = getattr(x, "tolist", None)
@@ -43,76 +83,75 @@ class PandasConverter:
     @classmethod
     def convert_dataframe_to_objects(cls, dataframe: DataFrame, model_directory: Path = None, **kwargs
                                      ) -> Iterable[OTLObject]:
-        # Replace all NA/NaN with None for pandas 2.x and 3.0 compatibility
-        # In pandas 3, fillna(value=None) is not allowed, so we use where instead
-        df = dataframe.where(pd.notnull(dataframe), None)
-
-        for col in df.columns:
-            if any(callable(getattr(x, "tolist", None)) for x in df[col]):
-                df[col] = df[col].apply(cls.tolist_if_possible)
-
-        headers = list(df)
-        d = {header: index for index, header in enumerate(headers)}
-        dict_list = [d]
-
-        # Convert to dict and clean up any 'nan' strings (pandas 3.0 compatibility)
-        for record in df.to_dict('records'):
-            cleaned_record = {}
-            for k, v in record.items():
-                # Filter out 'nan' strings and float NaN that pandas 3.0 might create
-                if isinstance(v, str) and v == 'nan':
-                    cleaned_record[k] = None
-                elif isinstance(v, float):
-                    # Check for float NaN using the fact that NaN != NaN
-                    try:
-                        if v != v:  # NaN check
-                            cleaned_record[k] = None
-                        else:
-                            cleaned_record[k] = v
-                    except:
-                        cleaned_record[k] = v
-                else:
-                    cleaned_record[k] = v
-            dict_list.append(cleaned_record)
-
-        return DotnotationTableConverter.get_data_from_table(
-            table_data=dict_list, model_directory=model_directory, **kwargs)
+        instances = []
+        try:
+            instances.extend(cls.iter_dataframe_to_objects(dataframe=dataframe, model_directory=model_directory,
+                                                           **kwargs))
+        except BadLinesInExcelError as lines_error:
+            lines_error.objects = instances
+            raise lines_error
+        return instances
+
+    @classmethod
+    def iter_dataframe_to_objects(cls, dataframe: DataFrame, model_directory: Path = None, **kwargs
+                                  ) -> Generator[OTLObject, None, None]:
+        """Yields the objects one row at a time, see DotnotationTableConverter.iter_data_from_table for the handling
+        of errors in lines. The objects are built column by column with PyArrowConverter.iter_columns_to_objects"""
+        columns = cls._get_cleaned_columns(dataframe)
+        column_names = [name for name, _ in columns]
+        if 'typeURI' not in column_names or len(set(column_names)) != len(column_names):
+            yield from DotnotationTableConverter.iter_data_from_table(
+                table_data=cls._iter_table_data_from_columns(columns), model_directory=model_directory, **kwargs)
+            return
+
+        yield from PyArrowConverter.iter_columns_to_objects(
+            type_uris=columns[column_names.index('typeURI')][1],
+            columns=[column for column in columns if column[0] != 'typeURI'],
+            model_directory=model_directory, **kwargs)
+
+    @classmethod
+    def _get_cleaned_columns(cls, dataframe: DataFrame) -> list[tuple[str, list]]:
+        """Returns the name and the python values of each column, with None instead of NA/NaN and 'nan' strings
+        (pandas 3.0 compatibility) and lists instead of arrays. The missing values are found with a mask per column,
+        only the values of object columns that are not all strings are checked one by one."""
+        columns = []
+        for index, name in enumerate(dataframe.columns):
+            series = dataframe.iloc[:, index]
+            values = series.tolist()
+            missing = series.isna().to_numpy(dtype=bool, copy=True)
+            if isinstance(series.dtype, pd.StringDtype) or (
+                    is_object_dtype(series.dtype) and infer_dtype(series, skipna=True) == 'string'):
+                missing |= (series == 'nan').to_numpy(dtype=bool, na_value=False)
+            elif not (is_numeric_dtype(series.dtype) or is_datetime64_any_dtype(series.dtype)
+                      or is_timedelta64_dtype(series.dtype)):
+                values = [cls._clean_value(value) for value in values]
+            for row_nr in np.flatnonzero(missing):
+                values[row_nr] = None
+            columns.append((name, values))
+        return columns
+
+    @classmethod
+    def _clean_value(cls, value):
+        value = cls.tolist_if_possible(value)
+        return None if isinstance(value, str) and value == 'nan' else value
+
+    @classmethod
+    def _iter_table_data_from_columns(cls, columns: list[tuple[str, list]]) -> Generator[dict, None, None]:
+        """Yields the header dict and then a dict per row"""
+        names = [name for name, _ in columns]
+        yield {name: index for index, name in enumerate(names)}
+        for row in zip(*(values for _, values in columns)):
+            yield dict(zip(names, row))
 
     @classmethod
     async def convert_dataframe_to_objects_async(cls, dataframe: DataFrame, model_directory: Path = None, **kwargs
                                      ) -> Iterable[OTLObject]:
-        # Replace all NA/NaN with None for pandas 2.x and 3.0 compatibility
-        # In pandas 3, fillna(value=None) is not allowed, so we use where instead
-        df = dataframe.where(pd.notnull(dataframe), None)
-
-        for col in df.columns:
-            if any(callable(getattr(x, "tolist", None)) for x in df[col]):
-                df[col] = df[col].apply(cls.tolist_if_possible)
-
-        headers = list(df)
-        d = {header: index for index, header in enumerate(headers)}
-        dict_list = [d]
-
-        # Convert to dict and clean up any 'nan' strings (pandas 3.0 compatibility)
-        for record in df.to_dict('records'):
-            cleaned_record = {}
-            for k, v in record.items():
-                # Filter out 'nan' strings and float NaN that pandas 3.0 might create
-                if isinstance(v, str) and v == 'nan':
-                    cleaned_record[k] = None
-                elif isinstance(v, float):
-                    # Check for float NaN using the fact that NaN != NaN
-                    try:
-                        if v != v:  # NaN check
-                            cleaned_record[k] = None
-                        else:
-                            cleaned_record[k] = v
-                    except:
-                        cleaned_record[k] = v
-                else:
-                    cleaned_record[k] = v
-            dict_list.append(cleaned_record)
-
-        return await DotnotationTableConverter.get_data_from_table_async(
-            table_data=dict_list, model_directory=model_directory, **kwargs)
-
+        instances = []
+        try:
+            async for instance in AsyncRunner.iterate(cls.iter_dataframe_to_objects(
+                    dataframe=dataframe, model_directory=model_directory, **kwargs)):
+                instances.append(instance)
+        except BadLinesInExcelError as lines_error:
+            lines_error.objects = instances
+            raise lines_error
+        return instances
@@ -0,0 +1,104 @@
+import shutil
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import quote
+
+import pyarrow.parquet as pq
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
+
+from otlmow_converter.AbstractExporter import AbstractExporter
+from otlmow_converter.AsyncRunner import AsyncRunner
+from otlmow_converter.FileFormats.ArrowTableBuilder import ArrowTableBuilder
+from otlmow_converter.FileFormats.RecordBatchSpill import RecordBatchSpill
+from otlmow_converter.SettingsManager import load_settings, GlobalVariables
+
+load_settings()
+
+parquet_settings = GlobalVariables.settings['formats']['parquet']
+parquet_dotnotation_settings = parquet_settings['dotnotation']
+SEPARATOR = parquet_dotnotation_settings['separator']
+CARDINALITY_SEPARATOR = parquet_dotnotation_settings['cardinality_separator']
+CARDINALITY_INDICATOR = parquet_dotnotation_settings['cardinality_indicator']
+WAARDE_SHORTCUT = parquet_dotnotation_settings['waarde_shortcut']
+SPLIT_PER_TYPE = parquet_settings['split_per_type']
+COMPRESSION = parquet_settings['compression']
+ROW_GROUP_SIZE = parquet_settings['row_group_size']
+ALLOW_NON_OTL_CONFORM_ATTRIBUTES = parquet_settings['allow_non_otl_conform_attributes']
+WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES = parquet_settings['warn_for_non_otl_conform_attributes']
+
+PARTITION_FILE_NAME = 'part-0.parquet'
+
+
+class ParquetExporter(AbstractExporter):
+    @classmethod
+    def from_objects(cls, sequence_of_objects: Iterable[OTLObject], filepath: Path, **kwargs) -> tuple[Path]:
+        """Writes the objects to a parquet file, with a column per dotnotation typed after the OTL field (see
+        ArrowTableBuilder.get_arrow_type). Lists and dates are stored as parquet lists and dates, not as text.
+        With split_per_type=True, filepath becomes the directory of a hive-partitioned dataset with a file per type:
+        filepath/typeURI=<url-encoded typeURI>/part-0.parquet, each with only the columns of that type. The partitions
+        of an earlier export to the same directory are removed, so the dataset only holds the given objects.
+        The record batches are written one at a time (see RecordBatchSpill), a row group per batch of row_group_size
+        objects. Further options: compression (default zstd) and row_group_size."""
+        if filepath is None:
+            raise ValueError(f'Can not write a file to: {filepath}')
+        filepath = Path(filepath)
+
+        split_per_type = kwargs.get('split_per_type', SPLIT_PER_TYPE)
+        compression = kwargs.get('compression', COMPRESSION)
+        row_group_size = kwargs.get('row_group_size', ROW_GROUP_SIZE)
+        cardinality_separator = kwargs.get('cardinality_separator', CARDINALITY_SEPARATOR)
+        builder_kwargs = dict(
+            batch_size=row_group_size, separator=kwargs.get('separator', SEPARATOR),
+            cardinality_separator=cardinality_separator,
+            cardinality_indicator=kwargs.get('cardinality_indicator', CARDINALITY_INDICATOR),
+            waarde_shortcut=kwargs.get('waarde_shortcut', WAARDE_SHORTCUT),
+            allow_non_otl_conform_attributes=kwargs.get('allow_non_otl_conform_attributes',
+                                                        ALLOW_NON_OTL_CONFORM_ATTRIBUTES),
+            warn_for_non_otl_conform_attributes=kwargs.get('warn_for_non_otl_conform_attributes',
+                                                           WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES))
+
+        if not split_per_type:
+            with RecordBatchSpill(cardinality_separator=cardinality_separator) as spill:
+                for batch in ArrowTableBuilder.iter_batches(sequence_of_objects, **builder_kwargs):
+                    spill.add(batch)
+                spill.write(lambda schema: pq.ParquetWriter(filepath, schema, compression=compression))
+            return (filepath,)
+
+        with ExitStack() as stack:
+            spills: dict[str, RecordBatchSpill] = {}
+            for _, batch in ArrowTableBuilder.iter_batches_per_type(sequence_of_objects, **builder_kwargs):
+                # the typeURI is the key of the partition, like any hive-partitioned dataset
+                type_uri = batch.column('typeURI')[0].as_py()
+                spill = spills.get(type_uri)
+                if spill is None:
+                    spill = spills[type_uri] = stack.enter_context(RecordBatchSpill(cardinality_separator))
+                spill.add(batch)
+
+            cls._remove_partitions(filepath)
+            created_filepaths = []
+            for type_uri, spill in spills.items():
+                partition_directory = filepath / f'typeURI={quote(type_uri, safe="")}'
+                partition_directory.mkdir(parents=True)
+                created_filepath = partition_directory / PARTITION_FILE_NAME
+                type_schema = spill.get_schema()
+                spill.write(lambda schema: pq.ParquetWriter(created_filepath, schema, compression=compression),
+                            schema=type_schema.remove(type_schema.get_field_index('typeURI')))
+                created_filepaths.append(created_filepath)
+        return tuple(created_filepaths)
+
+    @staticmethod
+    def _remove_partitions(dataset_directory: Path) -> None:
+        if not dataset_directory.is_dir():
+            return
+        for partition_directory in dataset_directory.glob('typeURI=*'):
+            shutil.rmtree(partition_directory)
+
+    @classmethod
+    async def from_objects_async(cls, sequence_of_objects: Iterable[OTLObject], filepath: Path,
+                                 **kwargs) -> tuple[Path]:
+        """Builds and writes the file with from_objects in an executor, use executor=... to pass the executor."""
+        executor, _, _, _ = AsyncRunner.pop_options(kwargs)
+        objects = [otl_object async for otl_object in AsyncRunner.iterate(sequence_of_objects)]
+        return await AsyncRunner.run(cls.from_objects, sequence_of_objects=objects, filepath=filepath,
+                                     executor=executor, **kwargs)
@@ -0,0 +1,149 @@
+from pathlib import Path
+from typing import Callable, Generator, Iterable, Optional
+from urllib.parse import unquote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
+
+from otlmow_converter.AbstractImporter import AbstractImporter
+from otlmow_converter.AsyncRunner import AsyncRunner
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
+from otlmow_converter.Exceptions.ErrorInExcelLine import ErrorInExcelLine
+from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
+from otlmow_converter.SettingsManager import load_settings, GlobalVariables
+
+load_settings()
+
+parquet_settings = GlobalVariables.settings['formats']['parquet']
+parquet_dotnotation_settings = parquet_settings['dotnotation']
+SEPARATOR = parquet_dotnotation_settings['separator']
+CARDINALITY_SEPARATOR = parquet_dotnotation_settings['cardinality_separator']
+CARDINALITY_INDICATOR = parquet_dotnotation_settings['cardinality_indicator']
+WAARDE_SHORTCUT = parquet_dotnotation_settings['waarde_shortcut']
+ALLOW_NON_OTL_CONFORM_ATTRIBUTES = parquet_settings['allow_non_otl_conform_attributes']
+WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES = parquet_settings['warn_for_non_otl_conform_attributes']
+
+PARTITION_KEY = 'typeURI='
+
+
+class ParquetImporter(AbstractImporter):
+    @classmethod
+    def to_objects(cls, filepath: Path, **kwargs) -> Iterable[OTLObject]:
+        """Reads a parquet file, or a directory of files partitioned by typeURI as written by ParquetExporter with
+        split_per_type=True, and converts it to OTL objects.
+        The files are read one row group (or batch_size rows) at a time and the objects are built column by column
+        with PyArrowConverter.
+        - columns: only read these dotnotation columns (typeURI is always read).
+        - stream: if True, a generator is returned that yields the objects one batch at a time (default is False).
+        - batch_size: the maximum number of rows read and converted at once (default is a row group).
+        - on_line_error: a callable that receives the ErrorInExcelLine of each row that fails. If not given, a
+          BadLinesInExcelError is raised after the last object."""
+        if filepath is None:
+            raise ValueError(f'Can not read a file from: {filepath}')
+
+        objects = cls._iter_objects(Path(filepath), **kwargs)
+        if kwargs.get('stream', False):
+            return objects
+
+        instances = []
+        try:
+            instances.extend(objects)
+        except BadLinesInExcelError as lines_error:
+            lines_error.objects = instances
+            raise lines_error
+        return instances
+
+    @classmethod
+    async def to_objects_async(cls, filepath: Path, **kwargs) -> Iterable[OTLObject]:
+        if filepath is None:
+            raise ValueError(f'Can not read a file from: {filepath}')
+
+        instances = []
+        try:
+            async for instance in AsyncRunner.iterate(cls._iter_objects(Path(filepath), **kwargs)):
+                instances.append(instance)
+        except BadLinesInExcelError as lines_error:
+            lines_error.objects = instances
+            raise lines_error
+        return instances
+
+    @classmethod
+    def to_table(cls, filepath: Path, columns: Optional[Iterable[str]] = None, **kwargs) -> pa.Table:
+        """Returns the table of the file, or of all partitions of a dataset, without creating objects."""
+        if columns is not None:
+            columns = {'typeURI', *columns}
+        tables = []
+        for file_path, type_uri in cls._get_files(Path(filepath)):
+            file_columns = None if columns is None else [
+                name for name in pq.read_schema(file_path).names if name in columns]
+            table = pq.read_table(file_path, columns=file_columns)
+            if type_uri is not None:
+                table = table.append_column('typeURI', pa.array([type_uri] * table.num_rows, pa.string()))
+            tables.append(table)
+        if len(tables) == 1:
+            return tables[0]
+        return pa.concat_tables(tables, promote_options='default')
+
+    @classmethod
+    def _iter_objects(cls, filepath: Path, model_directory: Optional[Path] = None,
+                      columns: Optional[Iterable[str]] = None, batch_size: Optional[int] = None,
+                      on_line_error: Optional[Callable[[ErrorInExcelLine], None]] = None,
+                      **kwargs) -> Generator[OTLObject, None, None]:
+        lines_error = BadLinesInExcelError()
+        if on_line_error is None:
+            on_line_error = lines_error.add_exception
+        convert_kwargs = dict(
+            separator=kwargs.get('separator', SEPARATOR),
+            cardinality_separator=kwargs.get('cardinality_separator', CARDINALITY_SEPARATOR),
+            cardinality_indicator=kwargs.get('cardinality_indicator', CARDINALITY_INDICATOR),
+            waarde_shortcut=kwargs.get('waarde_shortcut', WAARDE_SHORTCUT),
+            allow_non_otl_conform_attributes=kwargs.get('allow_non_otl_conform_attributes',
+                                                        ALLOW_NON_OTL_CONFORM_ATTRIBUTES),
+            warn_for_non_otl_conform_attributes=kwargs.get('warn_for_non_otl_conform_attributes',
+                                                           WARN_FOR_NON_OTL_CONFORM_ATTRIBUTES),
+            combine_errors=kwargs.get('combine_errors', False),
+            # lists are stored as lists, only columns that mix clearing values and lists are stored as text
+            cast_list=True, cast_datetime=False)
+        if columns is not None:
+            columns = {'typeURI', *columns}
+
+        rows_done = 0
+        for file_path, type_uri in cls._get_files(filepath):
+            parquet_file = pq.ParquetFile(file_path)
+            file_columns = None if columns is None else [
+                name for name in parquet_file.schema_arrow.names if name in columns]
+            for table in cls._iter_file_tables(parquet_file, batch_size=batch_size, columns=file_columns):
+                if type_uri is not None:
+                    table = table.append_column('typeURI', pa.array([type_uri] * table.num_rows, pa.string()))
+                yield from PyArrowConverter.iter_table_to_objects(
+                    table=table, model_directory=model_directory, on_line_error=on_line_error,
+                    additional_header_lines=rows_done, **convert_kwargs)
+                rows_done += table.num_rows
+
+        if lines_error.exceptions:
+            raise lines_error
+
+    @staticmethod
+    def _iter_file_tables(parquet_file: pq.ParquetFile, batch_size: Optional[int], columns: Optional[list[str]]
+                          ) -> Generator[pa.Table, None, None]:
+        """Yields the file one row group at a time, or in batches of batch_size rows if given."""
+        if batch_size is None:
+            for index in range(parquet_file.num_row_groups):
+                yield parquet_file.read_row_group(index, columns=columns)
+            return
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield pa.Table.from_batches([batch])
+
+    @classmethod
+    def _get_files(cls, filepath: Path) -> list[tuple[Path, Optional[str]]]:
+        """Returns the parquet files to read, with the typeURI of their partition for a partitioned dataset."""
+        if not filepath.is_dir():
+            return [(filepath, None)]
+        files = []
+        for partition_directory in sorted(filepath.iterdir()):
+            if not partition_directory.is_dir() or not partition_directory.name.startswith(PARTITION_KEY):
+                continue
+            type_uri = unquote(partition_directory.name[len(PARTITION_KEY):])
+            files.extend((file_path, type_uri) for file_path in sorted(partition_directory.glob('*.parquet')))
+        return files
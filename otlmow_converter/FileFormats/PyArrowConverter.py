@@ -1,13 +1,24 @@
+import inspect
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Callable, Generator
 
 import pyarrow as pa
-from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
-from otlmow_model.OtlmowModel.Helpers.GenericHelper import get_shortened_uri
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject, dynamic_create_type_from_uri
+from otlmow_model.OtlmowModel.Exceptions.CouldNotConvertToCorrectTypeError import CouldNotConvertToCorrectTypeError
+from otlmow_model.OtlmowModel.Exceptions.CouldNotCreateInstanceError import CouldNotCreateInstanceError
+from otlmow_model.OtlmowModel.Exceptions.CouldNotCreateRelationError import CouldNotCreateRelationError
 from pyarrow import Table
 
-from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter, COMBINABLE_ERROR_NAMES
+from otlmow_converter.DotnotationSetterPlan import SETTER_PLAN_CACHE
+from otlmow_converter.Exceptions.BadLinesInExcelError import BadLinesInExcelError
+from otlmow_converter.Exceptions.ErrorInExcelLine import ErrorInExcelLine
+from otlmow_converter.Exceptions.MultipleAttributeError import MultipleAttributeError
+from otlmow_converter.Exceptions.OTLAttributeError import OTLAttributeError
+from otlmow_converter.FileFormats.ArrowTableBuilder import ArrowTableBuilder, BATCH_SIZE
 from otlmow_converter.FileFormats.DotnotationTableConverter import DotnotationTableConverter
+from otlmow_converter.ObjectPayloadConverter import ObjectPayloadConverter
 from otlmow_converter.SettingsManager import load_settings, GlobalVariables
 
 load_settings()
@@ -16,6 +27,8 @@ SEPARATOR = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['separa
 CARDINALITY_SEPARATOR = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['cardinality_separator']
 CARDINALITY_INDICATOR = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['cardinality_indicator']
 WAARDE_SHORTCUT = GlobalVariables.settings['formats']['OTLMOW']['dotnotation']['waarde_shortcut']
+WORKER_BATCH_SIZE = 5000
+
 
 class PyArrowConverter:
     @classmethod
@@ -24,78 +37,238 @@ class PyArrowConverter:
             cardinality_separator: str = CARDINALITY_SEPARATOR, cardinality_indicator: str = CARDINALITY_INDICATOR,
             cast_list: bool = False, cast_datetime: bool = False, allow_non_otl_conform_attributes: bool = True,
             warn_for_non_otl_conform_attributes: bool = True, allow_empty_asset_id: bool = True,
-            avoid_multiple_types_in_single_column: bool = False
-    ) -> pa.Table:
-        # Convert each object to a dotnotation dict
-        dict_list = [DotnotationDictConverter.to_dict(
-            otl_object=obj, cast_list=cast_list, cast_datetime=cast_datetime, waarde_shortcut=waarde_shortcut,
-            separator=separator, cardinality_indicator=cardinality_indicator,
-            cardinality_separator=cardinality_separator,
-            collect_native_types=avoid_multiple_types_in_single_column,
+            avoid_multiple_types_in_single_column: bool = False, batch_size: int = BATCH_SIZE) -> pa.Table:
+        """Builds the table with ArrowTableBuilder, in record batches of batch_size objects. The type of each column
+        is taken from the model (see ArrowTableBuilder.get_arrow_type). Columns of attributes that are not in the
+        model are inferred from the values. Columns of which the values do not fit the type (clearing values) or
+        that have a different type per class become text columns.
+        avoid_multiple_types_in_single_column is kept for backwards compatibility, the columns are always typed
+        after the model."""
+        return ArrowTableBuilder.build_table(
+            list_of_objects, batch_size=batch_size, waarde_shortcut=waarde_shortcut, separator=separator,
+            cardinality_separator=cardinality_separator, cardinality_indicator=cardinality_indicator,
+            cast_list=cast_list, cast_datetime=cast_datetime,
             allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
             warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-            for obj in list_of_objects]
-
-        if not dict_list:
-            return pa.table({})
-
-        # Collect all keys in a single pass but remove the '_native_type_dict' key if present
-        all_keys = sorted(set().union(*(d.keys() for d in dict_list)))
-        if avoid_multiple_types_in_single_column:
-            all_keys.remove('_native_type_dict')
-            for d in dict_list:
-                d.pop('_native_type_dict', None)  # Remove native types if present
-
-        # Normalize dicts so all have all keys
-        if any(len(d) != len(all_keys) for d in dict_list):
-            normalized_dict_list = []
-            for d in dict_list:
-                if len(d) == len(all_keys):
-                    normalized_dict_list.append(d)
-                else:
-                    normalized_dict_list.append({k: d.get(k, None) for k in all_keys})
-            dict_list = normalized_dict_list
-
-        # Build schema: auto-detect for all columns except the ones listed below
-        if avoid_multiple_types_in_single_column:
-            str_columns = {'aanleg','aansluitvermogen','aantalAdersEnSectie','afmeting','afmetingGrondvlak','afmetingen','appurtenanceType','armlengte','autonomie','beheeroptie','bijlage','brandweerstand','breedte','buitendiameter','code','communicatiewijze','detectieprincipe','diameter','diameterPaalschacht','diepte','dikte','droogzetbaarheid','fabrikant','foto','frequentierange','functie','gebruik','gewicht','hellingshoek','hoogte','hoogteBovenMaaiveld','kaliber','kleur','laagtype','lengte','licentie','lichtpuntHoogte','masthoogte','masttype','materiaal','maximaalDebiet','merk','modelnaam','nominaalVermogen','nominaleSpanning','ontwerpbelasting','opschrift','opstelHoogte','opstelling','paallengte','plaatsingswijze','productfamilie','protocol','rijrichting','rijstrook','schermelementtype','sluitkracht','soort','soortLamp','soortOmschrijving','spanning','subthema','totaleLengte','type','typeBevestiging','typeSpecificatie','uitvoering','uitvoeringsmethode','uitvoeringswijze','vermogen','vorm','vormgeving'}
-            str_columns = {col for base in str_columns for col in (base, f"{base}[]")}
-            for key in all_keys:
-                if key in str_columns:
-                    for d in dict_list:
-                        if key in d and d[key] is not None and not isinstance(d[key], str):
-                            d[key] = str(d[key])
-
-        return pa.Table.from_pylist(dict_list)
 
     @classmethod
     def convert_objects_to_multiple_tables(cls, list_of_objects: Iterable, waarde_shortcut: bool = WAARDE_SHORTCUT, separator: str = SEPARATOR,
             cardinality_separator: str = CARDINALITY_SEPARATOR, cardinality_indicator: str = CARDINALITY_INDICATOR,
             cast_list: bool = False, cast_datetime: bool = False, allow_non_otl_conform_attributes: bool = True,
-            warn_for_non_otl_conform_attributes: bool = True, allow_empty_asset_id: bool = True) -> dict[str, pa.Table]:
-        from collections import defaultdict
-        type_to_objs = defaultdict(list)
-        for otl_object in list_of_objects:
-            if otl_object.typeURI == 'http://purl.org/dc/terms/Agent':
-                short_uri = 'Agent'
-            else:
-                short_uri = get_shortened_uri(otl_object.typeURI)
-            type_to_objs[short_uri].append(otl_object)
-        return {short_uri: cls.convert_objects_to_single_table(
-            list_of_objects=objs, cast_list=cast_list, cast_datetime=cast_datetime, waarde_shortcut=waarde_shortcut,
-            separator=separator, cardinality_indicator=cardinality_indicator,
-            cardinality_separator=cardinality_separator,
+            warn_for_non_otl_conform_attributes: bool = True, allow_empty_asset_id: bool = True,
+            batch_size: int = BATCH_SIZE) -> dict[str, pa.Table]:
+        """Builds a table per type, from the record batches of ArrowTableBuilder.iter_batches_per_type."""
+        builder_kwargs = dict(
+            waarde_shortcut=waarde_shortcut, separator=separator, cardinality_separator=cardinality_separator,
+            cardinality_indicator=cardinality_indicator, cast_list=cast_list, cast_datetime=cast_datetime,
             allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
             warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
-            for short_uri, objs in type_to_objs.items()}
+        batches: dict[str, list[pa.RecordBatch]] = {}
+        for short_uri, batch in ArrowTableBuilder.iter_batches_per_type(list_of_objects, batch_size=batch_size,
+                                                                         **builder_kwargs):
+            batches.setdefault(short_uri, []).append(batch)
+        return {short_uri: ArrowTableBuilder.concat_batches(type_batches, cardinality_separator=cardinality_separator)
+                for short_uri, type_batches in batches.items()}
 
     @classmethod
     def convert_table_to_objects(cls, table: Table, model_directory: Path = None, **kwargs) -> Iterable[OTLObject]:
-        headers = list(table.column_names)
-        header_dict = {header: idx for idx, header in enumerate(headers)}
-        dict_list = [header_dict] + [
-            {k: (None if v is pa.NA else v) for k, v in row.items()}
-            for row in table.to_pylist()
-        ]
-
-        return DotnotationTableConverter.get_data_from_table(table_data=dict_list, model_directory=model_directory, **kwargs)
+        instances = []
+        try:
+            instances.extend(cls.iter_table_to_objects(table=table, model_directory=model_directory, **kwargs))
+        except BadLinesInExcelError as lines_error:
+            lines_error.objects = instances
+            raise lines_error
+        return instances
+
+    @classmethod
+    def iter_table_to_objects(cls, table: Table, model_directory: Path = None,
+                              on_line_error: Callable[[ErrorInExcelLine], None] = None,
+                              **kwargs) -> Generator[OTLObject, None, None]:
+        """Builds the objects column by column: each column is converted to python values once, the setter plan of
+        each column is resolved once per type and the values are assigned directly, without creating a dict per row.
+        Gives the same objects and line errors as DotnotationTableConverter.iter_data_from_table.
+        With workers > 1 the rows are split in batches of worker_batch_size rows that are converted in separate
+        processes. The objects are still returned in the order of the rows. OTL objects can not be pickled, so the
+        workers return payloads and the objects are created again in this process. Creating the instances is about
+        half the work of a row, which limits the speedup to about 2x, whatever the number of workers. No more
+        processes are started than there are CPUs."""
+        workers = ObjectPayloadConverter.get_process_count(kwargs.pop('workers', None))
+        worker_batch_size = kwargs.pop('worker_batch_size', WORKER_BATCH_SIZE)
+        if workers > 1 and table.num_rows > worker_batch_size:
+            yield from cls._iter_table_to_objects_in_processes(
+                table=table, model_directory=model_directory, on_line_error=on_line_error, workers=workers,
+                worker_batch_size=worker_batch_size, **kwargs)
+            return
+
+        if 'typeURI' not in table.column_names:
+            yield from DotnotationTableConverter.iter_data_from_table(
+                table_data=cls._iter_table_as_dicts(table), model_directory=model_directory,
+                on_line_error=on_line_error, **kwargs)
+            return
+
+        yield from cls.iter_columns_to_objects(
+            type_uris=table.column('typeURI').to_pylist(),
+            columns=[(name, table.column(name).to_pylist()) for name in table.column_names if name != 'typeURI'],
+            model_directory=model_directory, on_line_error=on_line_error, **kwargs)
+
+    @classmethod
+    def iter_columns_to_objects(cls, type_uris: list, columns: list[tuple[str, list]], model_directory: Path = None,
+                                on_line_error: Callable[[ErrorInExcelLine], None] = None,
+                                **kwargs) -> Generator[OTLObject, None, None]:
+        """Builds an object per row from the typeURI of each row and the name and python values of the other columns,
+        None being an empty cell. See iter_table_to_objects."""
+        cast_list = kwargs.get('cast_list', False)
+        cast_datetime = kwargs.get('cast_datetime', False)
+        allow_non_otl_conform_attributes = kwargs.get('allow_non_otl_conform_attributes', True)
+        warn_for_non_otl_conform_attributes = kwargs.get('warn_for_non_otl_conform_attributes', True)
+        waarde_shortcut = kwargs.get('waarde_shortcut', WAARDE_SHORTCUT)
+        separator = kwargs.get('separator', SEPARATOR)
+        cardinality_indicator = kwargs.get('cardinality_indicator', CARDINALITY_INDICATOR)
+        cardinality_separator = kwargs.get('cardinality_separator', CARDINALITY_SEPARATOR)
+        combine_errors = kwargs.get('combine_errors', False)
+        additional_header_lines = kwargs.get('additional_header_lines', 0)
+
+        if model_directory is None:
+            model_directory = Path(inspect.getfile(OTLObject)).parent.parent.parent
+
+        types_by_uri: dict[str, type | Exception] = {}
+        setters_by_type: dict[type, list] = {}
+
+        lines_error = BadLinesInExcelError()
+        for row_nr, type_uri in enumerate(type_uris):
+            try:
+                instance = cls._create_instance(type_uri, model_directory, types_by_uri)
+                setters = setters_by_type.get(type(instance))
+                if setters is None:
+                    setters = cls._resolve_column_setters(
+                        instance, columns, separator=separator, cardinality_indicator=cardinality_indicator,
+                        waarde_shortcut=waarde_shortcut)
+                    setters_by_type[type(instance)] = setters
+
+                error_collector = None
+                if combine_errors:
+                    error_collector = MultipleAttributeError(
+                        f'At least one error occurred while converting from dict to an instance of {type_uri}, '
+                        f'see attribute exceptions for details.')
+                for name, values, plan, is_private in setters:
+                    value = values[row_nr]
+                    if value is None:
+                        continue
+                    if is_private:
+                        raise ValueError(f'{name} is a non standardized attribute of {instance.__class__.__name__}. '
+                                         f'While this is supported, the key can not start with "_".')
+                    try:
+                        if plan is None or (cast_list and isinstance(value, list) and not value):
+                            DotnotationDictConverter.set_attribute_by_dotnotation(
+                                instance, dotnotation=name, value=value, separator=separator,
+                                cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut,
+                                cardinality_separator=cardinality_separator, cast_datetime=cast_datetime,
+                                cast_list=cast_list, allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+                        else:
+                            plan.set_value(
+                                instance, value=value, cardinality_separator=cardinality_separator,
+                                cast_datetime=cast_datetime, cast_list=cast_list,
+                                allow_non_otl_conform_attributes=allow_non_otl_conform_attributes,
+                                warn_for_non_otl_conform_attributes=warn_for_non_otl_conform_attributes)
+                    except Exception as e:
+                        if error_collector is None or e.__class__.__name__ not in COMBINABLE_ERROR_NAMES:
+                            raise
+                        error_collector.add_exception(OTLAttributeError(
+                            message=e.args[0], attribute_dotnotation=name, attribute_value=value, orig_exception=e))
+                if error_collector is not None and error_collector.exceptions:
+                    raise error_collector
+            except (ValueError, CouldNotConvertToCorrectTypeError, CouldNotCreateInstanceError,
+                    CouldNotCreateRelationError, MultipleAttributeError) as e:
+                line_number = row_nr + 2 + additional_header_lines
+                line_error = ErrorInExcelLine(
+                    message=f'Error creating instance from line {line_number}: {e}',
+                    line_number=line_number, error=e)
+                if on_line_error is not None:
+                    on_line_error(line_error)
+                else:
+                    lines_error.add_exception(line_error)
+                continue
+            yield instance
+
+        if lines_error.exceptions:
+            raise lines_error
+
+    @classmethod
+    def _iter_table_to_objects_in_processes(cls, table: Table, model_directory: Path,
+                                            on_line_error: Callable[[ErrorInExcelLine], None], workers: int,
+                                            worker_batch_size: int, **kwargs) -> Generator[OTLObject, None, None]:
+        if model_directory is None:
+            model_directory = Path(inspect.getfile(OTLObject)).parent.parent.parent
+        additional_header_lines = kwargs.pop('additional_header_lines', 0)
+        offsets = range(0, table.num_rows, worker_batch_size)
+        batches = ((cls._serialize_table(table.slice(offset, worker_batch_size)), model_directory, kwargs)
+                   for offset in offsets)
+
+        lines_error = BadLinesInExcelError()
+        handle_line_error = lines_error.add_exception if on_line_error is None else on_line_error
+        types_by_uri = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = ObjectPayloadConverter.map_in_processes(
+                executor, cls._convert_batch_to_payloads, batches, max_pending=2 * workers)
+            for offset, result in zip(offsets, results):
+                yield from ObjectPayloadConverter.iter_objects_from_payloads(
+                    result, model_directory=model_directory, types_by_uri=types_by_uri,
+                    convert_row_again=lambda row_nr: cls.iter_table_to_objects(
+                        table=table.slice(offset + row_nr, 1), model_directory=model_directory,
+                        on_line_error=handle_line_error,
+                        additional_header_lines=additional_header_lines + offset + row_nr, **kwargs))
+
+        if lines_error.exceptions:
+            raise lines_error
+
+    @classmethod
+    def _convert_batch_to_payloads(cls, serialized_table: bytes, model_directory: Path,
+                                   kwargs: dict) -> tuple[list, list]:
+        """Runs in a worker process, see ObjectPayloadConverter.convert_to_payloads."""
+        table = pa.ipc.open_stream(serialized_table).read_all()
+        return ObjectPayloadConverter.convert_to_payloads(
+            lambda on_line_error: cls.iter_table_to_objects(
+                table=table, model_directory=model_directory, additional_header_lines=0,
+                on_line_error=on_line_error, **kwargs),
+            row_count=table.num_rows)
+
+    @classmethod
+    def _serialize_table(cls, table: Table) -> bytes:
+        # pickling a slice would copy the buffers of the whole table
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    @classmethod
+    def _create_instance(cls, type_uri: str, model_directory: Path, types_by_uri: dict) -> OTLObject:
+        if type_uri is None:
+            raise ValueError('typeURI is None. Add a valid typeURI to the input dictionary.')
+        type_ = types_by_uri.get(type_uri)
+        if type_ is None:
+            try:
+                type_ = dynamic_create_type_from_uri(str(type_uri), model_directory=model_directory)
+            except TypeError as e:
+                raise ValueError('typeURI is invalid. Add a valid typeURI to the input dictionary.') from e
+            types_by_uri[type_uri] = type_
+        return type_()
+
+    @classmethod
+    def _resolve_column_setters(cls, instance: OTLObject, columns: list[tuple[str, list]], separator: str,
+                                cardinality_indicator: str, waarde_shortcut: bool) -> list:
+        setters = []
+        for name, values in columns:
+            is_private = name.startswith('_')
+            plan = None if is_private else SETTER_PLAN_CACHE.get_plan(
+                instance, dotnotation=name, separator=separator, cardinality_indicator=cardinality_indicator,
+                waarde_shortcut=waarde_shortcut)
+            setters.append((name, values, plan, is_private))
+        return setters
+
+    @classmethod
+    def _iter_table_as_dicts(cls, table: Table) -> Generator[dict, None, None]:
+        yield {header: idx for idx, header in enumerate(table.column_names)}
+        for batch in table.to_batches():
+            for row in batch.to_pylist():
+                yield {k: (None if v is pa.NA else v) for k, v in row.items()}
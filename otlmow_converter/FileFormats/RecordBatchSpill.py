@@ -0,0 +1,75 @@
+import tempfile
+from pathlib import Path
+from typing import Callable, ContextManager, Generator, Optional
+
+import pyarrow as pa
+
+from otlmow_converter.FileFormats.ArrowTableBuilder import ArrowTableBuilder, CARDINALITY_SEPARATOR
+
+
+class RecordBatchSpill:
+    """Keeps record batches in a temporary directory until they are written to one file, so a file is written one
+    batch at a time. The batches can have different columns, as the schema of the file is only known when all
+    batches are added: missing columns are null, columns with a different type per batch become text columns, as in
+    ArrowTableBuilder.concat_batches. Only the schemas of the batches are kept in memory."""
+
+    def __init__(self, cardinality_separator: str = CARDINALITY_SEPARATOR):
+        self.cardinality_separator = cardinality_separator
+        self._directory: Optional[tempfile.TemporaryDirectory] = None
+        self._schemas: list[pa.Schema] = []
+        self.num_rows = 0
+
+    def __enter__(self) -> 'RecordBatchSpill':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+    def add(self, batch: pa.RecordBatch) -> None:
+        if self._directory is None:
+            self._directory = tempfile.TemporaryDirectory(prefix='otlmow_spill_')
+        with pa.ipc.new_file(str(self._get_batch_path(len(self._schemas))), batch.schema) as writer:
+            writer.write_batch(batch)
+        self._schemas.append(batch.schema)
+        self.num_rows += batch.num_rows
+
+    def get_schema(self) -> pa.Schema:
+        """Returns the schema that fits all added batches, with the columns sorted by name."""
+        if len(self._schemas) == 1:
+            return self._schemas[0]
+        types_per_name: dict[str, list[pa.DataType]] = {}
+        for schema in self._schemas:
+            for field in schema:
+                types_per_name.setdefault(field.name, []).append(field.type)
+        return pa.schema([(name, ArrowTableBuilder.get_common_type(types_per_name[name]))
+                          for name in sorted(types_per_name)])
+
+    def iter_batches(self, schema: Optional[pa.Schema] = None) -> Generator[pa.RecordBatch, None, None]:
+        """Yields the added batches in the given schema, by default get_schema(). Columns that are not in the schema
+        are left out, columns of the schema that are not in a batch are null."""
+        if schema is None:
+            schema = self.get_schema()
+        for index in range(len(self._schemas)):
+            with pa.memory_map(str(self._get_batch_path(index))) as source:
+                batch = pa.ipc.open_file(source).get_batch(0)
+                yield pa.RecordBatch.from_arrays([
+                    pa.nulls(batch.num_rows, field.type) if field.name not in batch.schema.names else
+                    ArrowTableBuilder.cast_array(batch.column(field.name), field.type, self.cardinality_separator)
+                    for field in schema], schema=schema)
+
+    def write(self, open_writer: Callable[[pa.Schema], ContextManager], schema: Optional[pa.Schema] = None) -> None:
+        """Writes the batches with the writer that open_writer returns for the schema, e.g. a pyarrow.parquet
+        ParquetWriter, pyarrow.ipc.new_file or pyarrow.csv.CSVWriter."""
+        if schema is None:
+            schema = self.get_schema()
+        with open_writer(schema) as writer:
+            for batch in self.iter_batches(schema):
+                writer.write_batch(batch)
+
+    def _get_batch_path(self, index: int) -> Path:
+        return Path(self._directory.name) / f'{index}.arrow'
@@ -0,0 +1,216 @@
+import posixpath
+import zipfile
+from pathlib import Path
+from typing import Generator
+
+import openpyxl
+from lxml import etree
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel, from_ISO8601
+from openpyxl.xml.functions import fromstring
+
+SHEET_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+WORKBOOK_PART = 'xl/workbook.xml'
+WORKBOOK_RELS_PART = 'xl/_rels/workbook.xml.rels'
+SHARED_STRINGS_PART = 'xl/sharedStrings.xml'
+STYLES_PART = 'xl/styles.xml'
+
+SHEET_TAG = f'{{{SHEET_MAIN_NS}}}sheet'
+WORKBOOK_PR_TAG = f'{{{SHEET_MAIN_NS}}}workbookPr'
+RELATIONSHIP_TAG = f'{{{PACKAGE_RELATIONSHIPS_NS}}}Relationship'
+ROW_TAG = f'{{{SHEET_MAIN_NS}}}row'
+CELL_TAG = f'{{{SHEET_MAIN_NS}}}c'
+VALUE_TAG = f'{{{SHEET_MAIN_NS}}}v'
+FORMULA_TAG = f'{{{SHEET_MAIN_NS}}}f'
+INLINE_STRING_TAG = f'{{{SHEET_MAIN_NS}}}is'
+SHARED_STRING_TAG = f'{{{SHEET_MAIN_NS}}}si'
+TEXT_TAG = f'{{{SHEET_MAIN_NS}}}t'
+RICH_TEXT_RUN_TAG = f'{{{SHEET_MAIN_NS}}}r'
+
+DIGITS = '0123456789'
+
+
+class _UnsupportedContent(Exception):
+    """Content the reader does not handle itself, it is read with openpyxl instead."""
+
+
+class XlsxSheetReader:
+    """Reads the cell values of the worksheets of an xlsx file straight from the xml of the sheets with lxml.
+    The rows are the same as openpyxl gives with load_workbook(read_only=True, data_only=True), reset_dimensions() and
+    iter_rows(values_only=True), but without building the openpyxl workbook and cells. The dimension tag of a sheet
+    is ignored, as other tools do not always write it right: every row of the sheet data is read, each as long as its
+    last cell.
+    Anything unusual is left to openpyxl: a file without the usual parts is read with openpyxl as a whole, a sheet
+    with a cell this reader does not handle (e.g. a formula without cached value) is read with openpyxl from the row
+    of that cell on."""
+
+    def __init__(self, filepath: Path):
+        self.filepath = filepath
+        self.archive = zipfile.ZipFile(filepath)
+        self._openpyxl_book = None
+        try:
+            self.sheets, self.epoch = self._read_workbook()
+            self.date_formats, self.timedelta_formats = self._read_date_formats()
+            self.shared_strings = self._read_shared_strings()
+        except (KeyError, ValueError, etree.XMLSyntaxError, _UnsupportedContent):
+            self.sheets = None
+
+    def __enter__(self) -> 'XlsxSheetReader':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._openpyxl_book is not None:
+            self._openpyxl_book.close()
+            self._openpyxl_book = None
+        self.archive.close()
+
+    def iter_sheets(self) -> Generator[tuple[str, Generator[tuple, None, None]], None, None]:
+        """Yields the title and a generator of the value rows of each worksheet, in the order of the workbook."""
+        if self.sheets is None:
+            for sheet in self._get_openpyxl_book().worksheets:
+                sheet.reset_dimensions()
+                yield sheet.title, sheet.iter_rows(values_only=True)
+            return
+        for title, part_name in self.sheets:
+            yield title, self._iter_rows(title, part_name)
+
+    def _get_openpyxl_book(self):
+        if self._openpyxl_book is None:
+            self._openpyxl_book = openpyxl.load_workbook(self.filepath, read_only=True, data_only=True)
+        return self._openpyxl_book
+
+    def _read_workbook(self) -> tuple[list[tuple[str, str]], object]:
+        if WORKBOOK_PART not in self.archive.namelist():
+            raise _UnsupportedContent(WORKBOOK_PART)
+        workbook = fromstring(self.archive.read(WORKBOOK_PART))
+        workbook_pr = workbook.find(WORKBOOK_PR_TAG)
+        epoch = WINDOWS_EPOCH
+        if workbook_pr is not None and workbook_pr.get('date1904') in {'1', 'true'}:
+            epoch = MAC_EPOCH
+
+        worksheet_targets = {}
+        for relationship in fromstring(self.archive.read(WORKBOOK_RELS_PART)).iter(RELATIONSHIP_TAG):
+            if not relationship.get('Type', '').endswith('/worksheet'):
+                continue
+            target = relationship.get('Target')
+            if target.startswith('/'):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(posixpath.dirname(WORKBOOK_PART), target))
+            worksheet_targets[relationship.get('Id')] = target
+
+        part_names = set(self.archive.namelist())
+        sheets = []
+        for sheet in workbook.iter(SHEET_TAG):
+            target = worksheet_targets.get(sheet.get(f'{{{RELATIONSHIPS_NS}}}id'))
+            if target in part_names:
+                sheets.append((sheet.get('name'), target))
+        return sheets, epoch
+
+    def _read_date_formats(self) -> tuple[set[int], set[int]]:
+        # the detection of date formats is left to openpyxl, the styles are small compared to the sheets
+        if STYLES_PART not in self.archive.namelist():
+            return set(), set()
+        stylesheet = Stylesheet.from_tree(fromstring(self.archive.read(STYLES_PART)))
+        return stylesheet.date_formats, stylesheet.timedelta_formats
+
+    def _read_shared_strings(self) -> list[str]:
+        if SHARED_STRINGS_PART not in self.archive.namelist():
+            return []
+        shared_strings = []
+        with self.archive.open(SHARED_STRINGS_PART) as source:
+            for _, element in etree.iterparse(source, tag=SHARED_STRING_TAG, resolve_entities=False):
+                shared_strings.append(self._get_text_content(element).replace('x005F_', ''))
+                element.clear()
+        return shared_strings
+
+    @classmethod
+    def _get_text_content(cls, element) -> str:
+        # the plain text and the text of the rich text runs, not the phonetic runs
+        if len(element) == 1 and element[0].tag == TEXT_TAG:
+            return element[0].text or ''
+        snippets = []
+        plain = element.find(TEXT_TAG)
+        if plain is not None and plain.text is not None:
+            snippets.append(plain.text)
+        for run in element.iterfind(RICH_TEXT_RUN_TAG):
+            text = run.findtext(TEXT_TAG)
+            if text:
+                snippets.append(text)
+        return ''.join(snippets)
+
+    def _iter_rows(self, title: str, part_name: str) -> Generator[tuple, None, None]:
+        next_row_number = 1
+        with self.archive.open(part_name) as source:
+            for _, element in etree.iterparse(source, tag=ROW_TAG, resolve_entities=False):
+                row_number = element.get('r')
+                row_number = next_row_number if row_number is None else int(row_number)
+                if row_number >= next_row_number:
+                    # missing rows are returned empty, like openpyxl does
+                    for _ in range(next_row_number, row_number):
+                        yield ()
+                    try:
+                        values = self._get_row_values(element)
+                    except (_UnsupportedContent, ValueError, IndexError, OverflowError):
+                        sheet = self._get_openpyxl_book()[title]
+                        sheet.reset_dimensions()
+                        yield from sheet.iter_rows(min_row=row_number, values_only=True)
+                        return
+                    next_row_number = row_number + 1
+                    yield values
+
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    def _get_row_values(self, row_element) -> tuple:
+        cells = {}
+        column = 0
+        for cell in row_element.iterchildren(CELL_TAG):
+            reference = cell.get('r')
+            column = column + 1 if reference is None else column_index_from_string(reference.rstrip(DIGITS))
+            cells[column] = self._get_cell_value(cell)
+        values = [None] * column
+        for column, value in cells.items():
+            values[column - 1] = value
+        return tuple(values)
+
+    def _get_cell_value(self, cell):
+        data_type = cell.get('t', 'n')
+        value = None
+        has_formula = False
+        for child in cell:
+            tag = child.tag
+            if tag == VALUE_TAG:
+                value = child.text
+            elif tag == FORMULA_TAG:
+                has_formula = True
+            elif tag == INLINE_STRING_TAG and data_type == 'inlineStr':
+                return self._get_text_content(child)
+
+        if not value or data_type == 'inlineStr':
+            if has_formula:
+                raise _UnsupportedContent('formula without cached value')
+            return None
+        if data_type == 's':
+            return self.shared_strings[int(value)]
+        if data_type == 'n':
+            value = float(value) if ('.' in value or 'E' in value or 'e' in value) else int(value)
+            style_id = int(cell.get('s', 0))
+            if style_id in self.date_formats:
+                return from_excel(value, self.epoch, timedelta=style_id in self.timedelta_formats)
+            return value
+        if data_type == 'b':
+            return bool(int(value))
+        if data_type in {'str', 'e'}:
+            return value
+        if data_type == 'd':
+            return from_ISO8601(value)
+        raise _UnsupportedContent(f'cell type {data_type}')
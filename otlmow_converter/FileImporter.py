@@ -20,6 +20,13 @@ class FileImporter:
         elif extension in {'xls', 'xlsx'}:
             from otlmow_converter.FileFormats.ExcelImporter import ExcelImporter
             return ExcelImporter()
+        elif extension == 'parquet':
+            from otlmow_converter.FileFormats.ParquetImporter import ParquetImporter
+            return ParquetImporter()
+        elif extension in {'arrow', 'feather'}:
+            from otlmow_converter.FileFormats.ArrowImporter import ArrowImporter
+            return ArrowImporter()
         else:
             raise InvalidExtensionError('This file has an invalid extension. '
-                                        'Supported file formats are: csv, json, xlsx, xls, geojson, jsonld')
+                                        'Supported file formats are: csv, json, xlsx, xls, geojson, jsonld, parquet, '
+                                        'arrow, feather')
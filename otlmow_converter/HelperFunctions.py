@@ -1,16 +1,27 @@
+import warnings
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Sequence, Union
 
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject
 
+from otlmow_converter.DotnotationDict import DotnotationDict
 from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
+from otlmow_converter.DotnotationHelper import DotnotationHelper
 from otlmow_converter.Exceptions.ExceptionsGroup import ExceptionsGroup
 from otlmow_converter.Exceptions.CannotCombineAssetsError import CannotCombineAssetsError
 from otlmow_converter.Exceptions.CannotCombineDifferentAssetsError import CannotCombineDifferentAssetsError, \
     CannotCombineAssetsWithDifferentIdError, CannotCombineAssetsWithDifferentTypeError
 from otlmow_converter.Exceptions.NoIdentificatorError import NoIdentificatorError
+from otlmow_converter.ObjectPayloadConverter import ObjectPayloadConverter
 from otlmow_converter.OtlmowConverter import OtlmowConverter
 
+AGENT_TYPE_URI = 'http://purl.org/dc/terms/Agent'
+ASSET_ID_KEY = 'assetId.identificator'
+AGENT_ID_KEY = 'agentId.identificator'
+NUMBER_TYPES = (int, float)
+
 
 def wrap_in_quotes(text: str) -> str:
     if not isinstance(text, str):
@@ -24,47 +35,42 @@ def wrap_in_quotes(text: str) -> str:
     return "'" + text.replace("'", "\\'") + "'" if singles > 0 else f"'{text}'"
 
 
-def combine_files(list_of_files: list[Path], model_directory: Path = None) -> list[OTLObject]:
+def combine_files(list_of_files: list[Path], model_directory: Path = None, workers: int = None) -> list[OTLObject]:
+    """Reads the files and combines the assets with the same id into one asset.
+    Use workers=N to read the files in N processes, the workers send the assets back as dotnotation dicts.
+    The assets with the same id are merged in one pass over their dotnotation dicts (see combine_asset_instances),
+    so each combined asset is created once.
+    All errors (of reading a file or combining assets) are raised together in an ExceptionsGroup."""
     assets_dict = defaultdict(list)
     list_of_errors = []
-    for file_path in list_of_files:
-        try:
-            file_assets = OtlmowConverter.from_file_to_objects(file_path, model_directory=model_directory)
-        except Exception as ex:
-            ex.file_path = file_path
-            list_of_errors.append(ex)
+    for file_path, file_assets in _load_files(list_of_files, model_directory=model_directory, workers=workers):
+        if isinstance(file_assets, Exception):
+            file_assets.file_path = file_path
+            list_of_errors.append(file_assets)
             continue
         for asset in file_assets:
-            id = asset.assetId.identificator if asset.typeURI != 'http://purl.org/dc/terms/Agent' \
-                else asset.agentId.identificator
-            assets_dict[id].append((file_path, asset))
+            assets_dict[_get_identificator(asset)].append((file_path, asset))
 
     combined_assets = []
 
     for object_id, asset_tuple_list in assets_dict.items():
-        if len(asset_tuple_list) == 1:
-            combined_assets.append(asset_tuple_list[0])
-            continue
         try:
-            combined_asset = combine_two_asset_instances(asset_tuple_list[0][1], asset_tuple_list[1][1],
-                                                         model_directory)
-            for asset in asset_tuple_list[2:]:
-                combined_asset = combine_two_asset_instances(combined_asset, asset[1], model_directory)
-            combined_assets.append(combined_asset)
+            combined_assets.append(combine_asset_instances([asset for _, asset in asset_tuple_list],
+                                                           model_directory))
         except CannotCombineAssetsError as ex:
             ex.files = [file for file, _ in asset_tuple_list]
-            short_uri = asset_tuple_list[0][1].typeURI.split('/')[-1]
+            short_uri = _get_type_uri(asset_tuple_list[0][1]).split('/')[-1]
             error_str = '\n'.join([f'{t[0]}: {t[1][0]} != {t[1][1]}' for t in ex.attribute_errors])
             file_list = ", ".join([f'"{file.name}"' for file, _ in asset_tuple_list])
             ex.message = (f'Cannot combine the assets with id: "{object_id}" with type "{short_uri}"\n'
                          f'that occur in files: {file_list}\n'
                          'due to conflicting values in attribute(s):\n' + error_str)
-            ex.type_uri = asset_tuple_list[0][1].typeURI
+            ex.type_uri = _get_type_uri(asset_tuple_list[0][1])
             list_of_errors.append(ex)
         except CannotCombineAssetsWithDifferentTypeError as ex:
             ex.files = [file for file, _ in asset_tuple_list]
-            short_uri = asset_tuple_list[0][1].typeURI.split('/')[-1]
-            short_uri_2 = asset_tuple_list[1][1].typeURI.split('/')[-1]
+            short_uri = ex.attribute_errors[0][1][0].split('/')[-1]
+            short_uri_2 = ex.attribute_errors[0][1][1].split('/')[-1]
             file_list = ", ".join([f'"{file.name}"' for file, _ in asset_tuple_list])
             ex.message = (f'Cannot combine the assets with id: "{object_id}"\n'
                        f'that occur in files: {file_list}\n'
@@ -80,75 +86,231 @@ def combine_files(list_of_files: list[Path], model_directory: Path = None) -> li
     return combined_assets
 
 
+def _load_files(list_of_files: list[Path], model_directory: Path = None, workers: int = None
+                ) -> Iterable[tuple[Path, Union[list[OTLObject], list[DotnotationDict], Exception]]]:
+    """Yields each file path with its assets, or with the error raised while reading it, in the order of the files.
+    With workers, the assets are dotnotation dicts."""
+    process_count = ObjectPayloadConverter.get_process_count(workers)
+    if process_count == 1 or len(list_of_files) <= 1:
+        for file_path in list_of_files:
+            yield file_path, _load_file(file_path, model_directory)
+        return
+
+    with ProcessPoolExecutor(max_workers=process_count) as executor:
+        futures = [executor.submit(_load_file_as_dotnotation_dicts, file_path, model_directory)
+                   for file_path in list_of_files]
+        for file_path, future in zip(list_of_files, futures):
+            result = future.result()
+            if result is None:
+                # the errors can hold objects, those can not be sent back by the worker
+                yield file_path, _load_file(file_path, model_directory)
+                continue
+            ddicts, caught_warnings = result
+            for category, message in caught_warnings:
+                warnings.warn(message, category=category, stacklevel=2)
+            yield file_path, ddicts
+
+
+def _load_file(file_path: Path, model_directory: Path = None) -> Union[list[OTLObject], Exception]:
+    try:
+        return list(OtlmowConverter.from_file_to_objects(file_path, model_directory=model_directory))
+    except Exception as ex:
+        return ex
+
+
+def _load_file_as_dotnotation_dicts(file_path: Path, model_directory: Path = None
+                                    ) -> Optional[tuple[list[DotnotationDict], list]]:
+    """Runs in a worker process. Returns the dotnotation dicts of the assets of the file and the warnings, or None if
+    reading the file failed."""
+    with warnings.catch_warnings(record=True) as caught_warnings:
+        warnings.simplefilter('always')
+        file_assets = _load_file(file_path, model_directory)
+        if isinstance(file_assets, Exception):
+            return None
+        ddicts = [DotnotationDictConverter.to_dict(asset) for asset in file_assets]
+    return ddicts, [(w.category, str(w.message)) for w in caught_warnings]
+
+
+def _get_type_uri(asset: Union[OTLObject, DotnotationDict]) -> str:
+    return asset['typeURI'] if isinstance(asset, dict) else asset.typeURI
+
+
+def _get_identificator(asset: Union[OTLObject, DotnotationDict]) -> Optional[str]:
+    if isinstance(asset, dict):
+        return asset.get(AGENT_ID_KEY if asset.get('typeURI') == AGENT_TYPE_URI else ASSET_ID_KEY)
+    if asset.typeURI == AGENT_TYPE_URI:
+        return asset.agentId.identificator
+    return asset.assetId.identificator
+
+
 def combine_assets(asset_list: list[OTLObject], model_directory: Path = None) -> list[OTLObject]:
     assets = defaultdict(list)
     for asset in asset_list:
-        if asset.typeURI == 'http://purl.org/dc/terms/Agent':
-            assets[asset.agentId.identificator].append(asset)
-        else:
-            assets[asset.assetId.identificator].append(asset)
-    combined_assets = []
-    for asset_list in assets.values():
-        if len(asset_list) == 1:
-            combined_assets.append(asset_list[0])
+        assets[_get_identificator(asset)].append(asset)
+    return [combine_asset_instances(asset_list, model_directory) for asset_list in assets.values()]
+
+
+class AssetDelta(NamedTuple):
+    """The difference between an old and a new set of assets, keyed on assetId/agentId.
+    added and deleted hold the assets as they are. changed holds per changed asset an object with only its id and
+    the changed attributes: the new values, or the attribute marked to be cleared if it has no value anymore.
+    changed_attributes holds the dotnotations of the changed attributes per id."""
+    added: list[OTLObject]
+    deleted: list[OTLObject]
+    changed: list[OTLObject]
+    changed_attributes: dict[str, list[str]]
+
+
+def compute_delta(old: Iterable[OTLObject], new: Iterable[OTLObject], model_directory: Path = None) -> AssetDelta:
+    """Compares the assets of a previous delivery with a new one, keyed on assetId/agentId.
+    Assets with the same content hash on both sides are unchanged and are not compared further. The other assets are
+    converted to dotnotation dicts and compared key by key (see get_changed_columns_per_row). An asset that changed
+    type is deleted and added.
+    The lists in the result can be written with the exporters."""
+    old_assets = _get_assets_by_id(old, side='old')
+    new_assets = _get_assets_by_id(new, side='new')
+
+    added = []
+    deleted = [asset for object_id, asset in old_assets.items() if object_id not in new_assets]
+    candidates_per_type = defaultdict(list)
+    for index, (object_id, new_asset) in enumerate(new_assets.items()):
+        old_asset = old_assets.get(object_id)
+        if old_asset is None:
+            added.append(new_asset)
+        elif old_asset.typeURI != new_asset.typeURI:
+            deleted.append(old_asset)
+            added.append(new_asset)
+        elif ObjectPayloadConverter.get_content_hash(old_asset) != ObjectPayloadConverter.get_content_hash(new_asset):
+            candidates_per_type[new_asset.typeURI].append((index, object_id, old_asset, new_asset))
+
+    changed = []
+    changed_attributes = {}
+    for candidates in candidates_per_type.values():
+        old_ddicts = [DotnotationDictConverter.to_dict(old_asset) for _, _, old_asset, _ in candidates]
+        new_ddicts = [DotnotationDictConverter.to_dict(new_asset) for _, _, _, new_asset in candidates]
+        changed_columns_per_row = get_changed_columns_per_row(old_ddicts, new_ddicts)
+        for (index, object_id, _, _), new_ddict, columns in zip(candidates, new_ddicts, changed_columns_per_row):
+            if not columns:
+                continue
+            changed_attributes[object_id] = columns
+            changed.append((index, _create_delta_asset(new_ddict, columns, model_directory)))
+
+    return AssetDelta(added=added, deleted=deleted, changed=[asset for _, asset in sorted(changed)],
+                      changed_attributes=changed_attributes)
+
+
+def get_changed_columns_per_row(old_dicts: Sequence[dict], new_dicts: Sequence[dict]) -> list[list[str]]:
+    """Compares two lists of (dotnotation) dicts row by row and returns per row the sorted keys of which the value
+    differs. A missing key is the same as None. A value of another type is a change, also when python considers
+    both equal ('1' and 1 differ, True and 1 differ), except for int and float (1 and 1.0 are the same)."""
+    return [sorted(key for key in old_dict.keys() | new_dict.keys()
+                   if _values_differ(old_dict.get(key), new_dict.get(key)))
+            for old_dict, new_dict in zip(old_dicts, new_dicts)]
+
+
+def _values_differ(old_value, new_value) -> bool:
+    if type(old_value) is not type(new_value) and not (type(old_value) in NUMBER_TYPES and
+                                                        type(new_value) in NUMBER_TYPES):
+        return True
+    if isinstance(old_value, list):
+        return len(old_value) != len(new_value) or any(
+            _values_differ(old_item, new_item) for old_item, new_item in zip(old_value, new_value))
+    return old_value != new_value
+
+
+def _get_assets_by_id(assets: Iterable[OTLObject], side: str) -> dict[str, OTLObject]:
+    assets_by_id = {}
+    for asset in assets:
+        object_id = _get_identificator(asset)
+        if object_id is None:
+            raise NoIdentificatorError(f'One of the {side} assets has no assetId.identificator')
+        if object_id in assets_by_id:
+            raise ValueError(f'The id {object_id} occurs more than once in the {side} assets')
+        assets_by_id[object_id] = asset
+    return assets_by_id
+
+
+def _create_delta_asset(new_ddict: DotnotationDict, columns: list[str], model_directory: Path = None) -> OTLObject:
+    id_key = AGENT_ID_KEY if new_ddict['typeURI'] == AGENT_TYPE_URI else ASSET_ID_KEY
+    ddict = DotnotationDict({'typeURI': new_ddict['typeURI'], id_key: new_ddict[id_key]})
+    cleared_columns = []
+    for column in columns:
+        value = new_ddict.get(column)
+        if value is None:
+            cleared_columns.append(column)
         else:
-            combined_asset = combine_two_asset_instances(asset_list[0], asset_list[1], model_directory)
-            for asset in asset_list[2:]:
-                combined_asset = combine_two_asset_instances(combined_asset, asset, model_directory)
-            combined_assets.append(combined_asset)
-    return combined_assets
+            ddict[column] = value
+    delta_asset = DotnotationDictConverter.from_dict(ddict, model_directory=model_directory)
+    for column in cleared_columns:
+        try:
+            attribute = DotnotationHelper.get_attribute_by_dotnotation(delta_asset, dotnotation=column)
+        except AttributeError:
+            # a non conform attribute can not be marked to be cleared, it is only in changed_attributes
+            continue
+        attribute.clear_value()
+    return delta_asset
 
 
 def combine_two_asset_instances(asset1: OTLObject, asset2: OTLObject, model_directory: Path = None) -> OTLObject:
     if asset1 is None or asset2 is None:
         raise ValueError('One of the assets is None')
+    return combine_asset_instances([asset1, asset2], model_directory)
 
-    id1 = asset1.assetId.identificator if asset1.typeURI != 'http://purl.org/dc/terms/Agent' \
-        else asset1.agentId.identificator
-    id2 = asset2.assetId.identificator if asset2.typeURI != 'http://purl.org/dc/terms/Agent' \
-        else asset2.agentId.identificator
-
-    if id1 is None or id2 is None:
-        raise NoIdentificatorError('One of the assets has no assetId.identificator')
-
-    if id1 != id2:
-        ex = CannotCombineAssetsWithDifferentIdError('The assets have different identificator values')
-        ex.attribute_errors = [('identificator', (id1, id2))]
-        raise ex
-
-    if asset1.typeURI != asset2.typeURI:
-        ex = CannotCombineAssetsWithDifferentTypeError('The assets have different types')
-        ex.attribute_errors = [('typeURI', (asset1.typeURI, asset2.typeURI))]
-        ex.object_id = id1
-        raise ex
-
-    ddict1 = DotnotationDictConverter.to_dict(asset1)
-    ddict2 = DotnotationDictConverter.to_dict(asset2)
-    if asset2.typeURI == 'http://purl.org/dc/terms/Agent':
-        ddict2.pop('agentId.identificator')
-    else:
-        ddict2.pop('assetId.identificator')
-
-    attribute_errors = []
-    for key, value in ddict2.items():
-        if value is None:
-            continue
-        if key == 'typeURI':
-            continue
 
-        if key in ddict1 and ddict1[key] is not None and ddict1[key] != value:
-            attribute_errors.append((key, ddict1[key], value))
-        else:
-            ddict1[key] = value
-
-    if attribute_errors:
-        error_str = '\n'.join([f'{key}: {ddict1[key]}, {value}' for key, _, value in sorted(attribute_errors)])
-        ex = CannotCombineAssetsError(
-            message=f'Cannot combine the assets with id {id1} because some attributes '
-                    'have conflicting values:\n'
-                    f'{error_str}')
-        ex.object_id = id1
-        ex.attribute_errors = [(key, (ddict1[key], value)) for key, _, value in attribute_errors]
-        raise ex
-
-    return DotnotationDictConverter.from_dict(ddict1, model_directory=model_directory)
+def combine_asset_instances(assets: Sequence[Union[OTLObject, DotnotationDict]], model_directory: Path = None
+                            ) -> OTLObject:
+    """Combines assets (objects or dotnotation dicts) with the same id and type into one asset, in one pass: the
+    values of the dotnotation dict of each asset are checked against the values of the assets before it, and the
+    combined asset is created once from the merged dotnotation dict. A single object is returned as is.
+    Raises the same errors as combining the assets two at a time, for the first asset that can not be combined."""
+    if len(assets) == 1 and not isinstance(assets[0], dict):
+        return assets[0]
+
+    first_asset = assets[0]
+    first_id = _get_identificator(first_asset)
+    first_type_uri = _get_type_uri(first_asset)
+    merged = DotnotationDict(first_asset) if isinstance(first_asset, dict) else \
+        DotnotationDictConverter.to_dict(first_asset)
+    for asset in assets[1:]:
+        object_id = _get_identificator(asset)
+        if first_id is None or object_id is None:
+            raise NoIdentificatorError('One of the assets has no assetId.identificator')
+
+        if first_id != object_id:
+            ex = CannotCombineAssetsWithDifferentIdError('The assets have different identificator values')
+            ex.attribute_errors = [('identificator', (first_id, object_id))]
+            raise ex
+
+        type_uri = _get_type_uri(asset)
+        if first_type_uri != type_uri:
+            ex = CannotCombineAssetsWithDifferentTypeError('The assets have different types')
+            ex.attribute_errors = [('typeURI', (first_type_uri, type_uri))]
+            ex.object_id = first_id
+            raise ex
+
+        ddict = asset if isinstance(asset, dict) else DotnotationDictConverter.to_dict(asset)
+        attribute_errors = []
+        for key, value in ddict.items():
+            if value is None:
+                continue
+            if key in {'typeURI', ASSET_ID_KEY, AGENT_ID_KEY}:
+                continue
+
+            merged_value = merged.get(key)
+            if merged_value is not None and merged_value != value:
+                attribute_errors.append((key, merged_value, value))
+            else:
+                merged[key] = value
+
+        if attribute_errors:
+            error_str = '\n'.join([f'{key}: {merged_value}, {value}'
+                                   for key, merged_value, value in sorted(attribute_errors)])
+            ex = CannotCombineAssetsError(
+                message=f'Cannot combine the assets with id {first_id} because some attributes '
+                        'have conflicting values:\n'
+                        f'{error_str}')
+            ex.object_id = first_id
+            ex.attribute_errors = [(key, (merged_value, value)) for key, merged_value, value in attribute_errors]
+            raise ex
+
+    return DotnotationDictConverter.from_dict(merged, model_directory=model_directory)
@@ -0,0 +1,132 @@
+import inspect
+import json
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject, dynamic_create_type_from_uri
+
+from otlmow_converter.DotnotationHelper import DotnotationHelper
+from otlmow_converter.Exceptions.DotnotationListOfListError import DotnotationListOfListError
+
+NATIVE_TYPES = {native_type.__name__: native_type for native_type in (str, int, float, bool, datetime, date, time,
+                                                                       dict, list)}
+
+
+class AttributeInfo(NamedTuple):
+    """The field metadata of the attribute a dotnotation points to."""
+    native_type: Optional[type]
+    kardinaliteit_max: str
+    waarde_object: bool
+    options: Optional[tuple[str, ...]]
+    field_name: str
+
+
+class _UnresolvedDotnotation(NamedTuple):
+    """The error of a dotnotation that does not resolve. A new error is raised from it on every lookup."""
+    error_type: type
+    args: tuple
+
+
+class ModelIndex:
+    """Index of the attributes of the classes in one model directory, by typeURI and dotnotation.
+    The index is filled lazily: the first lookup of a typeURI walks one private instance of that class, later lookups
+    of the same dotnotation only read the index. Dotnotations that do not resolve raise the same error as
+    DotnotationHelper.get_attribute_by_dotnotation on every lookup.
+    The resolved entries can be saved to and loaded from a json file, so a new process does not need to walk the
+    instances again. The file belongs to one version of the model."""
+
+    def __init__(self, model_directory: Optional[Path] = None):
+        self.model_directory = model_directory
+        self._types: dict[str, type] = {}
+        self._probes: dict[str, OTLObject] = {}
+        self._attributes: dict[tuple[str, str, str, str, bool], Union[AttributeInfo, _UnresolvedDotnotation]] = {}
+
+    @classmethod
+    def for_model_directory(cls, model_directory: Optional[Path] = None, index_filepath: Optional[Path] = None
+                            ) -> 'ModelIndex':
+        """Returns the shared index of the model directory. If index_filepath is given and exists, the index is
+        loaded from it when it is created."""
+        key = cls._get_model_directory_key(model_directory)
+        index = MODEL_INDICES.get(key)
+        if index is None:
+            if index_filepath is not None and Path(index_filepath).exists():
+                index = cls.load(index_filepath, model_directory=model_directory)
+            else:
+                index = cls(model_directory)
+            MODEL_INDICES[key] = index
+        return index
+
+    @staticmethod
+    def _get_model_directory_key(model_directory: Optional[Path]) -> Path:
+        # None means the model of otlmow_model, so it shares the index with the explicit path of that model
+        if model_directory is None:
+            model_directory = Path(inspect.getfile(OTLObject)).parent.parent.parent
+        return Path(model_directory).resolve()
+
+    def get_type(self, type_uri: str) -> type:
+        type_ = self._types.get(type_uri)
+        if type_ is None:
+            type_ = dynamic_create_type_from_uri(type_uri, model_directory=self.model_directory)
+            self._types[type_uri] = type_
+        return type_
+
+    def get_attribute_info(self, type_uri: str, dotnotation: str, separator: str, cardinality_indicator: str,
+                           waarde_shortcut: bool) -> AttributeInfo:
+        key = (type_uri, dotnotation, separator, cardinality_indicator, waarde_shortcut)
+        info = self._attributes.get(key)
+        if info is None:
+            info = self._attributes[key] = self._resolve_attribute_info(*key)
+        if isinstance(info, _UnresolvedDotnotation):
+            raise info.error_type(*info.args)
+        return info
+
+    def _resolve_attribute_info(self, type_uri: str, dotnotation: str, separator: str, cardinality_indicator: str,
+                                waarde_shortcut: bool) -> Union[AttributeInfo, _UnresolvedDotnotation]:
+        # the walk adds empty values to the probe, so the probe is never handed out
+        probe = self._probes.get(type_uri)
+        if probe is None:
+            probe = self._probes[type_uri] = self.get_type(type_uri)()
+        try:
+            attribute = DotnotationHelper.get_attribute_by_dotnotation(
+                instance_or_attribute=probe, dotnotation=dotnotation, separator=separator,
+                cardinality_indicator=cardinality_indicator, waarde_shortcut=waarde_shortcut)
+        except (AttributeError, DotnotationListOfListError) as e:
+            return _UnresolvedDotnotation(error_type=type(e), args=e.args)
+
+        field = attribute.field
+        options = getattr(field, 'options', None)
+        return AttributeInfo(native_type=field.native_type, kardinaliteit_max=attribute.kardinaliteit_max,
+                             waarde_object=bool(field.waardeObject),
+                             options=None if options is None else tuple(options),
+                             field_name=field.__class__.__name__)
+
+    def save(self, filepath: Path) -> None:
+        """Writes the resolved entries to a json file. Entries that did not resolve are not written."""
+        entries = []
+        for key, info in self._attributes.items():
+            if isinstance(info, _UnresolvedDotnotation):
+                continue
+            native_type_name = None if info.native_type is None else info.native_type.__name__
+            if native_type_name is not None and NATIVE_TYPES.get(native_type_name) is not info.native_type:
+                continue
+            entries.append([*key, native_type_name, info.kardinaliteit_max, info.waarde_object,
+                            None if info.options is None else list(info.options), info.field_name])
+        with open(filepath, 'w', encoding='utf-8') as file:
+            json.dump({'attributes': entries}, file)
+
+    @classmethod
+    def load(cls, filepath: Path, model_directory: Optional[Path] = None) -> 'ModelIndex':
+        with open(filepath, encoding='utf-8') as file:
+            data = json.load(file)
+        index = cls(model_directory)
+        for (type_uri, dotnotation, separator, cardinality_indicator, waarde_shortcut, native_type_name,
+             kardinaliteit_max, waarde_object, options, field_name) in data['attributes']:
+            index._attributes[(type_uri, dotnotation, separator, cardinality_indicator, waarde_shortcut)] = \
+                AttributeInfo(native_type=None if native_type_name is None else NATIVE_TYPES[native_type_name],
+                              kardinaliteit_max=kardinaliteit_max, waarde_object=waarde_object,
+                              options=None if options is None else tuple(options), field_name=field_name)
+        return index
+
+
+MODEL_INDICES: dict[Path, ModelIndex] = {}
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import warnings
+from collections import deque
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable, Generator, Iterable, Optional
+
+from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject, dynamic_create_type_from_uri
+
+NODE = 0
+ATTRIBUTE = 1
+NON_CONFORM_ATTRIBUTE = 2
+
+
+class ObjectPayloadConverter:
+    """Converts OTLObjects to a compact, picklable payload and back.
+    OTL objects can not be pickled (their attributes hold closures), so objects built in another process are sent
+    back as (typeURI, entries). Each entry is (kind, path, name, value, mark_to_be_cleared) where path is a tuple of
+    (private attribute name, index or None) steps to the value object that owns the attribute.
+    The values are already converted and validated, so restoring them assigns them without converting them again."""
+
+    @classmethod
+    def to_payload(cls, otl_object: OTLObject) -> tuple[str, list[tuple]]:
+        entries = []
+        cls._add_entries(otl_object, (), entries)
+        return otl_object.typeURI, entries
+
+    @classmethod
+    def _add_entries(cls, owner, path: tuple, entries: list) -> None:
+        for key, attribute in vars(owner).items():
+            if key == '_parent':
+                continue
+            if not getattr(attribute, 'is_otl_attribute', False):
+                if not key.startswith('_'):
+                    entries.append((NON_CONFORM_ATTRIBUTE, path, key, attribute, False))
+                continue
+            if attribute.field.waardeObject:
+                if attribute.waarde is None:
+                    continue
+                if isinstance(attribute.waarde, list):
+                    for index, value_object in enumerate(attribute.waarde):
+                        value_path = path + ((key, index),)
+                        entries.append((NODE, value_path, None, None, False))
+                        cls._add_entries(value_object, value_path, entries)
+                else:
+                    value_path = path + ((key, None),)
+                    entries.append((NODE, value_path, None, None, False))
+                    cls._add_entries(attribute.waarde, value_path, entries)
+            elif attribute.waarde is not None or attribute.mark_to_be_cleared:
+                entries.append((ATTRIBUTE, path, key, attribute.waarde, attribute.mark_to_be_cleared))
+
+    @classmethod
+    def get_content_hash(cls, otl_object: OTLObject) -> bytes:
+        """Returns a hash of the same state the payload holds, without building the payload.
+        Objects with the same content hash have the same payload (and the same dotnotation dict)."""
+        parts = [otl_object.typeURI]
+        cls._add_hash_parts(otl_object, parts)
+        return hashlib.blake2b(repr(parts).encode(), digest_size=16).digest()
+
+    @classmethod
+    def _add_hash_parts(cls, owner, parts: list) -> None:
+        for key, attribute in vars(owner).items():
+            if key == '_parent':
+                continue
+            if not getattr(attribute, 'is_otl_attribute', False):
+                if not key.startswith('_'):
+                    parts.extend((NON_CONFORM_ATTRIBUTE, key, attribute))
+                continue
+            if attribute.field.waardeObject:
+                if attribute.waarde is None:
+                    continue
+                value_objects = attribute.waarde if isinstance(attribute.waarde, list) else [attribute.waarde]
+                parts.extend((NODE, key, len(value_objects)))
+                for value_object in value_objects:
+                    # the parts of a value object are closed, so they can not be mistaken for those of its owner
+                    value_parts = []
+                    cls._add_hash_parts(value_object, value_parts)
+                    parts.append(value_parts)
+            elif attribute.waarde is not None or attribute.mark_to_be_cleared:
+                parts.extend((ATTRIBUTE, key, attribute.waarde, attribute.mark_to_be_cleared))
+
+    @classmethod
+    def from_payload(cls, payload: tuple[str, list[tuple]], model_directory: Path = None,
+                     types_by_uri: dict = None) -> OTLObject:
+        type_uri, entries = payload
+        if types_by_uri is None:
+            types_by_uri = {}
+        type_ = types_by_uri.get(type_uri)
+        if type_ is None:
+            type_ = dynamic_create_type_from_uri(type_uri, model_directory=model_directory)
+            types_by_uri[type_uri] = type_
+
+        instance = type_()
+        for kind, path, name, value, mark_to_be_cleared in entries:
+            owner = instance
+            for key, index in path:
+                owner = cls._get_or_add_value_object(getattr(owner, key), index)
+            if kind == NODE:
+                continue
+            if kind == NON_CONFORM_ATTRIBUTE:
+                setattr(owner, name, value)
+                continue
+            attribute = getattr(owner, name)
+            attribute.waarde = value
+            attribute.mark_to_be_cleared = mark_to_be_cleared
+        return instance
+
+    @classmethod
+    def get_process_count(cls, workers: Optional[int]) -> int:
+        """Returns the number of processes to convert in for the workers option, at most the number of CPUs. The
+        objects are created again in the parent process, so a process without a CPU of its own only adds work.
+        1 means converting in this process."""
+        if workers is None:
+            return 1
+        return max(1, min(workers, os.cpu_count() or 1))
+
+    @classmethod
+    def convert_to_payloads(cls, convert: Callable[[Callable], Iterable[OTLObject]], row_count: int
+                            ) -> tuple[list, list]:
+        """Runs in a worker process. convert(on_line_error) converts row_count rows, numbering the lines from 2 like
+        a table with one header line. Returns a payload per row, None for the rows that failed, and the warnings.
+        Errors that are not about a single row are raised, so the caller gets them like a serial conversion."""
+        failed_rows = set()
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            objects = iter(list(convert(lambda line_error: failed_rows.add(line_error.line_number - 2))))
+            payloads = [None if row_nr in failed_rows else cls.to_payload(next(objects))
+                        for row_nr in range(row_count)]
+        return payloads, [(w.category, str(w.message)) for w in caught_warnings]
+
+    @classmethod
+    def iter_objects_from_payloads(cls, result: tuple[list, list],
+                                   convert_row_again: Callable[[int], Iterable[OTLObject]],
+                                   model_directory: Path = None, types_by_uri: dict = None
+                                   ) -> Generator[OTLObject, None, None]:
+        """Yields the objects of a result of convert_to_payloads in this process, in the order of the rows, and
+        warns the warnings of the worker again. The rows that failed are converted again with
+        convert_row_again(row_nr), to get the original exception and line number. Their warnings were already
+        reported by the worker, so they are not repeated."""
+        payloads, caught_warnings = result
+        for category, message in caught_warnings:
+            warnings.warn(message, category=category, stacklevel=2)
+        for row_nr, payload in enumerate(payloads):
+            if payload is not None:
+                yield cls.from_payload(payload, model_directory=model_directory, types_by_uri=types_by_uri)
+                continue
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                yield from convert_row_again(row_nr)
+
+    @classmethod
+    def map_in_processes(cls, executor: Executor, function: Callable, iterable_of_args: Iterable[tuple],
+                         max_pending: int) -> Generator:
+        """Yields function(*args) for each args in order, calling it in the executor. The arguments are taken from
+        the iterable only as results are consumed, so at most max_pending calls (and their arguments) are held at
+        the same time. The calls that were not consumed are cancelled when the generator is closed."""
+        pending = deque()
+        try:
+            for args in iterable_of_args:
+                pending.append(executor.submit(function, *args))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @classmethod
+    def _get_or_add_value_object(cls, attribute, index: Optional[int]):
+        if index is None:
+            if attribute.waarde is None:
+                attribute.add_empty_value()
+            return attribute.waarde
+        while attribute.waarde is None or len(attribute.waarde) <= index:
+            attribute.add_empty_value()
+        return attribute.waarde[index]
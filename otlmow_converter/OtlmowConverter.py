@@ -1,22 +1,30 @@
-from asyncio import sleep
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from itertools import chain
 from pathlib import Path
-from typing import Iterable, Union, AsyncIterable
+from typing import Iterable, Union, AsyncIterable, Callable, Optional
 
+import pyarrow as pa
 from otlmow_model.OtlmowModel.BaseClasses.OTLObject import OTLObject, create_dict_from_asset
 from otlmow_model.OtlmowModel.Helpers.GenericHelper import get_shortened_uri
 from pandas import DataFrame
 
+from otlmow_converter.AsyncRunner import AsyncRunner
 from otlmow_converter.DotnotationDict import DotnotationDict
 from otlmow_converter.DotnotationDictConverter import DotnotationDictConverter
 from otlmow_converter.FileExporter import FileExporter
 from otlmow_converter.FileFormats.PandasConverter import PandasConverter
+from otlmow_converter.FileFormats.PyArrowConverter import PyArrowConverter
 from otlmow_converter.FileImporter import FileImporter
 from otlmow_converter.SettingsManager import load_settings
 
 load_settings()
 
+ARROW_TABLE_KWARGS = frozenset({
+    'waarde_shortcut', 'separator', 'cardinality_separator', 'cardinality_indicator', 'cast_list', 'cast_datetime',
+    'allow_non_otl_conform_attributes', 'warn_for_non_otl_conform_attributes', 'allow_empty_asset_id'})
+
 
 class OtlmowConverter:
     """
@@ -25,7 +33,7 @@ class OtlmowConverter:
     before using this class. The converter uses the point of view of the OTLMOW model objects by default and thus
     supports conversion from OTLMOW model objects to and from all other formats. These are:
 
-    - files (Path objects) to convert to and from JSON, CSV, Excel, GeoJSON and JSON-LD files
+    - files (Path objects) to convert to and from JSON, CSV, Excel, GeoJSON, JSON-LD, Parquet and Arrow files
 
     - dictionaries, in native OTL terms
 
@@ -33,6 +41,8 @@ class OtlmowConverter:
 
     - pandas DataFrames, which are used for tabular data and use the AWV dotnotation
 
+    - pyarrow Tables (to_arrow_table), columnar tables that use the AWV dotnotation
+
     There are generic functions to convert to any of these formats, which will determine the type of the input(subject)
     and convert it to the desired output format. The more specific functions are used to convert to and from objects.
 
@@ -47,9 +57,23 @@ class OtlmowConverter:
         new_generator = iter(chain([first_element], generator))
         return first_element, new_generator
 
+    @classmethod
+    async def peek_async_iterable(cls, async_iterable: AsyncIterable) -> tuple[object, AsyncIterable]:
+        """Like peek_generator, for an async iterable. Raises StopAsyncIteration if it is empty."""
+        iterator = async_iterable.__aiter__()
+        first_element = await iterator.__anext__()
+
+        async def new_generator():
+            yield first_element
+            async for element in iterator:
+                yield element
+
+        return first_element, new_generator()
+
     @classmethod
     def to_objects(cls, subject: object, model_directory: Path = None, **kwargs) -> Iterable[OTLObject]:
-        """Converts any subject to a sequence of OTLObject objects."""
+        """Converts any subject to a sequence of OTLObject objects.
+        For files, workers=N lets the importers that support it (CSV) create the objects in N processes."""
         if isinstance(subject, Path):
             yield from cls.from_file_to_objects(file_path=subject, model_directory=model_directory, **kwargs            )
         elif isinstance(subject, DataFrame):
@@ -82,7 +106,10 @@ class OtlmowConverter:
     @classmethod
     async def to_objects_async(cls, subject: object, model_directory: Path = None, **kwargs) -> AsyncIterable[
         OTLObject]:
-        """Converts any subject to a sequence of OTLObject objects asynchronously."""
+        """Converts any subject to a sequence of OTLObject objects asynchronously.
+        The subject can also be an async iterable (e.g. rows of an async database cursor) of dicts, DotnotationDict
+        or OTLObject objects. The dicts are converted in batches in an executor, while the source is read ahead by at
+        most async_queue_size batches. See AsyncRunner.map_batches."""
         if isinstance(subject, Path):
             o_gen = await cls.from_file_to_objects_async(file_path=subject, model_directory=model_directory, **kwargs)
             for o in o_gen:
@@ -92,6 +119,7 @@ class OtlmowConverter:
                                                                **kwargs):
                 yield o
         elif isinstance(subject, Iterable):
+            AsyncRunner.pop_options(kwargs)
             try:
                 first_element, new_generator = cls.peek_generator(iterable=iter(subject))
                 if first_element is None:
@@ -114,6 +142,24 @@ class OtlmowConverter:
                     raise ValueError(f"Unsupported subject type: {type(first_element)}")
             except StopIteration:
                 yield
+        elif isinstance(subject, AsyncIterable):
+            executor, offload, batch_size, queue_size = AsyncRunner.pop_options(kwargs)
+            try:
+                first_element, new_generator = await cls.peek_async_iterable(subject)
+            except StopAsyncIteration:
+                yield
+                return
+            if first_element is None:
+                yield
+                return
+            converter = cls._get_converter_to_objects(first_element, model_directory=model_directory, **kwargs)
+            if converter is None:
+                async for o in new_generator:
+                    yield o
+            else:
+                async for o in AsyncRunner.map_batches(converter, new_generator, executor=executor, offload=offload,
+                                                       batch_size=batch_size, queue_size=queue_size):
+                    yield o
         else:
             raise ValueError(f"Unsupported subject type: {type(subject)}")
 
@@ -151,7 +197,12 @@ class OtlmowConverter:
 
     @classmethod
     async def to_file_async(cls, subject: object, file_path: Path, model_directory: Path = None, **kwargs) -> tuple[Path]:
-        """Converts any subject (including another file) to a file asynchronously."""
+        """Converts any subject (including another file) to a file asynchronously.
+        The subject can also be an async iterable (e.g. rows of an async database cursor) of dicts, DotnotationDict
+        or OTLObject objects. Sequences are read on the loop and handed over in batches to the conversion and the
+        exporter, which run in a thread of the executor. Reading waits while async_queue_size batches are waiting,
+        so the sequence is never in memory as a whole (unless the exporter needs that, like the Excel exporter).
+        With offload=False or a ProcessPoolExecutor, the objects are created on the loop and collected first."""
         if isinstance(subject, Path):
             objects = await cls.from_file_to_objects_async(file_path=subject, model_directory=model_directory, **kwargs)
             return await cls.from_objects_to_file_async(file_path=file_path, sequence_of_objects=objects, **kwargs)
@@ -159,45 +210,73 @@ class OtlmowConverter:
             objects = await cls.from_dataframe_to_objects_async(
                 dataframe=subject, model_directory=model_directory, **kwargs)
             return await cls.from_objects_to_file_async(file_path=file_path, sequence_of_objects=objects, **kwargs)
-        elif isinstance(subject, Iterable):
+        elif isinstance(subject, (Iterable, AsyncIterable)):
+            executor, offload, batch_size, queue_size = AsyncRunner.pop_options(kwargs)
             try:
-                first_element, new_generator = cls.peek_generator(iterable=iter(subject))
-                if first_element is None:
-                    return None
-                if isinstance(first_element, DotnotationDict):
-                    objects_gen = cls.from_dotnotation_dicts_to_objects_async(
-                        sequence_of_dotnotation_dicts=new_generator, model_directory=model_directory, **kwargs)
-                    objects = await cls.collect_to_list(objects_gen)
-                    return await cls.from_objects_to_file_async(file_path=file_path, sequence_of_objects=objects, **kwargs)
-                elif isinstance(first_element, dict):
-                    objects_gen = cls.from_dicts_to_objects_async(sequence_of_dicts=new_generator,
-                                                              model_directory=model_directory, **kwargs)
-                    objects = await cls.collect_to_list(objects_gen)
-                    return await cls.from_objects_to_file_async(file_path=file_path, sequence_of_objects=objects, **kwargs)
-                elif (callable(getattr(first_element, "return_is_otl_object", None))
-                      and first_element.return_is_otl_object()):
-                    return await cls.from_objects_to_file_async(file_path=file_path, sequence_of_objects=new_generator, **kwargs)
+                if isinstance(subject, AsyncIterable):
+                    first_element, new_generator = await cls.peek_async_iterable(subject)
                 else:
-                    raise ValueError(f"Unsupported subject type: {type(first_element)}")
-            except StopIteration:
+                    first_element, new_generator = cls.peek_generator(iterable=iter(subject))
+            except (StopIteration, StopAsyncIteration):
+                return None
+            if first_element is None:
                 return None
+            converter = cls._get_converter_to_objects(first_element, model_directory=model_directory, **kwargs)
+
+            if offload and not isinstance(executor, ProcessPoolExecutor):
+                return await AsyncRunner.consume(
+                    partial(cls._convert_to_file, converter, file_path, kwargs), new_generator, executor=executor,
+                    batch_size=batch_size, queue_size=queue_size)
+
+            if converter is None and not isinstance(new_generator, AsyncIterable):
+                objects = new_generator
+            else:
+                objects = await cls.collect_to_list(cls.to_objects_async(
+                    new_generator, model_directory=model_directory, offload=False, async_batch_size=batch_size,
+                    **kwargs))
+            return await cls.from_objects_to_file_async(file_path=file_path, sequence_of_objects=objects,
+                                                        executor=executor, offload=offload,
+                                                        async_batch_size=batch_size, **kwargs)
         else:
             raise ValueError(f"Unsupported subject type: {type(subject)}")
 
     @classmethod
-    def to_dataframe(cls, subject: object, split_per_type: bool = False, model_directory: Path = None, **kwargs
-                     ) -> Union[DataFrame, dict[str, DataFrame]]:
-        """Converts any subject to a pandas DataFrame."""
+    def _get_converter_to_objects(cls, first_element: object, model_directory: Path = None, **kwargs
+                                  ) -> Optional[Callable[[Iterable], Iterable[OTLObject]]]:
+        """Returns the sync function that converts a sequence starting with first_element to OTLObject objects,
+        or None if it already is a sequence of OTLObject objects."""
+        if isinstance(first_element, DotnotationDict):
+            return partial(cls.from_dotnotation_dicts_to_objects, model_directory=model_directory, **kwargs)
+        elif isinstance(first_element, dict):
+            return partial(cls.from_dicts_to_objects, model_directory=model_directory, **kwargs)
+        elif (callable(getattr(first_element, "return_is_otl_object", None))
+              and first_element.return_is_otl_object()):
+            return None
+        raise ValueError(f"Unsupported subject type: {type(first_element)}")
+
+    @classmethod
+    def _convert_to_file(cls, converter: Optional[Callable[[Iterable], Iterable[OTLObject]]], file_path: Path,
+                         kwargs: dict, sequence: Iterable) -> tuple[Path]:
+        objects = sequence if converter is None else converter(sequence)
+        return cls.from_objects_to_file(file_path=file_path, sequence_of_objects=objects, **kwargs)
+
+    @classmethod
+    def to_dataframe(cls, subject: object, split_per_type: bool = False, model_directory: Path = None,
+                     backend: Optional[str] = None, **kwargs) -> Union[DataFrame, dict[str, DataFrame]]:
+        """Converts any subject to a pandas DataFrame.
+        With backend='arrow' the columns are pd.ArrowDtype columns typed after the OTL fields, see
+        PandasConverter.convert_objects_to_single_dataframe. DataFrame and dotnotation dict subjects are not converted
+        to objects, they keep their dtypes."""
         if isinstance(subject, Path):
             objects = cls.from_file_to_objects(file_path=subject, model_directory=model_directory, **kwargs)
             return cls.from_objects_to_dataframe(sequence_of_objects=objects, split_per_type=split_per_type,
-                                                 **kwargs)
+                                                 backend=backend, **kwargs)
         elif isinstance(subject, DataFrame):
             if split_per_type:
                 objects = cls.from_dataframe_to_objects(dataframe=subject, model_directory=model_directory,
                                                         **kwargs)
                 return PandasConverter.convert_objects_to_multiple_dataframes(sequence_of_objects=objects,
-                                                                              **kwargs)
+                                                                              backend=backend, **kwargs)
             return subject
         elif isinstance(subject, Iterable):
             try:
@@ -217,11 +296,12 @@ class OtlmowConverter:
                                                         model_directory=model_directory, **kwargs)
                     return cls.from_objects_to_dataframe(sequence_of_objects=objects,
                                                          split_per_type=split_per_type,
-                                                         **kwargs)
+                                                         backend=backend, **kwargs)
                 elif (callable(getattr(first_element, "return_is_otl_object", None))
                       and first_element.return_is_otl_object()):
                     return cls.from_objects_to_dataframe(sequence_of_objects=new_generator,
-                                                         split_per_type=split_per_type, **kwargs)
+                                                         split_per_type=split_per_type, backend=backend,
+                                                         **kwargs)
                 else:
                     raise ValueError(f"Unsupported subject type: {type(first_element)}")
             except StopIteration:
@@ -231,19 +311,19 @@ class OtlmowConverter:
 
     @classmethod
     async def to_dataframe_async(cls, subject: object, split_per_type: bool = False, model_directory: Path = None,
-                                 **kwargs
+                                 backend: Optional[str] = None, **kwargs
                                  ) -> Union[DataFrame, dict[str, DataFrame]]:
         """Converts any subject to a pandas DataFrame asynchronously."""
         if isinstance(subject, Path):
             objects = await cls.from_file_to_objects_async(file_path=subject, model_directory=model_directory, **kwargs)
             return await cls.from_objects_to_dataframe_async(sequence_of_objects=objects, split_per_type=split_per_type,
-                                                             **kwargs)
+                                                             backend=backend, **kwargs)
         elif isinstance(subject, DataFrame):
             if split_per_type:
                 objects = await cls.from_dataframe_to_objects_async(dataframe=subject, model_directory=model_directory,
                                                                     **kwargs)
                 return await PandasConverter.convert_objects_to_multiple_dataframes_async(sequence_of_objects=objects,
-                                                                                   **kwargs)
+                                                                                   backend=backend, **kwargs)
             return subject
         elif isinstance(subject, Iterable):
             try:
@@ -264,11 +344,12 @@ class OtlmowConverter:
                     objects = await cls.collect_to_list(objects_gen)
                     return await cls.from_objects_to_dataframe_async(sequence_of_objects=objects,
                                                                      split_per_type=split_per_type,
-                                                                     **kwargs)
+                                                                     backend=backend, **kwargs)
                 elif (callable(getattr(first_element, "return_is_otl_object", None))
                       and first_element.return_is_otl_object()):
                     return await cls.from_objects_to_dataframe_async(sequence_of_objects=new_generator,
-                                                                     split_per_type=split_per_type, **kwargs)
+                                                                     split_per_type=split_per_type, backend=backend,
+                                                                     **kwargs)
                 else:
                     raise ValueError(f"Unsupported subject type: {type(first_element)}")
             except StopIteration:
@@ -276,6 +357,49 @@ class OtlmowConverter:
         else:
             raise ValueError(f"Unsupported subject type: {type(subject)}")
 
+    @classmethod
+    def to_arrow_table(cls, subject: object, model_directory: Path = None, **kwargs) -> pa.Table:
+        """Converts any subject to a pyarrow Table, with a column per dotnotation.
+        Arrow and parquet files are read as a table without creating any OTLObject objects (use columns=[...] to only
+        read some columns), as are DataFrames and DotnotationDict objects. Other subjects are converted to objects
+        first and get columns typed after the OTL fields."""
+        if isinstance(subject, pa.Table):
+            return subject
+        elif isinstance(subject, Path):
+            importer = FileImporter.get_importer_from_extension(extension=subject.suffix[1:])
+            if callable(getattr(importer, 'to_table', None)):
+                return importer.to_table(filepath=subject, **kwargs)
+            objects = importer.to_objects(filepath=subject, model_directory=model_directory, **kwargs)
+            return cls.from_objects_to_arrow_table(sequence_of_objects=objects, **kwargs)
+        elif isinstance(subject, DataFrame):
+            return pa.Table.from_pandas(subject, preserve_index=False)
+        elif isinstance(subject, Iterable):
+            try:
+                first_element, new_generator = cls.peek_generator(iterable=iter(subject))
+            except StopIteration:
+                return pa.table({})
+            if isinstance(first_element, DotnotationDict):
+                return pa.Table.from_pylist(list(new_generator))
+            converter = cls._get_converter_to_objects(first_element, model_directory=model_directory, **kwargs)
+            objects = new_generator if converter is None else converter(new_generator)
+            return cls.from_objects_to_arrow_table(sequence_of_objects=objects, **kwargs)
+        else:
+            raise ValueError(f"Unsupported subject type: {type(subject)}")
+
+    @classmethod
+    async def to_arrow_table_async(cls, subject: object, model_directory: Path = None, **kwargs) -> pa.Table:
+        """Converts any subject to a pyarrow Table in an executor, use executor=... to pass the executor."""
+        executor, _, _, _ = AsyncRunner.pop_options(kwargs)
+        return await AsyncRunner.run(cls.to_arrow_table, subject, model_directory=model_directory, executor=executor,
+                                     **kwargs)
+
+    @classmethod
+    def from_objects_to_arrow_table(cls, sequence_of_objects: Iterable[OTLObject], **kwargs) -> pa.Table:
+        """Converts a sequence of OTLObject objects to a pyarrow Table with columns typed after the OTL fields.
+        See PyArrowConverter.convert_objects_to_single_table for the keyword arguments."""
+        table_kwargs = {key: value for key, value in kwargs.items() if key in ARROW_TABLE_KWARGS}
+        return PyArrowConverter.convert_objects_to_single_table(list_of_objects=sequence_of_objects, **table_kwargs)
+
     @classmethod
     def to_dicts(cls, subject: object, model_directory: Path = None, **kwargs) -> Iterable[dict]:
         """Converts any subject to a sequence of dictionaries."""
@@ -460,8 +584,7 @@ class OtlmowConverter:
     @classmethod
     async def from_objects_to_dicts_async(cls, sequence_of_objects: Iterable[OTLObject], **kwargs) -> AsyncIterable[dict]:
         """Converts a sequence of OTLObject objects to a sequence of dictionaries."""
-        for obj in sequence_of_objects:
-            await sleep(0)
+        async for obj in AsyncRunner.iterate(sequence_of_objects):
             yield create_dict_from_asset(obj, **kwargs)
 
     @classmethod
@@ -478,8 +601,7 @@ class OtlmowConverter:
     @classmethod
     async def from_dicts_to_objects_async(cls, sequence_of_dicts: Iterable[dict], **kwargs) -> AsyncIterable[OTLObject]:
         """Converts a sequence of dictionaries to a sequence of OTLObject objects."""
-        for d in sequence_of_dicts:
-            await sleep(0)
+        async for d in AsyncRunner.iterate(sequence_of_dicts):
             yield OTLObject.from_dict(input_dict=d, **kwargs)
 
     @classmethod
@@ -498,8 +620,7 @@ class OtlmowConverter:
     async def from_objects_to_dotnotation_dicts_async(cls, sequence_of_objects: Iterable[OTLObject], **kwargs
                                                       ) -> AsyncIterable[DotnotationDict]:
         """Converts a sequence of OTLObject objects to a sequence of dictionaries."""
-        for obj in sequence_of_objects:
-            await sleep(0)
+        async for obj in AsyncRunner.iterate(sequence_of_objects):
             yield await DotnotationDictConverter.to_dict_async(obj, **kwargs)
 
     @classmethod
@@ -517,7 +638,7 @@ class OtlmowConverter:
     async def from_dotnotation_dicts_to_objects_async(cls, sequence_of_dotnotation_dicts: Iterable[DotnotationDict],
                                                       **kwargs) -> AsyncIterable[OTLObject]:
         """Converts a sequence of OTLObject objects to a sequence of dictionaries."""
-        for obj in sequence_of_dotnotation_dicts:
+        async for obj in AsyncRunner.iterate(sequence_of_dotnotation_dicts):
             yield await DotnotationDictConverter.from_dict_async(obj, **kwargs)
 
     @classmethod
@@ -525,6 +646,7 @@ class OtlmowConverter:
         """Converts a file to a sequence of OTLObject objects.
         This conversion uses the OTLMOW settings.
         See the specific Importer functions for more information on the keyword arguments.
+        Use workers=N to create the objects in N processes, for the importers that support it (CSV).
         """
         importer = FileImporter.get_importer_from_extension(extension=file_path.suffix[1:])
         return importer.to_objects(filepath=file_path, model_directory=model_directory, **kwargs)
@@ -532,8 +654,15 @@ class OtlmowConverter:
     @classmethod
     async def from_file_to_objects_async(cls, file_path: Path, model_directory: Path = None, **kwargs) -> AsyncIterable[
         OTLObject]:
-        """Converts a file to a sequence of OTLObject objects."""
+        """Converts a file to a sequence of OTLObject objects.
+        The file is read in an executor, so the event loop is not blocked: use executor=... to pass a thread or process
+        executor (default: the executor of the loop) and offload=False to read the file on the event loop instead,
+        giving control back to the loop every async_batch_size rows. See AsyncRunner."""
         importer = FileImporter.get_importer_from_extension(extension=file_path.suffix[1:])
+        executor, offload, batch_size, _ = AsyncRunner.pop_options(kwargs)
+        if offload:
+            return await AsyncRunner.to_objects(importer, filepath=file_path, model_directory=model_directory,
+                                                executor=executor, batch_size=batch_size, **kwargs)
         return await importer.to_objects_async(filepath=file_path, model_directory=model_directory, **kwargs)
 
     @classmethod
@@ -548,31 +677,40 @@ class OtlmowConverter:
     @classmethod
     async def from_objects_to_file_async(cls, file_path: Path, sequence_of_objects: Iterable[OTLObject],
                                          **kwargs) -> tuple[Path]:
-        """Converts a sequence of OTLObject objects to a file."""
+        """Converts a sequence of OTLObject objects to a file.
+        The file is written in an executor, with the same options as from_file_to_objects_async."""
         exporter = FileExporter.get_exporter_from_extension(extension=file_path.suffix[1:])
+        executor, offload, batch_size, _ = AsyncRunner.pop_options(kwargs)
+        if offload:
+            return await AsyncRunner.from_objects(exporter, sequence_of_objects=sequence_of_objects,
+                                                  filepath=file_path, executor=executor, batch_size=batch_size,
+                                                  **kwargs)
         return await exporter.from_objects_async(sequence_of_objects=sequence_of_objects, filepath=file_path, **kwargs)
 
     @classmethod
     def from_objects_to_dataframe(cls, sequence_of_objects: Iterable[OTLObject], split_per_type: bool = False,
-    **kwargs
-                                  ) -> Union[DataFrame, dict[str, DataFrame]]:
+                                  backend: Optional[str] = None, **kwargs) -> Union[DataFrame, dict[str, DataFrame]]:
         """Converts a sequence of OTLObject objects to a pandas DataFrame.
         This conversion uses the OTLMOW settings.
         """
         if split_per_type:
-            return PandasConverter.convert_objects_to_multiple_dataframes(sequence_of_objects, **kwargs)
+            return PandasConverter.convert_objects_to_multiple_dataframes(sequence_of_objects, backend=backend,
+                                                                          **kwargs)
         else:
-            return PandasConverter.convert_objects_to_single_dataframe(sequence_of_objects, **kwargs)
+            return PandasConverter.convert_objects_to_single_dataframe(sequence_of_objects, backend=backend,
+                                                                       **kwargs)
 
     @classmethod
     async def from_objects_to_dataframe_async(cls, sequence_of_objects: Iterable[OTLObject],
-                                              split_per_type: bool = False,
+                                              split_per_type: bool = False, backend: Optional[str] = None,
                                               **kwargs) -> Union[DataFrame, dict[str, DataFrame]]:
         """Converts a sequence of OTLObject objects to a pandas DataFrame."""
         if split_per_type:
-            return await PandasConverter.convert_objects_to_multiple_dataframes_async(sequence_of_objects, **kwargs)
+            return await PandasConverter.convert_objects_to_multiple_dataframes_async(
+                sequence_of_objects, backend=backend, **kwargs)
         else:
-            return await PandasConverter.convert_objects_to_single_dataframe_async(sequence_of_objects, **kwargs)
+            return await PandasConverter.convert_objects_to_single_dataframe_async(
+                sequence_of_objects, backend=backend, **kwargs)
 
     @classmethod
     def from_dataframe_to_objects(cls, dataframe: DataFrame, **kwargs) -> Iterable[OTLObject]:
@@ -595,6 +733,9 @@ class OtlmowConverter:
         'geojson': 'GeoJSON',
         'ttl': 'ttl',
         'jsonld': 'JSON-LD',
+        'parquet': 'parquet',
+        'arrow': 'arrow',
+        'feather': 'arrow',
     }
 
     @classmethod
@@ -606,11 +747,7 @@ class OtlmowConverter:
     async def collect_to_list(cls, async_generator: AsyncIterable) -> list:
         """Collects the items from an async generator into a list.
         Always await this function to get the result."""
-        result = []
-        async for item in async_generator:
-            await sleep(0)
-            result.append(item)
-        return result
+        return [item async for item in async_generator]
 
 
 def to_objects(subject: object, model_directory: Path = None, **kwargs) -> Iterable[OTLObject]:
@@ -661,3 +798,11 @@ async def to_dataframe_async(subject: object, split_per_type: bool = False, mode
                              ) -> Union[DataFrame, dict[str, DataFrame]]:
     return await OtlmowConverter.to_dataframe_async(subject=subject, split_per_type=split_per_type,
                                                model_directory=model_directory, **kwargs)
+
+
+def to_arrow_table(subject: object, model_directory: Path = None, **kwargs) -> pa.Table:
+    return OtlmowConverter.to_arrow_table(subject=subject, model_directory=model_directory, **kwargs)
+
+
+async def to_arrow_table_async(subject: object, model_directory: Path = None, **kwargs) -> pa.Table:
+    return await OtlmowConverter.to_arrow_table_async(subject=subject, model_directory=model_directory, **kwargs)
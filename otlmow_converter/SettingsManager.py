@@ -2,6 +2,7 @@ import json
 from pathlib import Path
 
 CURRENT_DIR = Path(__file__).parent
+DEFAULT_SETTINGS_PATH = CURRENT_DIR / 'settings_otlmow_converter.json'
 
 
 class GlobalVariables:
@@ -12,23 +13,33 @@ def _load_settings_by_dict(settings_dict: dict) -> None:
     GlobalVariables.settings = settings_dict
 
 
-def load_settings(settings_path: Path = CURRENT_DIR / 'settings_otlmow_converter.json') -> None:
+def load_settings(settings_path: Path = DEFAULT_SETTINGS_PATH) -> None:
+    """Loads the settings, unless they are already loaded. The settings that are not in the given file, e.g. the ones
+    added in a later version of the converter, keep the value of the default settings file."""
     if GlobalVariables.settings != {}:
         return
+    settings_dict = _read_settings_file(settings_path)
+    if Path(settings_path) != DEFAULT_SETTINGS_PATH:
+        default_settings = _read_settings_file(DEFAULT_SETTINGS_PATH)
+        _update_dict(default_settings, settings_dict)
+        settings_dict = default_settings
+    _load_settings_by_dict(settings_dict)
+
+
+def _read_settings_file(settings_path: Path) -> dict:
     if not settings_path.exists():
         raise FileNotFoundError(f'{settings_path} is not a valid path. File does not exist.')
 
     try:
         with open(settings_path) as settings_file:
-            settings_dict = json.load(settings_file)
-            _load_settings_by_dict(settings_dict)
+            return json.load(settings_file)
     except OSError as e:
         raise ImportError(f'Could not open the settings file at {settings_path}') from e
 
 
 def _update_dict(orig_dict: dict, extra_dict: dict) -> None:
     for k, v in extra_dict.items():
-        if isinstance(v, dict):
+        if isinstance(v, dict) and isinstance(orig_dict.get(k), dict):
             _update_dict(orig_dict[k], v)
         else:
             orig_dict[k] = v